@@ -0,0 +1,456 @@
+# ===============================
+# ⏱ Dashboard Benchmark Suite
+# ===============================
+"""Time both dashboards end to end on synthetic data and write JSON results.
+
+Every case runs in a fresh interpreter (so caches, imports and peak RSS are
+its own) against generated data:
+
+- ``climate``: a daily POWER export of ``--power-years`` years. The columnar
+  ingest and cache load are timed directly. Then the Streamlit script runs
+  through ``streamlit.testing``: first run, every tab cold and warm, and each
+  selectbox/slider on the way.
+- ``climate-hourly``: an hourly export (``--hourly-years``) through ingest,
+  cache load and the chunked correlation pass. The dashboard's aggregates
+  are daily.
+- ``superstore``: a Global Superstore table per ``--rows`` size and storage
+  backend (``--backends``: in-memory filter index, SQL pushdown). Startup
+  (ingest, index or database) and the forecast training are timed. Every
+  server callback is then driven over the region × category × horizon grid
+  and each market through Dash's HTTP endpoint, cold and warm.
+- ``startup``: cold starts with warm on-disk caches under ``-X importtime``.
+  Reports per-module import time and the time from process spawn to the
+  first response: the Streamlit first run, or the Dash page shell and first
+  layout, with and without ``FAST_STARTUP``.
+
+Stage breakdowns come from each app's own ``instrumentation`` timers.
+
+    python benchmarks/run_benchmarks.py --rows 50000 1000000 10000000 --output results.json
+"""
+
+import argparse
+import importlib
+import json
+import os
+import platform
+import re
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from importlib import metadata
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CLIMATE_DIR = os.path.join(ROOT, "projects", "Chakwal_Climate_Solar_Trends")
+SUPERSTORE_DIR = os.path.join(ROOT, "projects", "Global_Superstore_Analysis")
+SUPERSTORE_ROWS = (50_000, 500_000, 2_000_000, 10_000_000)
+PACKAGES = ["numpy", "pandas", "pyarrow", "plotly", "dash", "streamlit", "neuralprophet", "torch"]
+MAX_OPTIONS = 4  # selectbox options exercised per widget
+TOP_IMPORTS = 15
+
+# numpy/pandas (and the generators using them) are imported where needed, so
+# cold-start workers under -X importtime only measure the dashboards' imports
+
+
+# -------------------------------
+# Measurement helpers
+# -------------------------------
+def peak_rss_mb(who=resource.RUSAGE_SELF):
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    peak = resource.getrusage(who).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def latency_summary(seconds):
+    import numpy as np
+
+    ms = np.asarray(seconds) * 1000
+    if not len(ms):
+        return {"count": 0}
+    return {
+        "count": len(ms),
+        "mean_ms": round(float(ms.mean()), 3),
+        "p50_ms": round(float(np.percentile(ms, 50)), 3),
+        "p95_ms": round(float(np.percentile(ms, 95)), 3),
+        "max_ms": round(float(ms.max()), 3),
+    }
+
+
+def stage_timings(registry):
+    """``{"stage[label=value]": {"count", "total_s"}}`` from the app's stage histogram."""
+    stages = {}
+    for labels, n, total in registry.snapshot().get(registry.prefix + "stage_duration_seconds", []):
+        extra = ",".join(f"{k}={v}" for k, v in sorted(labels.items()) if k != "stage")
+        name = f"{labels['stage']}[{extra}]" if extra else labels["stage"]
+        stages[name] = {"count": n, "total_s": round(total, 4)}
+    return dict(sorted(stages.items()))
+
+
+class Phases:
+    """Wall time and peak RSS (so far) of consecutive benchmark phases."""
+
+    def __init__(self):
+        self.results = {}
+
+    def timed(self, name, func, *args, **kwargs):
+        started = time.perf_counter()
+        result = func(*args, **kwargs)
+        self.results[name] = {"seconds": round(time.perf_counter() - started, 4), "peak_rss_mb": peak_rss_mb()}
+        return result
+
+
+# -------------------------------
+# Climate (Streamlit) cases
+# -------------------------------
+def _exercise_widgets(at, samples):
+    # Every selectbox option (capped) and each slider at its extremes
+    for i in range(len(at.main.selectbox)):
+        for option in range(min(MAX_OPTIONS, len(at.main.selectbox[i].options))):
+            _timed_run(at, at.main.selectbox[i].select_index(option), samples)
+    for i in range(len(at.main.slider)):
+        slider = at.main.slider[i]
+        low, high = slider.min, slider.max
+        value = (low, low + (high - low) // 2) if isinstance(slider.value, (tuple, list)) else high
+        _timed_run(at, slider.set_value(value), samples)
+
+
+def _timed_run(at, widget, samples):
+    started = time.perf_counter()
+    widget.run()
+    samples.append(time.perf_counter() - started)
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+
+
+def bench_climate(workdir, years, hourly=False):
+    from synthetic_data import write_power_csv
+
+    data_dir = os.path.join(workdir, "power")
+    os.makedirs(data_dir, exist_ok=True)
+    resolution = "Hourly" if hourly else "Daily"
+    csv_path = os.path.join(data_dir, f"POWER_Point_{resolution}_2000_{1999 + years}_synthetic.csv")
+    phases = Phases()
+    rows = phases.timed("generate", write_power_csv, csv_path, years, hourly=hourly)
+
+    sys.path.insert(0, CLIMATE_DIR)
+    from covariance import MomentsCube
+    from instrumentation import metrics
+    from power_cache import ingest, iter_cached_batches, load_power_table
+    from power_reader import DATE_PARTS
+
+    phases.timed("ingest", ingest, csv_path)
+    frame = phases.timed("cache_load", load_power_table, csv_path)
+    result = {"rows": rows, "csv_mb": round(os.path.getsize(csv_path) / 2**20, 2)}
+
+    if hourly:
+        def correlation():
+            cube = MomentsCube([c for c in frame.columns if c not in DATE_PARTS and c != "DATE"])
+            for chunk in iter_cached_batches(csv_path):
+                cube.add_frame(chunk)
+            return cube
+        phases.timed("aggregation", correlation)
+    else:
+        from streamlit.testing.v1 import AppTest
+
+        os.environ.update(POWER_DATA_DIR=data_dir, METRICS_PORT="")
+        os.environ.pop("PROFILE_DIR", None)
+        at = AppTest.from_file(os.path.join(CLIMATE_DIR, "Climate_Analysis_Dashboard.py"), default_timeout=3600)
+        phases.timed("first_run", at.run)
+        if at.exception:
+            raise RuntimeError(at.exception[0].message)
+
+        tabs = at.sidebar.radio[0].options
+        cold, warm, widgets = [], [], []
+        for tab in tabs:
+            _timed_run(at, at.sidebar.radio[0].set_value(tab), cold)
+            _exercise_widgets(at, widgets)
+        for tab in tabs:
+            _timed_run(at, at.sidebar.radio[0].set_value(tab), warm)
+        result["interactions"] = {
+            "tab_switch_cold": latency_summary(cold),
+            "tab_switch_warm": latency_summary(warm),
+            "widget_change": latency_summary(widgets),
+        }
+
+    result.update(phases=phases.results, stages=stage_timings(metrics), peak_rss_mb=peak_rss_mb())
+    return result
+
+
+# -------------------------------
+# Superstore (Dash) case
+# -------------------------------
+def _outputs(output):
+    # "id.prop" or "..id.prop...id.prop.." for multi-output callbacks
+    parts = output[2:-2].split("...") if output.startswith("..") else [output]
+    specs = [dict(zip(("id", "property"), p.split("@")[0].rsplit(".", 1))) for p in parts]
+    return specs if output.startswith("..") else specs[0]
+
+
+def _fire(client, dependency, values, changed):
+    body = {
+        "output": dependency["output"],
+        "outputs": _outputs(dependency["output"]),
+        "inputs": [{**i, "value": values.get(f"{i['id']}.{i['property']}")} for i in dependency["inputs"]],
+        "state": [{**s, "value": values.get(f"{s['id']}.{s['property']}")} for s in dependency["state"]],
+        "changedPropIds": [changed],
+    }
+    started = time.perf_counter()
+    response = client.post("/_dash-update-component", json=body, buffered=True)
+    elapsed = time.perf_counter() - started
+    if response.status_code not in (200, 204):
+        raise RuntimeError(f"{dependency['output']}: HTTP {response.status_code}")
+    return elapsed
+
+
+def _interaction_pass(client, dependencies, grid):
+    """Walk every filter combination the way the browser does; latencies per callback."""
+    values = {"region-filter.value": None, "category-filter.value": None,
+              "forecast-horizon.value": grid["horizons"][0], "forecast-poll.n_intervals": None}
+    samples = {d["output"]: [] for d in dependencies}
+
+    def change(prop, value):
+        values[prop] = value
+        for dependency in dependencies:
+            if any(f"{i['id']}.{i['property']}" == prop for i in dependency["inputs"]):
+                samples[dependency["output"]].append(_fire(client, dependency, values, prop))
+
+    for region in grid["regions"]:
+        change("region-filter.value", region)
+        for category in grid["categories"]:
+            change("category-filter.value", category)
+            for horizon in grid["horizons"]:
+                change("forecast-horizon.value", horizon)
+    # drill-down filters resolve through the bitmap index (or SQL) rather than the cube
+    for market in grid["markets"]:
+        change("market-filter.value", market)
+    # keyed by the first output's "id.property" (several callbacks write to one id)
+    return {output.strip(".").split("...")[0].split("@")[0]: latency_summary(s) for output, s in samples.items()}
+
+
+def bench_superstore(workdir, rows, forecast_timeout, backend="cube"):
+    from synthetic_data import write_superstore_csv
+
+    os.chdir(workdir)
+    phases = Phases()
+    phases.timed("generate", write_superstore_csv, "Global_Superstore2.csv", rows)
+
+    os.environ.update(FORECAST_MODEL_DIR=os.path.join(workdir, "forecast_models"), STORAGE_BACKEND=backend)
+    for name in ("CALLBACK_CACHE_DIR", "CALLBACK_CACHE_WARM", "PROFILE_DIR", "ORDERS_DB_URL"):
+        os.environ.pop(name, None)
+    sys.path.insert(0, SUPERSTORE_DIR)
+    # import = ingest + index build (or database load) + background forecast training start
+    app = phases.timed("startup", importlib.import_module, "global_superstore_dashboard")
+    from instrumentation import metrics
+    from superstore_cache import load_orders
+
+    if backend == "cube":
+        phases.timed("cache_load_warm", load_orders, app.ORDERS_CSV, columns=app.ORDER_COLUMNS)
+    phases.timed("forecast_wait", app.forecasts.wait, app.get_forecast_key(), forecast_timeout)
+
+    # buffered responses are closed by the test client, which ends their request timer
+    client = app.server.test_client()
+    phases.timed("layout_cold", client.get, "/_dash-layout", buffered=True)
+    phases.timed("layout_warm", client.get, "/_dash-layout", buffered=True)
+    dependencies = [d for d in client.get("/_dash-dependencies").json if not d.get("clientside_function")]
+    sales = app.get_sales()
+    grid = {"regions": [None, *sales.regions], "categories": [None, *sales.categories],
+            "markets": [*sales.values("Market"), None], "horizons": list(app.HORIZONS)}
+
+    callbacks = {
+        "cold": phases.timed("callbacks_cold", _interaction_pass, client, dependencies, grid),
+        "warm": phases.timed("callbacks_warm", _interaction_pass, client, dependencies, grid),
+    }
+    forecast = app.forecasts.get(app.get_forecast_key())
+    return {
+        "rows": rows,
+        "csv_mb": round(os.path.getsize(app.ORDERS_CSV) / 2**20, 2),
+        "forecast_status": app.forecasts.status(app.get_forecast_key()),
+        "forecast_methods": sorted(set(forecast["method"].values())) if forecast else [],
+        "phases": phases.results,
+        "callbacks": callbacks,
+        "callback_cache": app.callback_cache.stats(),
+        "stages": stage_timings(metrics),
+        "peak_rss_mb": peak_rss_mb(),
+        "peak_child_rss_mb": peak_rss_mb(resource.RUSAGE_CHILDREN),
+    }
+
+
+# -------------------------------
+# Cold start
+# -------------------------------
+def bench_startup(case, spawned_at):
+    """Seconds from process spawn to the first responses; ``prepare`` only fills the caches."""
+    os.chdir(case["data_dir"])
+    result = {}
+    if case["app"] == "climate":
+        from streamlit.testing.v1 import AppTest
+
+        os.environ.update(POWER_DATA_DIR=case["data_dir"], METRICS_PORT="")
+        sys.path.insert(0, CLIMATE_DIR)
+        at = AppTest.from_file(os.path.join(CLIMATE_DIR, "Climate_Analysis_Dashboard.py"), default_timeout=3600)
+        at.run()
+        if at.exception:
+            raise RuntimeError(at.exception[0].message)
+        result["first_response_s"] = round(time.time() - spawned_at, 3)
+    else:
+        os.environ.update(FORECAST_MODEL_DIR=os.path.join(case["data_dir"], "forecast_models"),
+                          FAST_STARTUP="1" if case["fast"] else "0")
+        sys.path.insert(0, SUPERSTORE_DIR)
+        app = importlib.import_module("global_superstore_dashboard")
+        client = app.server.test_client()
+        client.get("/")
+        result["first_response_s"] = round(time.time() - spawned_at, 3)
+        client.get("/_dash-layout")
+        result["layout_ready_s"] = round(time.time() - spawned_at, 3)
+        if case.get("prepare"):
+            app.forecasts.wait(app.get_forecast_key(), case["forecast_timeout"])
+    result["peak_rss_mb"] = peak_rss_mb()
+    return result
+
+
+def import_times(stderr):
+    """Cumulative ``-X importtime`` milliseconds per top-level import, largest first."""
+    totals = {}
+    for line in stderr.splitlines():
+        match = re.match(r"import time:\s+(\d+) \|\s+(\d+) \|( +)(\S+)$", line)
+        if match and len(match[3]) == 1:  # nested imports are indented further
+            totals[match[4]] = totals.get(match[4], 0) + int(match[2]) / 1000
+    top = sorted(totals.items(), key=lambda item: -item[1])
+    return {"total_ms": round(sum(totals.values()), 1),
+            "top_ms": {name: round(ms, 1) for name, ms in top[:TOP_IMPORTS]}}
+
+
+def startup_cases(workdir, rows, forecast_timeout):
+    """Shared data for the cold-start runs; each app's first (unmeasured) run warms its caches."""
+    from synthetic_data import write_power_csv, write_superstore_csv
+
+    climate_dir = os.path.join(workdir, "startup-climate")
+    superstore_dir = os.path.join(workdir, "startup-superstore")
+    os.makedirs(climate_dir, exist_ok=True)
+    os.makedirs(superstore_dir, exist_ok=True)
+    write_power_csv(os.path.join(climate_dir, "POWER_Point_Daily_2000_2024_synthetic.csv"), 25)
+    write_superstore_csv(os.path.join(superstore_dir, "Global_Superstore2.csv"), rows)
+
+    climate = {"suite": "startup", "app": "climate", "data_dir": climate_dir}
+    superstore = {"suite": "startup", "app": "superstore", "rows": rows, "data_dir": superstore_dir,
+                  "forecast_timeout": forecast_timeout}
+    return [
+        {**climate, "prepare": True}, climate,
+        {**superstore, "fast": False, "prepare": True},
+        {**superstore, "fast": False}, {**superstore, "fast": True},
+    ]
+
+
+# -------------------------------
+# Orchestration
+# -------------------------------
+def run_case(case, workdir, spawned_at):
+    if case["suite"] == "climate":
+        return bench_climate(workdir, case["years"])
+    if case["suite"] == "climate-hourly":
+        return bench_climate(workdir, case["years"], hourly=True)
+    if case["suite"] == "startup":
+        return bench_startup(case, spawned_at)
+    return bench_superstore(workdir, case["rows"], case["forecast_timeout"], case["backend"])
+
+
+def spawn_case(case, workdir):
+    """Run ``case`` in its own interpreter; its result dict (or the error)."""
+    label = "-".join(f"{k}{v}" for k, v in case.items() if k not in ("forecast_timeout", "data_dir"))
+    case_dir = os.path.join(workdir, label)
+    os.makedirs(case_dir, exist_ok=True)
+    result_path = os.path.join(case_dir, "result.json")
+    startup = case["suite"] == "startup"
+    command = [sys.executable, *(["-X", "importtime"] if startup else []), os.path.abspath(__file__),
+               "--worker", json.dumps(case), "--result", result_path, "--spawned-at", repr(time.time())]
+    started = time.perf_counter()
+    proc = subprocess.run(command, capture_output=True, text=True)
+    case = {k: v for k, v in case.items() if k != "data_dir"}
+    if proc.returncode != 0 or not os.path.exists(result_path):
+        errors = [line for line in proc.stderr.strip().splitlines() if not line.startswith("import time:")]
+        return {**case, "error": errors[-20:]}
+    with open(result_path, encoding="utf-8") as f:
+        result = {**case, **json.load(f), "wall_seconds": round(time.perf_counter() - started, 2)}
+    if startup:
+        result["imports"] = import_times(proc.stderr)
+    return result
+
+
+def environment():
+    versions = {}
+    for package in PACKAGES:
+        try:
+            versions[package] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            versions[package] = None
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "packages": versions,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark both dashboards on synthetic data.")
+    parser.add_argument("--suites", nargs="+", default=["climate", "climate-hourly", "superstore", "startup"],
+                        choices=["climate", "climate-hourly", "superstore", "startup"])
+    parser.add_argument("--power-years", nargs="+", type=int, default=[25, 100])
+    parser.add_argument("--hourly-years", nargs="+", type=int, default=[5])
+    parser.add_argument("--rows", nargs="+", type=int, default=list(SUPERSTORE_ROWS[:2]),
+                        help=f"Superstore sizes (e.g. {' '.join(map(str, SUPERSTORE_ROWS))})")
+    parser.add_argument("--backends", nargs="+", default=["cube", "sql"], choices=["cube", "sql"],
+                        help="Superstore storage backends (STORAGE_BACKEND)")
+    parser.add_argument("--forecast-timeout", type=float, default=600,
+                        help="seconds to wait for forecast training before timing callbacks")
+    parser.add_argument("--workdir", default=None, help="keep generated data here (default: temporary)")
+    parser.add_argument("--output", default="-", help="JSON results file ('-' for stdout)")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--result", help=argparse.SUPPRESS)
+    parser.add_argument("--spawned-at", type=float, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        result = run_case(json.loads(args.worker), os.path.dirname(args.result), args.spawned_at)
+        with open(args.result, "w", encoding="utf-8") as f:
+            json.dump(result, f)
+        return
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="dashboard-bench-")
+    cases = []
+    if "climate" in args.suites:
+        cases += [{"suite": "climate", "years": y} for y in args.power_years]
+    if "climate-hourly" in args.suites:
+        cases += [{"suite": "climate-hourly", "years": y} for y in args.hourly_years]
+    if "superstore" in args.suites:
+        cases += [{"suite": "superstore", "rows": n, "backend": backend, "forecast_timeout": args.forecast_timeout}
+                  for n in args.rows for backend in args.backends]
+
+    try:
+        if "startup" in args.suites:
+            cases += startup_cases(workdir, args.rows[0], args.forecast_timeout)
+        results = []
+        for case in cases:
+            print(f"running {case}", file=sys.stderr)
+            result = spawn_case(case, workdir)
+            if not case.get("prepare") or "error" in result:
+                results.append(result)
+    finally:
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {"created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+              "environment": environment(), "results": results}
+    if args.output == "-":
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
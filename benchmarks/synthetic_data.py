@@ -0,0 +1,259 @@
+# ===============================
+# 🧪 Synthetic Benchmark Datasets
+# ===============================
+"""Generators for dashboard-shaped test data of any size.
+
+``write_power_csv`` emits a NASA POWER point export (full header block, the
+same 22 parameters as the Chakwal extract after ``YEAR,MO,DY[,HR]``) for any
+number of years at daily or hourly resolution, with seasonal cycles, dry
+spells, summer heat and a sprinkling of ``-999`` fill values.
+``write_superstore_csv`` emits a ``Global_Superstore2.csv``-shaped order table
+(same 24 columns, ``dd-mm-YYYY`` dates) from 50k to 10M+ rows. Both are
+vectorized and written in chunks, so memory stays flat as sizes grow.
+"""
+
+import numpy as np
+import pandas as pd
+
+FILL_VALUE = -999.0
+
+# name, description, (mean, seasonal amplitude, peak day of year, noise, low, high)
+POWER_PARAMETERS = [
+    ("ALLSKY_SFC_SW_DWN", "CERES SYN1deg All Sky Surface Shortwave Downward Irradiance (kW-hr/m^2/day)", (5.0, 2.2, 165, 0.9, 0.2, 8.5)),
+    ("CLRSKY_SFC_SW_DWN", "CERES SYN1deg Clear Sky Surface Shortwave Downward Irradiance (kW-hr/m^2/day)", (5.6, 2.4, 165, 0.3, 2.5, 8.8)),
+    ("ALLSKY_SFC_SW_DNI", "CERES SYN1deg All Sky Surface Shortwave Downward Direct Normal Irradiance (kW-hr/m^2/day)", (5.2, 1.5, 150, 1.5, 0.0, 10.0)),
+    ("ALLSKY_SFC_SW_DIFF", "CERES SYN1deg All Sky Surface Shortwave Diffuse Irradiance (kW-hr/m^2/day)", (1.6, 0.8, 200, 0.4, 0.2, 4.0)),
+    ("ALLSKY_KT", "CERES SYN1deg All Sky Insolation Clearness Index (dimensionless)", (0.6, 0.05, 300, 0.1, 0.05, 0.8)),
+    ("ALLSKY_SFC_PAR_TOT", "CERES SYN1deg All Sky Surface Total PAR (kW-hr/m^2/day)", (2.2, 1.0, 165, 0.4, 0.1, 4.0)),
+    ("T2M", "MERRA-2 Temperature at 2 Meters (C)", (22.5, 11.0, 190, 2.0, -5.0, 42.0)),
+    ("T2M_MAX", "MERRA-2 Temperature at 2 Meters Maximum (C)", (29.5, 11.5, 175, 2.5, 0.0, 48.0)),
+    ("T2M_MIN", "MERRA-2 Temperature at 2 Meters Minimum (C)", (15.5, 10.5, 200, 2.0, -10.0, 33.0)),
+    ("TS", "MERRA-2 Earth Skin Temperature (C)", (23.0, 12.5, 185, 2.5, -8.0, 48.0)),
+    ("T2MWET", "MERRA-2 Wet Bulb Temperature at 2 Meters (C)", (13.5, 9.0, 210, 2.0, -12.0, 30.0)),
+    ("RH2M", "MERRA-2 Relative Humidity at 2 Meters (%)", (45.0, 15.0, 225, 10.0, 3.0, 100.0)),
+    ("PRECTOTCORR", "MERRA-2 Precipitation Corrected (mm/day)", None),
+    ("T2MDEW", "MERRA-2 Dew/Frost Point at 2 Meters (C)", (6.0, 9.0, 220, 3.0, -20.0, 27.0)),
+    ("WS10M", "MERRA-2 Wind Speed at 10 Meters (m/s)", (2.2, 0.5, 160, 0.6, 0.2, 9.0)),
+    ("WS10M_MAX", "MERRA-2 Wind Speed at 10 Meters Maximum (m/s)", (3.6, 0.8, 160, 1.0, 0.5, 15.0)),
+    ("PS", "MERRA-2 Surface Pressure (kPa)", (96.3, 0.7, 10, 0.2, 94.0, 98.5)),
+    ("ALLSKY_SFC_LW_DWN", "CERES SYN1deg All Sky Surface Longwave Downward Irradiance (kW-hr/m^2/day)", (8.0, 2.0, 205, 0.5, 4.5, 11.5)),
+    ("ALLSKY_SFC_UV_INDEX", "CERES SYN1deg All Sky Surface UV Index (W m-2 x 40)", (6.0, 3.5, 170, 1.0, 0.0, 13.0)),
+    ("QV2M", "MERRA-2 Specific Humidity at 2 Meters (g/kg)", (8.5, 5.0, 215, 1.5, 0.5, 24.0)),
+    ("PSC", "MERRA-2 Corrected Atmospheric Pressure (Adjusted For Site Elevation) (kPa)", (90.6, 0.7, 10, 0.2, 88.5, 92.5)),
+    ("WSC", "MERRA-2 Corrected Wind Speed (Adjusted For Elevation) (m/s)", (1.7, 0.4, 160, 0.5, 0.1, 7.0)),
+]
+# hourly exports give irradiance per hour, not per day, and follow the sun
+SOLAR = {"ALLSKY_SFC_SW_DWN", "CLRSKY_SFC_SW_DWN", "ALLSKY_SFC_SW_DNI", "ALLSKY_SFC_SW_DIFF",
+         "ALLSKY_SFC_PAR_TOT", "ALLSKY_SFC_UV_INDEX"}
+
+
+def power_header(start, end, hourly=False, lat=32.9348, lon=72.8576, elevation=448.45):
+    """The ``-BEGIN HEADER-`` ... ``-END HEADER-`` block of a POWER point export."""
+    resolution = "Hourly" if hourly else "Daily"
+    lines = [
+        "-BEGIN HEADER-",
+        f"NASA/POWER Source Native Resolution {resolution} Data ",
+        f"Dates (month/day/year): {start:%m/%d/%Y} through {end:%m/%d/%Y} in LST",
+        f"Location: latitude  {lat:.4f}   longitude {lon:.4f} ",
+        f"elevation from MERRA-2: Average for 0.5 x 0.625 degree lat/lon region = {elevation:.2f} meters",
+        f"The value for missing source data that cannot be computed or is outside of the sources availability range: {FILL_VALUE:.0f} ",
+        "parameter(s): ",
+        *(f"{name:<24}{description} " for name, description, _ in POWER_PARAMETERS),
+        "Message(s): ",
+        "Synthetic benchmark data ",
+        "-END HEADER-",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def _power_frame(dates, hourly, rng, missing):
+    doy = dates.dayofyear.to_numpy()
+    hour = dates.hour.to_numpy()
+    frame = {"YEAR": dates.year, "MO": dates.month, "DY": dates.day}
+    if hourly:
+        frame["HR"] = hour
+    frame = pd.DataFrame(frame)
+
+    # one weather anomaly per day (shared by every hour) drives the heat/cloud spells
+    days = (dates.normalize() - dates[0].normalize()).days.to_numpy()
+    anomaly = np.cumsum(rng.normal(0, 0.35, days[-1] + 1)) * 0.15
+    anomaly -= pd.Series(anomaly).rolling(60, min_periods=1).mean().to_numpy()
+    anomaly = anomaly[days]
+    daylight = np.clip(np.sin(np.pi * (hour - 6) / 12), 0, None) if hourly else 1.0
+
+    for name, _, spec in POWER_PARAMETERS:
+        if spec is None:
+            # monsoon-heavy rain with long dry stretches
+            wet = rng.random(len(dates)) < 0.08 + 0.3 * np.exp(-((doy - 210) / 25.0) ** 2)
+            values = np.where(wet, rng.gamma(0.6, 9.0, len(dates)), 0.0)
+            if hourly:
+                values = values / 24
+        else:
+            mean, amplitude, peak, noise, low, high = spec
+            values = mean + amplitude * np.cos(2 * np.pi * (doy - peak) / 365.25)
+            values = values + noise * rng.standard_normal(len(dates)) + anomaly * noise
+            if hourly and name.startswith("T"):
+                values = values + 0.35 * amplitude * np.cos(2 * np.pi * (hour - 15) / 24)
+            values = np.clip(values, low, high)
+            if hourly and name in SOLAR:
+                values = values * daylight * np.pi / 12
+        values = np.round(values, 2)
+        if missing:
+            values[rng.random(len(dates)) < missing] = FILL_VALUE
+        frame[name] = values
+    return frame
+
+
+def write_power_csv(path, years=25, start_year=2000, hourly=False, missing=0.002, seed=0,
+                    chunk_years=5, **location):
+    """Write a POWER point CSV covering ``years`` calendar years; returns the row count."""
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp(start_year, 1, 1)
+    end = pd.Timestamp(start_year + years - 1, 12, 31)
+    rows = 0
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write(power_header(start, end, hourly, **location))
+        for first in range(start_year, start_year + years, chunk_years):
+            last = min(first + chunk_years, start_year + years) - 1
+            dates = pd.date_range(f"{first}-01-01", f"{last}-12-31 23:00" if hourly else f"{last}-12-31",
+                                  freq="h" if hourly else "D")
+            chunk = _power_frame(dates, hourly, rng, missing)
+            chunk.to_csv(f, index=False, header=rows == 0, float_format="%.2f", lineterminator="\n")
+            rows += len(chunk)
+    return rows
+
+
+# -------------------------------
+# Global Superstore orders
+# -------------------------------
+SUPERSTORE_COLUMNS = [
+    "Row ID", "Order ID", "Order Date", "Ship Date", "Ship Mode", "Customer ID", "Customer Name",
+    "Segment", "City", "State", "Country", "Postal Code", "Market", "Region", "Product ID",
+    "Category", "Sub-Category", "Product Name", "Sales", "Quantity", "Discount", "Profit",
+    "Shipping Cost", "Order Priority",
+]
+# (market, region, country, state, city)
+GEOGRAPHY = [
+    ("US", "West", "United States", "California", "Los Angeles"),
+    ("US", "East", "United States", "New York", "New York City"),
+    ("US", "Central", "United States", "Texas", "Houston"),
+    ("US", "South", "United States", "Florida", "Miami"),
+    ("Canada", "Canada", "Canada", "Ontario", "Toronto"),
+    ("LATAM", "Caribbean", "Dominican Republic", "Santo Domingo", "Santo Domingo"),
+    ("LATAM", "South", "Brazil", "São Paulo", "São Paulo"),
+    ("LATAM", "Central", "Mexico", "Distrito Federal", "Mexico City"),
+    ("EU", "Central", "Germany", "Berlin", "Berlin"),
+    ("EU", "North", "United Kingdom", "England", "London"),
+    ("EU", "South", "Italy", "Lazio", "Rome"),
+    ("Africa", "Africa", "Nigeria", "Lagos", "Lagos"),
+    ("Africa", "Africa", "Egypt", "Cairo", "Cairo"),
+    ("EMEA", "EMEA", "Turkey", "Istanbul", "Istanbul"),
+    ("APAC", "Oceania", "Australia", "New South Wales", "Sydney"),
+    ("APAC", "Southeast Asia", "Indonesia", "Jakarta", "Jakarta"),
+    ("APAC", "North Asia", "China", "Shanghai", "Shanghai"),
+    ("APAC", "Central Asia", "India", "Maharashtra", "Mumbai"),
+]
+PRODUCTS = {
+    "Furniture": ["Bookcases", "Chairs", "Furnishings", "Tables"],
+    "Office Supplies": ["Appliances", "Art", "Binders", "Envelopes", "Fasteners", "Labels",
+                        "Paper", "Storage", "Supplies"],
+    "Technology": ["Accessories", "Copiers", "Machines", "Phones"],
+}
+SHIP_MODES = ["Standard Class", "Second Class", "First Class", "Same Day"]
+SEGMENTS = ["Consumer", "Corporate", "Home Office"]
+PRIORITIES = ["Medium", "High", "Critical", "Low"]
+FIRST_NAMES = ["Ann", "Ben", "Cy", "Dee", "Eli", "Fay", "Gus", "Ida", "Jon", "Kim", "Lee", "Mo"]
+LAST_NAMES = ["Lee", "Diaz", "Khan", "Smith", "Ito", "Okoro", "Rossi", "Novak", "Silva", "Zia"]
+DISCOUNTS = np.array([0.0, 0.0, 0.0, 0.1, 0.2, 0.3, 0.4, 0.5])
+
+
+def _superstore_chunk(start_row, n, rng, order_days, customers, products):
+    day = rng.integers(0, len(order_days) - 7, n)
+    ship = day + rng.choice([0, 1, 2, 4, 5, 7], n)
+    geo = np.array(GEOGRAPHY, dtype=object)[rng.integers(0, len(GEOGRAPHY), n)]
+    product = rng.integers(0, len(products), n)
+    customer = rng.integers(0, len(customers), n)
+    years = pd.DatetimeIndex(order_days).year.to_numpy()[day]
+
+    sales = np.round(rng.lognormal(4.5, 1.2, n), 3)
+    discount = DISCOUNTS[rng.integers(0, len(DISCOUNTS), n)]
+    profit = np.round(sales * (rng.normal(0.15, 0.2, n) - discount), 4)
+    postal = np.where(geo[:, 0] == "US", rng.integers(10000, 99999, n).astype(float), np.nan)
+
+    return pd.DataFrame({
+        "Row ID": np.arange(start_row + 1, start_row + n + 1),
+        "Order ID": np.char.add(np.char.add("CA-", years.astype(str)),
+                                np.char.add("-", rng.integers(100000, 999999, n).astype(str))),
+        "Order Date": order_days[day],
+        "Ship Date": order_days[ship],
+        "Ship Mode": np.array(SHIP_MODES)[rng.integers(0, len(SHIP_MODES), n)],
+        "Customer ID": customers[customer, 0],
+        "Customer Name": customers[customer, 1],
+        "Segment": customers[customer, 2],
+        "City": geo[:, 4],
+        "State": geo[:, 3],
+        "Country": geo[:, 2],
+        "Postal Code": postal,
+        "Market": geo[:, 0],
+        "Region": geo[:, 1],
+        "Product ID": products[product, 0],
+        "Category": products[product, 1],
+        "Sub-Category": products[product, 2],
+        "Product Name": products[product, 3],
+        "Sales": sales,
+        "Quantity": rng.integers(1, 15, n),
+        "Discount": discount,
+        "Profit": profit,
+        "Shipping Cost": np.round(sales * rng.uniform(0.02, 0.2, n), 2),
+        "Order Priority": np.array(PRIORITIES)[rng.integers(0, len(PRIORITIES), n)],
+    }, columns=SUPERSTORE_COLUMNS)
+
+
+def write_superstore_csv(path, rows=51_290, start="2011-01-01", end="2014-12-31", seed=0,
+                         chunk_rows=500_000):
+    """Write a ``Global_Superstore2.csv``-shaped order table with ``rows`` rows."""
+    rng = np.random.default_rng(seed)
+    # dates are formatted once per calendar day, then picked by index
+    days = pd.date_range(start, pd.Timestamp(end) + pd.Timedelta(days=7), freq="D")
+    order_days = np.asarray(days.strftime("%d-%m-%Y"), dtype=object)
+
+    n_customers = max(1000, rows // 30)
+    customers = np.array([
+        (f"CU-{i:06d}", f"{FIRST_NAMES[i % len(FIRST_NAMES)]} {LAST_NAMES[i // len(FIRST_NAMES) % len(LAST_NAMES)]}",
+         SEGMENTS[i % len(SEGMENTS)])
+        for i in range(n_customers)
+    ], dtype=object)
+    products = np.array([
+        (f"{category[:3].upper()}-{sub[:2].upper()}-{i:05d}", category, sub, f"{sub} model {i}")
+        for category, subs in PRODUCTS.items() for sub in subs for i in range(200)
+    ], dtype=object)
+
+    with open(path, "w", encoding="ISO-8859-1", errors="replace", newline="") as f:
+        for first in range(0, rows, chunk_rows):
+            chunk = _superstore_chunk(first, min(chunk_rows, rows - first), rng, order_days, customers, products)
+            chunk.to_csv(f, index=False, header=first == 0, lineterminator="\n")
+    return rows
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Write synthetic dashboard datasets.")
+    sub = parser.add_subparsers(dest="kind", required=True)
+    power = sub.add_parser("power", help="NASA POWER point CSV")
+    power.add_argument("path")
+    power.add_argument("--years", type=int, default=25)
+    power.add_argument("--start-year", type=int, default=2000)
+    power.add_argument("--hourly", action="store_true")
+    power.add_argument("--seed", type=int, default=0)
+    orders = sub.add_parser("superstore", help="Global_Superstore2.csv-shaped orders")
+    orders.add_argument("path")
+    orders.add_argument("--rows", type=int, default=51_290)
+    orders.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.kind == "power":
+        n = write_power_csv(args.path, args.years, args.start_year, args.hourly, seed=args.seed)
+    else:
+        n = write_superstore_csv(args.path, args.rows, seed=args.seed)
+    print(f"{args.path}: {n:,} rows")
@@ -4,11 +4,43 @@
 
 import streamlit as st
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
 import numpy as np
 import os
 
+from aggregates import bin_daily, derive_aggregates
+from figure_cache import FigureCache, figure_key, lttb
+from frame_buffer import FrameBuffer
+from instrumentation import RequestProfiler, count, metrics, serve_metrics, timed
+from lazy_import import lazy_import
+from covariance import SEASONS, MomentsCube
+from events import EventRule, detect_events, extend_events, longest_by_year, longest_runs
+from power_cache import iter_cached_batches, load_power_table, load_power_tail
+from power_reader import DATE_PARTS, read_header
+from pv_yield import PV_PARAMETERS, PVWeather, system_grid
+from station_store import StationStore
+from trends import YEARLY_WINDOWS, daily_trend, extend_daily_trend
+
+# plotly.express loads with the first figure build, after the page has started streaming
+px = lazy_import("plotly.express")
+
+DATA_DIR = os.environ.get("POWER_DATA_DIR", os.path.join("projects", "Chakwal_Climate_Solar_Trends"))
+DEFAULT_STATION = "POWER_Point_Daily_20000101_20241231_032d93N_072d86E_LST"
+PARAMETERS = ["T2M", "T2M_MAX", "PRECTOTCORR", "ALLSKY_SFC_SW_DWN"]
+COLUMNS = ["DATE", "YEAR", "MO", "DY", *PARAMETERS]
+RENAME = {
+    "T2M": "Mean_Temp_C",
+    "T2M_MAX": "Max_Temp_C",
+    "PRECTOTCORR": "Total_Rain_mm",
+    "ALLSKY_SFC_SW_DWN": "Solar_Irradiance_kWh_per_m²_per_day"
+}
+MONTH_ORDER = ["Jan","Feb","Mar","Apr","May","Jun","Jul","Aug","Sep","Oct","Nov","Dec"]
+DRY_MM, HEAT_C, CLOUDY_KWH, MIN_EVENT_DAYS = 1.0, 40.0, 3.0, 3
+PV_COLUMNS = ["DATE", "YEAR", "MO", *PV_PARAMETERS]
+PV_TILT_STEP = 2
+PV_LOSSES = [8, 10, 12, 14, 16, 18, 20]
+PV_TEMP_COEFFS = [-0.25, -0.30, -0.35, -0.40, -0.45, -0.50]
+
 # -------------------------------
 # Page Config
 # -------------------------------
@@ -21,144 +53,227 @@ st.set_page_config(
 # -------------------------------
 # Load & Prepare Data (Optimized)
 # -------------------------------
-@st.cache_data
-def load_data():
-    file_path = os.path.join(
-        "projects",
-        "Chakwal_Climate_Solar_Trends",
-        "POWER_Point_Daily_20000101_20241231_032d93N_072d86E_LST.csv"
+def prepare_frame(df):
+    df["year"] = df["YEAR"]
+    df["month"] = df["MO"]
+    df["month_name"] = pd.Categorical.from_codes(df["MO"] - 1, categories=MONTH_ORDER)
+
+    return df.rename(columns=RENAME)
+
+def correlation_cube(chunks):
+    # One chunked pass over every POWER parameter into per-(year, season) moments
+    cube = None
+    for chunk in chunks:
+        if cube is None:
+            cube = MomentsCube([c for c in chunk.columns if c not in DATE_PARTS and c != "DATE"])
+        cube.add_frame(chunk)
+    return cube
+
+def event_rules(dry_mm=DRY_MM, heat_c=HEAT_C, cloudy_kwh=CLOUDY_KWH, min_days=MIN_EVENT_DAYS):
+    return (
+        EventRule("Dry spell", "Total_Rain_mm", dry_mm),
+        EventRule("Heatwave", "Max_Temp_C", heat_c, below=False, min_length=min_days),
+        EventRule("Cloudy spell", "Solar_Irradiance_kWh_per_m²_per_day", cloudy_kwh,
+                  min_length=min_days, peak="min"),
     )
 
-    df = pd.read_csv(file_path, skiprows=32)
-
-    for col in ["YEAR", "MO", "DY"]:
-        if col not in df.columns:
-            raise ValueError(f"Column '{col}' is missing from the dataset!")
-
-    df["YEAR"] = df["YEAR"].astype(int)
-    df["MO"] = df["MO"].fillna(1).astype(int)
-    df["DY"] = df["DY"].fillna(1).astype(int)
-
-    df["DATE"] = pd.to_datetime(dict(year=df["YEAR"], month=df["MO"], day=df["DY"]), errors="coerce")
-    df["year"] = df["DATE"].dt.year
-    df["month"] = df["DATE"].dt.month
-    df["month_name"] = df["DATE"].dt.strftime("%b")
+def pv_weather(file_path, cache_dir=None):
+    # PV inputs are mapped from the same columnar cache; exports without them get a note instead
+    header = read_header(file_path)
+    if not set(PV_PARAMETERS) <= set(header.columns):
+        return None
+    return PVWeather.from_frame(load_power_table(file_path, columns=PV_COLUMNS, cache_dir=cache_dir), header.latitude)
+
+@timed("load_data")
+def load_data(file_path, cache_dir=None):
+    # Typed columnar cache, re-ingested only when the CSV's size/mtime change;
+    # -999 fill values are already NaN and only the used parameters are mapped
+    df = prepare_frame(load_power_table(file_path, columns=COLUMNS, cache_dir=cache_dir))
+    count("rows_processed_total", len(df), stage="load_data")
+
+    # Precompute aggregates in one binned pass to avoid recalculating in tabs
+    with timed("aggregation"):
+        stats = bin_daily(df)
+        aggregates = derive_aggregates(stats)
+        aggregates["stats"] = stats
+        # adopts the columns without a copy; appends grow it in place
+        aggregates["rows"] = FrameBuffer(df)
+        aggregates["daily_temp_trend"] = daily_trend(df["DATE"].to_numpy(), df["Mean_Temp_C"].to_numpy())
+    with timed("event_detection"):
+        aggregates["events"] = detect_events(df, event_rules())
 
-    df = df.rename(columns={
-        "T2M": "Mean_Temp_C",
-        "T2M_MAX": "Max_Temp_C",
-        "PRECTOTCORR": "Total_Rain_mm",
-        "ALLSKY_SFC_SW_DWN": "Solar_Irradiance_kWh_per_m²_per_day"
-    })
-
-    month_order = ["Jan","Feb","Mar","Apr","May","Jun","Jul","Aug","Sep","Oct","Nov","Dec"]
+    # Correlation
+    with timed("correlation"):
+        aggregates["corr_cube"] = correlation_cube(iter_cached_batches(file_path, cache_dir=cache_dir))
+    with timed("pv_weather"):
+        aggregates["pv_weather"] = pv_weather(file_path, cache_dir)
 
-    # Precompute aggregates to avoid recalculating in tabs
-    aggregates = {}
+    return df, aggregates
 
-    aggregates["yearly_temp"] = df.groupby("year")["Mean_Temp_C"].mean().reset_index()
-    aggregates["yearly_max_temp"] = df.groupby("year")["Max_Temp_C"].max().reset_index()
-    aggregates["annual_rain"] = df.groupby("year")["Total_Rain_mm"].sum().reset_index()
-    aggregates["annual_solar"] = df.groupby("year")["Solar_Irradiance_kWh_per_m²_per_day"].mean().reset_index()
-    aggregates["annual_solar"]["Clipped"] = aggregates["annual_solar"]["Solar_Irradiance_kWh_per_m²_per_day"].clip(
-        lower=aggregates["annual_solar"]["Solar_Irradiance_kWh_per_m²_per_day"].mean()-2*aggregates["annual_solar"]["Solar_Irradiance_kWh_per_m²_per_day"].std(),
-        upper=aggregates["annual_solar"]["Solar_Irradiance_kWh_per_m²_per_day"].mean()+2*aggregates["annual_solar"]["Solar_Irradiance_kWh_per_m²_per_day"].std()
+@timed("append_data")
+def append_data(loaded, file_path, cache_dir=None):
+    # Newly appended days only touch their own rows, bins, moments, trend tail
+    # and the event runs still open on the old last day
+    df, previous = loaded
+    tail = load_power_tail(file_path, since=df["DATE"].iloc[-1], cache_dir=cache_dir)
+    if tail is None:
+        return load_data(file_path, cache_dir)
+    if tail.empty:
+        return loaded
+    new = prepare_frame(tail[COLUMNS].copy())
+    count("rows_processed_total", len(new), stage="append_data")
+
+    stats = previous["stats"].update(bin_daily(new))
+    # Rows go into the spare capacity of the column buffers instead of a full concat
+    rows = previous["rows"]
+    n_old, df = len(df), rows.append(new)
+
+    aggregates = derive_aggregates(stats)
+    aggregates["stats"] = stats
+    aggregates["rows"] = rows
+    aggregates["daily_temp_trend"] = extend_daily_trend(
+        previous["daily_temp_trend"], df["DATE"].to_numpy(), df["Mean_Temp_C"].to_numpy()
     )
-    aggregates["annual_solar"]["Trend"] = aggregates["annual_solar"]["Clipped"].rolling(3, center=True).mean()
-
-    aggregates["monthly"] = df.groupby(["year","month"]).agg({
-        "Mean_Temp_C":"mean",
-        "Total_Rain_mm":"sum"
-    }).reset_index()
-    aggregates["monthly_solar"] = df.groupby(["year","month"])["Solar_Irradiance_kWh_per_m²_per_day"].mean().reset_index()
-    aggregates["monthly_solar"] = aggregates["monthly_solar"].sort_values("year")
-    aggregates["monthly_solar"]["Trend"] = aggregates["monthly_solar"]["Solar_Irradiance_kWh_per_m²_per_day"].rolling(3, center=True).mean()
-
-    # Heatmaps
-    pivot_temp = aggregates["monthly"].pivot(index="month", columns="year", values="Mean_Temp_C").sort_index()
-    pivot_temp.index = [month_order[int(m)-1] for m in pivot_temp.index]
-    aggregates["heatmap_temp"] = pivot_temp
-
-    pivot_rain = aggregates["monthly"].pivot(index="month", columns="year", values="Total_Rain_mm").sort_index()
-    pivot_rain.index = [month_order[int(m)-1] for m in pivot_rain.index]
-    aggregates["heatmap_rain"] = pivot_rain
-
-    # Seasonal
-    seasonal_avg = df.groupby("month").agg({
-        "Mean_Temp_C":"mean",
-        "Total_Rain_mm":"mean"
-    }).reset_index()
-    seasonal_avg["month_name"] = seasonal_avg["month"].apply(lambda x: month_order[x-1])
-    aggregates["seasonal_avg"] = seasonal_avg
-
-    # Correlation
-    aggregates["corr_matrix"] = df[["Mean_Temp_C","Max_Temp_C","Total_Rain_mm","Solar_Irradiance_kWh_per_m²_per_day"]].corr()
-
-    # Highlights
-    aggregates["hottest_year"] = int(df.groupby("year")["Max_Temp_C"].mean().idxmax())
-    aggregates["hottest_val"] = float(df.groupby("year")["Max_Temp_C"].mean().max())
-    aggregates["coolest_year"] = int(df.groupby("year")["Mean_Temp_C"].mean().idxmin())
-    aggregates["coolest_val"] = float(df.groupby("year")["Mean_Temp_C"].mean().min())
-    aggregates["wettest_year"] = int(df.groupby("year")["Total_Rain_mm"].sum().idxmax())
-    aggregates["wettest_val"] = float(df.groupby("year")["Total_Rain_mm"].sum().max())
-    aggregates["driest_year"] = int(df.groupby("year")["Total_Rain_mm"].sum().idxmin())
-    aggregates["driest_val"] = float(df.groupby("year")["Total_Rain_mm"].sum().min())
-    aggregates["solar_year"] = int(df.groupby("year")["Solar_Irradiance_kWh_per_m²_per_day"].mean().idxmax())
-    aggregates["solar_val"] = float(df.groupby("year")["Solar_Irradiance_kWh_per_m²_per_day"].mean().max())
-    aggregates["rainiest_month"] = df.groupby("month_name")["Total_Rain_mm"].sum().idxmax()
-    aggregates["longest_dry"] = int((df["Total_Rain_mm"]==0).astype(int).groupby(df["year"]).sum().max())
+    aggregates["corr_cube"] = previous["corr_cube"] + correlation_cube([tail])
+    aggregates["events"] = extend_events(previous["events"], df, n_old, event_rules())
+    weather = previous["pv_weather"]
+    aggregates["pv_weather"] = None if weather is None else weather.extend(tail[PV_COLUMNS])
 
     return df, aggregates
 
-df, agg = load_data()
-month_order = ["Jan","Feb","Mar","Apr","May","Jun","Jul","Aug","Sep","Oct","Nov","Dec"]
+# One shared, bounded store for every session instead of an unbounded st.cache_data
+@st.cache_resource
+def get_station_store():
+    return StationStore(DATA_DIR, loader=load_data, appender=append_data)
+
+@st.cache_resource
+def get_figure_cache():
+    cache = FigureCache()
+    metrics.collector(lambda: [
+        ("cache_requests_total", "counter", "Cache lookups by result", {"cache": "figure", "result": "hit"}, cache.hits),
+        ("cache_requests_total", "counter", "Cache lookups by result", {"cache": "figure", "result": "miss"}, cache.misses),
+        ("cache_entries", "gauge", "Entries held per cache", {"cache": "figure"}, len(cache)),
+    ])
+    return cache
+
+# Streamlit has no custom routes, so Prometheus scrapes an opt-in side endpoint
+# (METRICS_PORT, on METRICS_HOST or localhost); PROFILE_DIR enables rerun profiling
+@st.cache_resource
+def start_instrumentation():
+    port = os.environ.get("METRICS_PORT")
+    if port:
+        try:
+            serve_metrics(int(port), os.environ.get("METRICS_HOST", "127.0.0.1"))
+        except OSError:
+            pass  # another app process already serves this port
+    return RequestProfiler.from_env()
+
+def station_label(station_id):
+    row = stations.loc[station_id]
+    return f"{row['lat']:.2f}°N, {row['lon']:.2f}°E ({row['start']:%Y}–{row['end']:%Y})"
+
+store = get_station_store()
+stations = store.index.dropna(subset=["lat", "lon"])
+month_order = MONTH_ORDER
 
 # -------------------------------
 # Sidebar Navigation
 # -------------------------------
 st.sidebar.title("🌍 Chakwal Climate Dashboard")
+station_id = st.sidebar.selectbox(
+    "Station",
+    list(stations.index),
+    index=list(stations.index).index(DEFAULT_STATION) if DEFAULT_STATION in stations.index else 0,
+    format_func=station_label
+)
 tab = st.sidebar.radio(
     "Navigate",
-    ["Overview", "Temperature", "Rainfall & Solar", "Monthly Trends & Heatmaps", "Correlation & Insights", "Seasonal Analysis", "Highlights & Location"]
+    ["Overview", "Temperature", "Rainfall & Solar", "Solar PV Yield", "Monthly Trends & Heatmaps", "Correlation & Insights", "Seasonal Analysis", "Highlights & Location"]
 )
 
+profiler = start_instrumentation()
+# A rerun cut short (st.stop, an exception, a newer rerun) never reaches the
+# bottom of the script: its profile is discarded when the session reruns and
+# only completed reruns are timed
+if "stop_profile" in st.session_state:
+    st.session_state.pop("stop_profile")(discard=True)
+st.session_state["stop_profile"] = profiler.start(f"rerun-{tab}")
+rerun_timer = timed("rerun", tab=tab).start()
+
+df, agg = store.load(station_id)
+station = stations.loc[station_id]
+dataset_version = store.version(station_id)
+figures = get_figure_cache()
+
+def show_figure(name, builder, *widget_values):
+    # Serialized figure reused across reruns/sessions until a key part changes
+    figure = figures.get_or_build(figure_key(tab, name, widget_values, dataset_version), builder)
+    with timed("figure_render", figure=name):
+        st.plotly_chart(figure, use_container_width=True)
+
 # -------------------------------
 # Overview
 # -------------------------------
 if tab == "Overview":
-    st.markdown("<h2 style='color:#000000;'>🌄 Climate Overview (2000–2024)</h2>", unsafe_allow_html=True)
+    st.markdown(f"<h2 style='color:#000000;'>🌄 Climate Overview ({station['start']:%Y}–{station['end']:%Y})</h2>", unsafe_allow_html=True)
 
+    overview = agg["overview"]
     col1, col2, col3 = st.columns(3)
-    col1.metric("Avg Temperature (°C)", f"{df['Mean_Temp_C'].mean():.1f}",
-                delta=f"{df['Mean_Temp_C'].max()-df['Mean_Temp_C'].min():.1f}")
-    col2.metric("Total Rainfall (mm)", f"{df['Total_Rain_mm'].sum():.1f}",
-                delta=f"{df['Total_Rain_mm'].max()-df['Total_Rain_mm'].min():.1f}")
-    col3.metric("Avg Solar Irradiance", f"{df['Solar_Irradiance_kWh_per_m²_per_day'].mean():.2f} kWh/m²/day",
-                delta=f"{df['Solar_Irradiance_kWh_per_m²_per_day'].max()-df['Solar_Irradiance_kWh_per_m²_per_day'].min():.2f}")
-
-    roll_window = st.selectbox("Select Rolling Trend Window (years)", [3,5,10], index=0)
-    yearly_temp = agg["yearly_temp"].copy()
-    yearly_temp["Trend"] = yearly_temp["Mean_Temp_C"].rolling(roll_window, center=True).mean()
-
-    fig = px.line(
-        yearly_temp, x="year", y="Mean_Temp_C",
-        title="Average Annual Temperature with Rolling Trend",
-        markers=True, template="plotly_white"
-    )
-    fig.add_trace(go.Scatter(
-        x=yearly_temp["year"], y=yearly_temp["Trend"],
-        mode="lines", name=f"{roll_window}-Year Trend",
-        line=dict(color="red", dash="dash")
-    ))
-    fig.add_trace(go.Scatter(
-        x=yearly_temp["year"], y=yearly_temp["Trend"] + yearly_temp["Mean_Temp_C"].std(),
-        fill=None, mode='lines', line_color='lightpink', showlegend=False
-    ))
-    fig.add_trace(go.Scatter(
-        x=yearly_temp["year"], y=yearly_temp["Trend"] - yearly_temp["Mean_Temp_C"].std(),
-        fill='tonexty', mode='lines', line_color='lightpink', name="Trend ±1 Std Dev"
-    ))
-    st.plotly_chart(fig, use_container_width=True)
+    col1.metric("Avg Temperature (°C)", f"{overview['temp_mean']:.1f}",
+                delta=f"{overview['temp_range']:.1f}")
+    col2.metric("Total Rainfall (mm)", f"{overview['rain_total']:.1f}",
+                delta=f"{overview['rain_range']:.1f}")
+    col3.metric("Avg Solar Irradiance", f"{overview['solar_mean']:.2f} kWh/m²/day",
+                delta=f"{overview['solar_range']:.2f}")
+
+    roll_window = st.selectbox("Select Rolling Trend Window (years)", list(YEARLY_WINDOWS), index=0)
+
+    def build_temp_trend():
+        yearly_temp = agg["yearly_temp"]
+        trend = agg["temp_trends"].get("Mean_Temp_C", roll_window)
+
+        fig = px.line(
+            yearly_temp, x="year", y="Mean_Temp_C",
+            title="Average Annual Temperature with Rolling Trend",
+            markers=True, template="plotly_white"
+        )
+        fig.add_trace(go.Scatter(
+            x=trend["year"], y=trend["Trend"],
+            mode="lines", name=f"{roll_window}-Year Trend",
+            line=dict(color="red", dash="dash")
+        ))
+        fig.add_trace(go.Scatter(
+            x=trend["year"], y=trend["Trend"] + trend["Trend_Std"],
+            fill=None, mode='lines', line_color='lightpink', showlegend=False
+        ))
+        fig.add_trace(go.Scatter(
+            x=trend["year"], y=trend["Trend"] - trend["Trend_Std"],
+            fill='tonexty', mode='lines', line_color='lightpink', name="Trend ±1 Rolling Std Dev"
+        ))
+        return fig
+    show_figure("temp_trend", build_temp_trend, roll_window)
+
+    def build_daily_trend():
+        # Daily series are LTTB-downsampled so the browser gets ~2k points
+        daily = agg["daily_temp_trend"]
+        x_raw, y_raw = lttb(df["DATE"].to_numpy(), df["Mean_Temp_C"].to_numpy())
+        x_trend, y_trend = lttb(daily["DATE"].to_numpy(), daily["Trend"].to_numpy())
+
+        fig_daily = go.Figure()
+        fig_daily.add_trace(go.Scattergl(
+            x=x_raw, y=y_raw, mode="lines", name="Daily Mean",
+            line=dict(color="lightgray", width=1)
+        ))
+        fig_daily.add_trace(go.Scattergl(
+            x=x_trend, y=y_trend, mode="lines", name="365-Day Moving Mean",
+            line=dict(color="red")
+        ))
+        fig_daily.update_layout(
+            title="Daily Mean Temperature with 365-Day Moving Mean",
+            xaxis_title="Date", yaxis_title="Temp °C", template="plotly_white"
+        )
+        return fig_daily
+    show_figure("daily_trend", build_daily_trend)
 
 # -------------------------------
 # Temperature
@@ -166,22 +281,24 @@ if tab == "Overview":
 elif tab == "Temperature":
     st.markdown("<h2 style='color:#000000;'>🌡 Temperature Analysis</h2>", unsafe_allow_html=True)
 
-    yearly_max = agg["yearly_max_temp"].copy()
-    mean_temp = yearly_max["Max_Temp_C"].mean()
-    std_temp = yearly_max["Max_Temp_C"].std()
-    yearly_max["Anomaly"] = yearly_max["Max_Temp_C"] > (mean_temp + std_temp)
-
-    fig = px.scatter(
-        yearly_max, x="year", y="Max_Temp_C", color="Anomaly",
-        color_discrete_map={True: "green", False: "red"},
-        title="Max Temperature with Anomalies", template="plotly_white"
-    )
-    fig.add_trace(go.Scatter(
-        x=yearly_max["year"], y=yearly_max["Max_Temp_C"].rolling(3).mean(),
-        mode="lines", name="3-Year Avg",
-        line=dict(color="orange", dash="dash")
-    ))
-    st.plotly_chart(fig, use_container_width=True)
+    def build_max_temp():
+        yearly_max = agg["yearly_max_temp"].copy()
+        mean_temp = yearly_max["Max_Temp_C"].mean()
+        std_temp = yearly_max["Max_Temp_C"].std()
+        yearly_max["Anomaly"] = yearly_max["Max_Temp_C"] > (mean_temp + std_temp)
+
+        fig = px.scatter(
+            yearly_max, x="year", y="Max_Temp_C", color="Anomaly",
+            color_discrete_map={True: "green", False: "red"},
+            title="Max Temperature with Anomalies", template="plotly_white"
+        )
+        fig.add_trace(go.Scatter(
+            x=yearly_max["year"], y=agg["max_temp_trend"],
+            mode="lines", name="3-Year Avg",
+            line=dict(color="orange", dash="dash")
+        ))
+        return fig
+    show_figure("max_temp", build_max_temp)
 
 # -------------------------------
 # Rainfall & Solar
@@ -189,26 +306,109 @@ elif tab == "Temperature":
 elif tab == "Rainfall & Solar":
     st.markdown("<h2 style='color:#000000;'>🌧 Rainfall & ☀ Solar</h2>", unsafe_allow_html=True)
 
-    fig_rain = px.bar(
-        agg["annual_rain"], x="year", y="Total_Rain_mm",
-        title="Annual Total Rainfall (mm)", template="plotly_white",
-        color_discrete_sequence=["#1f77b4"]
-    )
-    st.plotly_chart(fig_rain, use_container_width=True)
+    def build_annual_rain():
+        return px.bar(
+            agg["annual_rain"], x="year", y="Total_Rain_mm",
+            title="Annual Total Rainfall (mm)", template="plotly_white",
+            color_discrete_sequence=["#1f77b4"]
+        )
+    show_figure("annual_rain", build_annual_rain)
+
+    def build_annual_solar():
+        fig_solar = px.line(
+            agg["annual_solar"], x="year", y="Clipped",
+            title="Annual Solar Irradiance (Clipped ±2σ) with 3-Year Trend",
+            markers=True, template="plotly_white"
+        )
+        fig_solar.update_traces(line=dict(color="gold"), marker=dict(color="gold"))
+        fig_solar.add_trace(go.Scatter(
+            x=agg["annual_solar"]["year"], y=agg["annual_solar"]["Trend"],
+            mode="lines",
+            name="3-Year Trend",
+            line=dict(color="orange", dash="dash")
+        ))
+        return fig_solar
+    show_figure("annual_solar", build_annual_solar)
 
-    fig_solar = px.line(
-        agg["annual_solar"], x="year", y="Clipped",
-        title="Annual Solar Irradiance (Clipped ±2σ) with 3-Year Trend",
-        markers=True, template="plotly_white"
-    )
-    fig_solar.update_traces(line=dict(color="gold"), marker=dict(color="gold"))
-    fig_solar.add_trace(go.Scatter(
-        x=agg["annual_solar"]["year"], y=agg["annual_solar"]["Trend"],
-        mode="lines",
-        name="3-Year Trend",
-        line=dict(color="orange", dash="dash")
-    ))
-    st.plotly_chart(fig_solar, use_container_width=True)
+# -------------------------------
+# Solar PV Yield
+# -------------------------------
+elif tab == "Solar PV Yield":
+    st.markdown("<h2 style='color:#000000;'>🔆 Solar PV Yield</h2>", unsafe_allow_html=True)
+
+    weather = agg["pv_weather"]
+    if weather is None:
+        st.info("This station's export lacks the irradiance, temperature or wind series needed for PV yield.")
+    else:
+        # Every combination below is simulated at once over the whole daily record
+        c1, c2, c3, c4 = st.columns(4)
+        tilt_range = c1.slider("Tilt range (°)", 0, 90, (0, 60), PV_TILT_STEP)
+        capacity = c2.number_input("System capacity (kWp)", 0.5, 1000.0, 5.0, 0.5)
+        losses = c3.multiselect("System losses (%)", PV_LOSSES, default=[10, 14, 18])
+        temp_coeffs = c4.multiselect("Temp. coefficient (%/°C)", PV_TEMP_COEFFS, default=[-0.30, -0.35, -0.40, -0.45])
+
+        if not losses or not temp_coeffs:
+            st.info("Select at least one loss level and temperature coefficient.")
+        else:
+            tilts = np.arange(tilt_range[0], tilt_range[1] + 1, PV_TILT_STEP)
+            grid = system_grid(tilts, [capacity], np.divide(losses, 100), np.divide(temp_coeffs, 100))
+            with timed("pv_simulation") as sim_timer:
+                result = weather.simulate(grid)
+                summary = result.summary()
+            best = summary["Yield_kWh"].idxmax()
+            design = summary.loc[best]
+            st.caption(f"{len(grid)} configurations simulated over {len(weather.dates):,} days "
+                       f"in {sim_timer.elapsed * 1000:.0f} ms.")
+
+            col1, col2, col3, col4 = st.columns(4)
+            col1.metric("Best Tilt", f"{design['tilt']:.0f}°")
+            col2.metric("Annual Yield", f"{design['Yield_kWh']:,.0f} kWh",
+                        delta=f"{design['Specific_Yield_kWh_per_kWp']:,.0f} kWh/kWp")
+            col3.metric("Performance Ratio", f"{design['Performance_Ratio']:.1%}")
+            col4.metric("Clear-Sky Ratio", f"{design['Clear_Sky_Ratio']:.1%}")
+            grid_key = (tilt_range, capacity, tuple(losses), tuple(temp_coeffs))
+
+            def build_yield_by_tilt():
+                table = summary.assign(
+                    Losses=(summary["losses"] * 100).map("{:.0f}%".format),
+                    Temp_Coeff=(summary["temp_coeff"] * 100).map("{:.2f}%/°C".format),
+                )
+                return px.line(
+                    table, x="tilt", y="Specific_Yield_kWh_per_kWp", color="Temp_Coeff", line_dash="Losses",
+                    title="Mean Annual Specific Yield by Tilt", template="plotly_white",
+                    labels={"tilt": "Tilt (°)", "Specific_Yield_kWh_per_kWp": "kWh/kWp"}
+                )
+            show_figure("pv_yield_by_tilt", build_yield_by_tilt, grid_key)
+
+            def build_monthly_yield():
+                monthly = result.monthly()
+                monthly = monthly[monthly["config"] == best].groupby("month")[["Yield_kWh", "Clear_Sky_kWh"]].mean()
+                fig = go.Figure()
+                fig.add_trace(go.Bar(x=month_order, y=monthly["Yield_kWh"], name="All-Sky Yield",
+                                     marker_color="gold"))
+                fig.add_trace(go.Scatter(x=month_order, y=monthly["Clear_Sky_kWh"], mode="lines+markers",
+                                         name="Clear-Sky Potential", line=dict(color="orange", dash="dash")))
+                fig.update_layout(
+                    title=f"Average Monthly Yield at {design['tilt']:.0f}° Tilt",
+                    yaxis_title="kWh", template="plotly_white"
+                )
+                return fig
+            show_figure("pv_monthly_yield", build_monthly_yield, grid_key)
+
+            def build_yearly_yield():
+                yearly = result.yearly()
+                yearly = yearly[yearly["config"] == best]
+                fig = px.bar(
+                    yearly, x="year", y="Yield_kWh", hover_data={"Performance_Ratio": ":.1%", "Clear_Sky_Ratio": ":.1%"},
+                    title=f"Annual Yield at {design['tilt']:.0f}° Tilt", template="plotly_white",
+                    color_discrete_sequence=["gold"]
+                )
+                fig.add_trace(go.Scatter(
+                    x=yearly["year"], y=yearly["Clear_Sky_kWh"], mode="lines", name="Clear-Sky Potential",
+                    line=dict(color="orange", dash="dash")
+                ))
+                return fig
+            show_figure("pv_yearly_yield", build_yearly_yield, grid_key)
 
 # -------------------------------
 # Monthly Trends & Heatmaps
@@ -218,66 +418,73 @@ elif tab == "Monthly Trends & Heatmaps":
 
     selected_month = st.selectbox("Select Month for Trends", month_order, index=0)
     selected_month_num = month_order.index(selected_month) + 1
-
     month_df = agg["monthly"][agg["monthly"]["month"]==selected_month_num].sort_values("year")
-    fig_temp = px.line(
-        month_df, x="year", y="Mean_Temp_C",
-        title=f"📈 {selected_month} Mean Temperature Across Years",
-        markers=True, template="plotly_white"
-    )
-    fig_temp.update_traces(line=dict(color="orange"), marker=dict(color="orange"))
-    st.plotly_chart(fig_temp, use_container_width=True)
 
-    fig_rain = px.bar(
-        month_df, x="year", y="Total_Rain_mm",
-        title=f"🌧 {selected_month} Rainfall Across Years",
-        template="plotly_white", color_discrete_sequence=["#1f77b4"]
-    )
-    st.plotly_chart(fig_rain, use_container_width=True)
-
-    monthly_solar = agg["monthly_solar"][agg["monthly_solar"]["month"]==selected_month_num].sort_values("year")
-    fig_solar_month = go.Figure()
-    fig_solar_month.add_trace(go.Scatter(
-        x=monthly_solar["year"],
-        y=monthly_solar["Solar_Irradiance_kWh_per_m²_per_day"],
-        mode="lines+markers",
-        name="Solar Irradiance",
-        line=dict(color="gold"),
-        marker=dict(color="gold", size=6)
-    ))
-    fig_solar_month.add_trace(go.Scatter(
-        x=monthly_solar["year"],
-        y=monthly_solar["Trend"],
-        mode="lines",
-        name="3-Year Trend",
-        line=dict(color="orange", dash="dash")
-    ))
-    fig_solar_month.update_layout(
-        title=f"Solar Irradiance in {selected_month} (kWh/m²/day) with 3-Year Trend",
-        xaxis_title="Year",
-        yaxis_title="Solar Irradiance",
-        template="plotly_white"
-    )
-    st.plotly_chart(fig_solar_month, use_container_width=True)
-
-    # Heatmaps
-    fig_heat_temp = px.imshow(
-        agg["heatmap_temp"],
-        labels=dict(x="Year", y="Month", color="Temp °C"),
-        color_continuous_scale="Oranges",
-        title="Monthly Mean Temperature Heatmap",
-        aspect="auto"
-    )
-    st.plotly_chart(fig_heat_temp, use_container_width=True)
-
-    fig_heat_rain = px.imshow(
-        agg["heatmap_rain"],
-        labels=dict(x="Year", y="Month", color="Rain (mm)"),
-        color_continuous_scale=px.colors.sequential.Blues,
-        title="Monthly Rainfall Heatmap",
-        aspect="auto"
-    )
-    st.plotly_chart(fig_heat_rain, use_container_width=True)
+    def build_month_temp():
+        fig_temp = px.line(
+            month_df, x="year", y="Mean_Temp_C",
+            title=f"📈 {selected_month} Mean Temperature Across Years",
+            markers=True, template="plotly_white"
+        )
+        fig_temp.update_traces(line=dict(color="orange"), marker=dict(color="orange"))
+        return fig_temp
+    show_figure("month_temp", build_month_temp, selected_month)
+
+    def build_month_rain():
+        return px.bar(
+            month_df, x="year", y="Total_Rain_mm",
+            title=f"🌧 {selected_month} Rainfall Across Years",
+            template="plotly_white", color_discrete_sequence=["#1f77b4"]
+        )
+    show_figure("month_rain", build_month_rain, selected_month)
+
+    def build_month_solar():
+        monthly_solar = agg["monthly_solar"][agg["monthly_solar"]["month"]==selected_month_num].sort_values("year")
+        fig_solar_month = go.Figure()
+        fig_solar_month.add_trace(go.Scatter(
+            x=monthly_solar["year"],
+            y=monthly_solar["Solar_Irradiance_kWh_per_m²_per_day"],
+            mode="lines+markers",
+            name="Solar Irradiance",
+            line=dict(color="gold"),
+            marker=dict(color="gold", size=6)
+        ))
+        fig_solar_month.add_trace(go.Scatter(
+            x=monthly_solar["year"],
+            y=monthly_solar["Trend"],
+            mode="lines",
+            name="3-Year Trend",
+            line=dict(color="orange", dash="dash")
+        ))
+        fig_solar_month.update_layout(
+            title=f"Solar Irradiance in {selected_month} (kWh/m²/day) with 3-Year Trend",
+            xaxis_title="Year",
+            yaxis_title="Solar Irradiance",
+            template="plotly_white"
+        )
+        return fig_solar_month
+    show_figure("month_solar", build_month_solar, selected_month)
+
+    # Heatmaps (independent of the month selector, so shared by all months)
+    def build_heat_temp():
+        return px.imshow(
+            agg["heatmap_temp"],
+            labels=dict(x="Year", y="Month", color="Temp °C"),
+            color_continuous_scale="Oranges",
+            title="Monthly Mean Temperature Heatmap",
+            aspect="auto"
+        )
+    show_figure("heatmap_temp", build_heat_temp)
+
+    def build_heat_rain():
+        return px.imshow(
+            agg["heatmap_rain"],
+            labels=dict(x="Year", y="Month", color="Rain (mm)"),
+            color_continuous_scale=px.colors.sequential.Blues,
+            title="Monthly Rainfall Heatmap",
+            aspect="auto"
+        )
+    show_figure("heatmap_rain", build_heat_rain)
 
 # -------------------------------
 # Correlation & Insights
@@ -285,14 +492,38 @@ elif tab == "Monthly Trends & Heatmaps":
 elif tab == "Correlation & Insights":
     st.markdown("<h2 style='color:#000000;'>📊 Correlation & Insights</h2>", unsafe_allow_html=True)
 
-    fig_corr = px.imshow(
-        agg["corr_matrix"],
-        text_auto=True,
-        color_continuous_scale="RdBu_r",
-        title="Correlation Between Climate Variables",
-        aspect="auto"
-    )
-    st.plotly_chart(fig_corr, use_container_width=True)
+    # Every view is a merge of precomputed (year, season) moments, no rescans
+    cube = agg["corr_cube"]
+    years = cube.years
+    col1, col2 = st.columns([3, 1])
+    params = col1.multiselect("Parameters", cube.variables, default=PARAMETERS,
+                              format_func=lambda p: RENAME.get(p, p))
+    season = col2.selectbox("Season", ["All", *SEASONS], index=0)
+    year_range = st.slider("Years", years[0], years[-1], (years[0], years[-1]))
+
+    if len(params) < 2:
+        st.info("Select at least two parameters to compare.")
+    else:
+        corr = cube.select(
+            years=year_range, seasons=None if season == "All" else [season], variables=params
+        ).corr().rename(index=RENAME, columns=RENAME)
+
+        def build_corr():
+            return px.imshow(
+                corr,
+                text_auto=".2f",
+                color_continuous_scale="RdBu_r",
+                zmin=-1, zmax=1,
+                title=f"Correlation Between Climate Variables ({year_range[0]}–{year_range[1]}, {season})",
+                aspect="auto"
+            )
+        show_figure("corr", build_corr, tuple(params), year_range, season)
+
+        pairs = corr.where(np.triu(np.ones(corr.shape, dtype=bool), k=1)).stack()
+        strongest = pairs.reindex(pairs.abs().sort_values(ascending=False).index).head(5)
+        st.markdown("**Strongest relationships**\n\n" + "\n".join(
+            f"- {a} ↔ {b}: r = {r:+.2f}" for (a, b), r in strongest.items()
+        ))
 
 # -------------------------------
 # Seasonal Analysis
@@ -300,25 +531,46 @@ elif tab == "Correlation & Insights":
 elif tab == "Seasonal Analysis":
     st.markdown("<h2 style='color:#000000;'>📈 Seasonal Trends</h2>", unsafe_allow_html=True)
 
-    fig_temp = px.line(
-        agg["seasonal_avg"], x="month_name", y="Mean_Temp_C",
-        title="Average Monthly Temperature Across Years",
-        markers=True, template="plotly_white"
-    )
-    st.plotly_chart(fig_temp, use_container_width=True)
-
-    fig_rain = px.bar(
-        agg["seasonal_avg"], x="month_name", y="Total_Rain_mm",
-        title="Average Monthly Rainfall Across Years",
-        template="plotly_white", color_discrete_sequence=["#1f77b4"]
-    )
-    st.plotly_chart(fig_rain, use_container_width=True)
+    def build_seasonal_temp():
+        return px.line(
+            agg["seasonal_avg"], x="month_name", y="Mean_Temp_C",
+            title="Average Monthly Temperature Across Years",
+            markers=True, template="plotly_white"
+        )
+    show_figure("seasonal_temp", build_seasonal_temp)
+
+    def build_seasonal_rain():
+        return px.bar(
+            agg["seasonal_avg"], x="month_name", y="Total_Rain_mm",
+            title="Average Monthly Rainfall Across Years",
+            template="plotly_white", color_discrete_sequence=["#1f77b4"]
+        )
+    show_figure("seasonal_rain", build_seasonal_rain)
 
 # -------------------------------
 # Highlights & Location
 # -------------------------------
 elif tab == "Highlights & Location":
-    st.markdown("<h2 style='color:#000000;'>📊 Climate Highlights & Chakwal Location</h2>", unsafe_allow_html=True)
+    st.markdown("<h2 style='color:#000000;'>📊 Climate Highlights & Station Locations</h2>", unsafe_allow_html=True)
+
+    with st.expander("Event thresholds"):
+        c1, c2, c3, c4 = st.columns(4)
+        dry_mm = c1.number_input("Dry day: rain below (mm)", 0.0, 20.0, DRY_MM, 0.5)
+        heat_c = c2.number_input("Heatwave: max temp from (°C)", 25.0, 55.0, HEAT_C, 0.5)
+        cloudy_kwh = c3.number_input("Cloudy: irradiance below (kWh/m²/day)", 0.5, 8.0, CLOUDY_KWH, 0.25)
+        min_days = c4.number_input("Min. heatwave/cloudy run (days)", 1, 30, MIN_EVENT_DAYS)
+    thresholds = (dry_mm, heat_c, cloudy_kwh, min_days)
+    # Default thresholds are detected once per load; others are one vectorized pass
+    rules = event_rules(*thresholds)
+    events = agg["events"] if rules == event_rules() else detect_events(df, rules)
+    longest = longest_runs(events)
+
+    def spell(name, unit):
+        if name not in longest.index:
+            return "none"
+        run = longest.loc[name]
+        return (f"{run['length']} days ({run['start']:%d %b %Y} – {run['end']:%d %b %Y}, "
+                f"peak {run['peak']:.1f} {unit})")
 
     st.markdown(f"""
     - 🌡 **Hottest Year:** {agg['hottest_year']} (Avg Max Temp {agg['hottest_val']:.1f}°C)  
@@ -327,11 +579,48 @@ elif tab == "Highlights & Location":
     - 🌵 **Driest Year:** {agg['driest_year']} ({agg['driest_val']:.0f} mm rainfall)  
     - ☀ **Highest Solar Irradiance:** {agg['solar_year']} ({agg['solar_val']:.2f} kWh/m²/day)  
     - ⛈ **Rainiest Month (overall):** {agg['rainiest_month']}  
-    - 🔎 **Longest Dry Spell (approx. yearly zeros):** ~{agg['longest_dry']} days
+    - 🔎 **Longest Dry Spell:** {spell("Dry spell", "mm/day")}  
+    - 🔥 **Longest Heatwave:** {spell("Heatwave", "°C")}  
+    - ☁ **Longest Cloudy Spell:** {spell("Cloudy spell", "kWh/m²/day")}
     """)
 
-    st.markdown("### 🗺 Chakwal Location")
-    st.map(pd.DataFrame({"lat":[32.9336], "lon":[72.8530]}), zoom=9)
+    timeline_min = st.slider("Show events lasting at least (days)", 1, 60, 7)
+
+    shown = events[events["length"] >= timeline_min]
+
+    def build_event_timeline():
+        # timeline bars need an exclusive end to give one-day runs a width
+        timeline = shown.assign(finish=shown["end"] + pd.Timedelta(days=1))
+        fig = px.timeline(
+            timeline, x_start="start", x_end="finish", y="event", color="event",
+            hover_data={"length": True, "peak": ":.1f", "finish": False},
+            title="Extreme-Event Timeline", template="plotly_white"
+        )
+        fig.update_yaxes(title=None)
+        return fig
+    if shown.empty:
+        st.info(f"No events lasting at least {timeline_min} days at these thresholds.")
+    else:
+        show_figure("event_timeline", build_event_timeline, thresholds, timeline_min)
+
+    def build_longest_by_year():
+        table = longest_by_year(events).reset_index().melt(id_vars="year", var_name="event", value_name="days")
+        return px.bar(
+            table, x="year", y="days", color="event", barmode="group",
+            title="Longest Run per Year", template="plotly_white"
+        )
+    if not events.empty:
+        show_figure("longest_by_year", build_longest_by_year, thresholds)
+
+    st.markdown("### 🗺 Station Locations")
+    locations = stations[["lat", "lon"]].copy()
+    locations["color"] = np.where(locations.index == station_id, "#d62728", "#1f77b4")
+    locations["size"] = np.where(locations.index == station_id, 1500, 500)
+    st.map(locations, latitude="lat", longitude="lon", color="color", size="size",
+           zoom=9 if len(locations) == 1 else None)
+
+rerun_timer.stop()
+st.session_state.pop("stop_profile")()
 
 # -------------------------------
 # Footer
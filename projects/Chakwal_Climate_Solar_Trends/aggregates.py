@@ -0,0 +1,260 @@
+# ===============================
+# 🧮 Single-pass Aggregate Engine
+# ===============================
+"""Binned climate statistics computed in one vectorized pass.
+
+Every daily row is mapped once to an integer (year, month) bin code. Sums,
+valid counts, minima and maxima for all variables are then accumulated with
+``np.bincount`` / ``ufunc.reduceat`` into a ``(years, 12, variables)`` cube.
+Per-year, per-month and overall statistics are roll-ups of that small cube,
+so adding parameters or longer records does not add more passes over the
+daily data.
+"""
+
+import numpy as np
+import pandas as pd
+
+from trends import TrendCache, rolling_mean
+
+MONTH_ORDER = ["Jan","Feb","Mar","Apr","May","Jun","Jul","Aug","Sep","Oct","Nov","Dec"]
+STATS = ("sum", "count", "mean", "min", "max")
+
+
+def _mean(sums, counts):
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(counts > 0, sums / np.where(counts > 0, counts, 1), np.nan)
+
+
+class BinnedStats:
+    """Sum / count / min / max of each variable per (year, month) bin."""
+
+    def __init__(self, first_year, variables, rows, sums, counts, mins, maxs):
+        self.first_year = int(first_year)
+        self.variables = list(variables)
+        self.rows = rows        # (years, 12) number of daily rows per bin
+        self.sums = sums        # (years, 12, variables), NaNs skipped
+        self.counts = counts    # (years, 12, variables), non-NaN values
+        self.mins = mins        # (years, 12, variables), NaN for empty bins
+        self.maxs = maxs
+
+    @classmethod
+    def from_arrays(cls, year, month, values):
+        """Bin daily arrays; ``values`` maps variable name -> 1-D array."""
+        year = np.asarray(year, dtype=np.int64)
+        month = np.asarray(month, dtype=np.int64)
+        variables = list(values)
+        X = np.column_stack([np.asarray(values[v], dtype=np.float64) for v in variables])
+
+        first_year = int(year.min())
+        n_years = int(year.max()) - first_year + 1
+        n_bins, n_vars = n_years * 12, len(variables)
+        codes = (year - first_year) * 12 + (month - 1)
+
+        valid = ~np.isnan(X)
+        cell = (codes[:, None] * n_vars + np.arange(n_vars)).ravel()
+        sums = np.bincount(cell, weights=np.where(valid, X, 0.0).ravel(), minlength=n_bins * n_vars)
+        counts = np.bincount(cell, weights=valid.ravel(), minlength=n_bins * n_vars)
+        rows = np.bincount(codes, minlength=n_bins)
+
+        # min/max over contiguous runs of equal bin codes
+        order = np.argsort(codes, kind="stable")
+        sorted_codes = codes[order]
+        starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])
+        mins = np.full((n_bins, n_vars), np.nan)
+        maxs = np.full((n_bins, n_vars), np.nan)
+        mins[sorted_codes[starts]] = np.fmin.reduceat(X[order], starts, axis=0)
+        maxs[sorted_codes[starts]] = np.fmax.reduceat(X[order], starts, axis=0)
+
+        shape = (n_years, 12, n_vars)
+        return cls(
+            first_year, variables, rows.reshape(n_years, 12),
+            sums.reshape(shape), counts.reshape(shape), mins.reshape(shape), maxs.reshape(shape),
+        )
+
+    @classmethod
+    def from_frame(cls, df, variables, year="year", month="month"):
+        return cls.from_arrays(df[year].to_numpy(), df[month].to_numpy(), {v: df[v].to_numpy() for v in variables})
+
+    def update(self, other):
+        """Fold the bins of newly appended rows into ``self`` in place.
+
+        Only the (year, month) bins ``other`` covers are touched; the arrays
+        grow when ``other`` reaches into new years.
+        """
+        if other.variables != self.variables:
+            raise ValueError("Cannot merge bins of different variables")
+        last_year = self.first_year + self.rows.shape[0] - 1
+        other_last = other.first_year + other.rows.shape[0] - 1
+        before = max(self.first_year - other.first_year, 0)
+        after = max(other_last - last_year, 0)
+        if before or after:
+            pad = [(before, after)] + [(0, 0)] * (self.sums.ndim - 1)
+            self.rows = np.pad(self.rows, pad[:2])
+            self.sums = np.pad(self.sums, pad)
+            self.counts = np.pad(self.counts, pad)
+            self.mins = np.pad(self.mins, pad, constant_values=np.nan)
+            self.maxs = np.pad(self.maxs, pad, constant_values=np.nan)
+            self.first_year -= before
+
+        lo = other.first_year - self.first_year
+        hi = lo + other.rows.shape[0]
+        self.rows[lo:hi] += other.rows
+        self.sums[lo:hi] += other.sums
+        self.counts[lo:hi] += other.counts
+        np.fmin(self.mins[lo:hi], other.mins, out=self.mins[lo:hi])
+        np.fmax(self.maxs[lo:hi], other.maxs, out=self.maxs[lo:hi])
+        return self
+
+    @property
+    def years(self):
+        return np.arange(self.first_year, self.first_year + self.rows.shape[0])
+
+    def _index(self, var, stat):
+        if stat not in STATS:
+            raise ValueError(f"Unknown statistic '{stat}', expected one of {STATS}")
+        return self.variables.index(var)
+
+    def _reduce(self, var, stat, axis):
+        j = self._index(var, stat)
+        if stat in ("min", "max"):
+            cube = self.mins[..., j] if stat == "min" else self.maxs[..., j]
+            if axis is None:
+                cube, axis = cube.ravel(), 0
+            return (np.fmin if stat == "min" else np.fmax).reduce(cube, axis=axis)
+        sums = self.sums[..., j].sum(axis=axis)
+        counts = self.counts[..., j].sum(axis=axis)
+        return {"sum": sums, "count": counts, "mean": _mean(sums, counts)}[stat]
+
+    def by_year_month(self, var, stat):
+        """``(years, 12)`` array of ``stat`` for every (year, month) bin."""
+        j = self._index(var, stat)
+        if stat == "mean":
+            return _mean(self.sums[..., j], self.counts[..., j])
+        return {"sum": self.sums, "count": self.counts, "min": self.mins, "max": self.maxs}[stat][..., j]
+
+    def by_year(self, var, stat):
+        return self._reduce(var, stat, axis=1)
+
+    def by_month(self, var, stat):
+        return self._reduce(var, stat, axis=0)
+
+    def total(self, var, stat):
+        return float(self._reduce(var, stat, axis=None))
+
+    # -- DataFrame views matching the shape of the old groupby results --
+    def yearly_frame(self, spec):
+        """``spec`` maps variable -> stat; one row per year that has data."""
+        present = self.rows.sum(axis=1) > 0
+        out = pd.DataFrame({"year": self.years[present]})
+        for var, stat in spec.items():
+            out[var] = self.by_year(var, stat)[present]
+        return out
+
+    def year_month_frame(self, spec):
+        """``spec`` maps variable -> stat; one row per (year, month) bin with data."""
+        yi, mi = np.nonzero(self.rows > 0)
+        out = pd.DataFrame({"year": self.years[yi], "month": mi + 1})
+        for var, stat in spec.items():
+            out[var] = self.by_year_month(var, stat)[yi, mi]
+        return out
+
+    def month_frame(self, spec):
+        """``spec`` maps variable -> stat; one row per calendar month with data."""
+        present = np.flatnonzero(self.rows.sum(axis=0) > 0)
+        out = pd.DataFrame({"month": present + 1})
+        for var, stat in spec.items():
+            out[var] = self.by_month(var, stat)[present]
+        return out
+
+    def heatmap(self, var, stat):
+        """Month x year pivot labelled with month names, as used by ``px.imshow``."""
+        values = self.by_year_month(var, stat)
+        years_present = self.rows.sum(axis=1) > 0
+        months_present = self.rows.sum(axis=0) > 0
+        values = np.where(self.rows > 0, values, np.nan)[np.ix_(years_present, months_present)]
+        return pd.DataFrame(
+            values.T,
+            index=[MONTH_ORDER[m] for m in np.flatnonzero(months_present)],
+            columns=pd.Index(self.years[years_present], name="year"),
+        )
+
+
+# -------------------------------
+# Dashboard aggregates
+# -------------------------------
+TEMP = "Mean_Temp_C"
+TMAX = "Max_Temp_C"
+RAIN = "Total_Rain_mm"
+SOLAR = "Solar_Irradiance_kWh_per_m²_per_day"
+VARIABLES = [TEMP, TMAX, RAIN, SOLAR]
+
+
+def bin_daily(df):
+    """Bin the renamed daily frame."""
+    values = {v: df[v].to_numpy() for v in VARIABLES}
+    return BinnedStats.from_arrays(df["year"].to_numpy(), df["month"].to_numpy(), values)
+
+
+def _arg(values, years, fn):
+    i = fn(values)
+    return int(years[i]), float(values[i])
+
+
+def derive_aggregates(stats):
+    """Build every table and highlight the dashboard tabs read from ``stats``."""
+    aggregates = {}
+
+    yearly = stats.yearly_frame({TEMP: "mean", TMAX: "max", RAIN: "sum", SOLAR: "mean"})
+    aggregates["yearly_temp"] = yearly[["year", TEMP]]
+    aggregates["yearly_max_temp"] = yearly[["year", TMAX]]
+    aggregates["annual_rain"] = yearly[["year", RAIN]]
+
+    annual_solar = yearly[["year", SOLAR]].copy()
+    mu, sigma = annual_solar[SOLAR].mean(), annual_solar[SOLAR].std()
+    annual_solar["Clipped"] = annual_solar[SOLAR].clip(lower=mu - 2 * sigma, upper=mu + 2 * sigma)
+    annual_solar["Trend"] = rolling_mean(annual_solar["Clipped"].to_numpy(), 3)
+    aggregates["annual_solar"] = annual_solar
+
+    # Rolling trends for every selectable window, so the selectbox is a lookup
+    aggregates["temp_trends"] = TrendCache(yearly, [TEMP])
+    aggregates["max_temp_trend"] = rolling_mean(yearly[TMAX].to_numpy(), 3, center=False)
+
+    monthly = stats.year_month_frame({TEMP: "mean", RAIN: "sum", SOLAR: "mean"})
+    aggregates["monthly"] = monthly[["year", "month", TEMP, RAIN]]
+    monthly_solar = monthly[["year", "month", SOLAR]].copy()
+    # 3-year trend of each calendar month, down the (year, month) matrix
+    solar_by_month = np.where(stats.rows > 0, stats.by_year_month(SOLAR, "mean"), np.nan)
+    yi, mi = np.nonzero(stats.rows > 0)
+    monthly_solar["Trend"] = rolling_mean(solar_by_month, 3)[yi, mi]
+    aggregates["monthly_solar"] = monthly_solar
+
+    # Heatmaps
+    aggregates["heatmap_temp"] = stats.heatmap(TEMP, "mean")
+    aggregates["heatmap_rain"] = stats.heatmap(RAIN, "sum")
+
+    # Seasonal
+    seasonal_avg = stats.month_frame({TEMP: "mean", RAIN: "mean"})
+    seasonal_avg["month_name"] = [MONTH_ORDER[m - 1] for m in seasonal_avg["month"]]
+    aggregates["seasonal_avg"] = seasonal_avg
+
+    # Overview cards
+    aggregates["overview"] = {
+        "temp_mean": stats.total(TEMP, "mean"),
+        "temp_range": stats.total(TEMP, "max") - stats.total(TEMP, "min"),
+        "rain_total": stats.total(RAIN, "sum"),
+        "rain_range": stats.total(RAIN, "max") - stats.total(RAIN, "min"),
+        "solar_mean": stats.total(SOLAR, "mean"),
+        "solar_range": stats.total(SOLAR, "max") - stats.total(SOLAR, "min"),
+    }
+
+    # Highlights, each from a single per-year array
+    years = yearly["year"].to_numpy()
+    yearly_tmax_mean = stats.by_year(TMAX, "mean")[stats.rows.sum(axis=1) > 0]
+    aggregates["hottest_year"], aggregates["hottest_val"] = _arg(yearly_tmax_mean, years, np.nanargmax)
+    aggregates["coolest_year"], aggregates["coolest_val"] = _arg(yearly[TEMP].to_numpy(), years, np.nanargmin)
+    aggregates["wettest_year"], aggregates["wettest_val"] = _arg(yearly[RAIN].to_numpy(), years, np.nanargmax)
+    aggregates["driest_year"], aggregates["driest_val"] = _arg(yearly[RAIN].to_numpy(), years, np.nanargmin)
+    aggregates["solar_year"], aggregates["solar_val"] = _arg(yearly[SOLAR].to_numpy(), years, np.nanargmax)
+    aggregates["rainiest_month"] = MONTH_ORDER[int(np.argmax(stats.by_month(RAIN, "sum")))]
+
+    return aggregates
@@ -0,0 +1,161 @@
+# ===============================
+# 🔗 Mergeable Covariance Accumulators
+# ===============================
+"""Pairwise-complete covariance / correlation with mergeable moments.
+
+Each chunk of rows is reduced to per-pair counts, means, second moments and
+co-moments (shifted by the chunk mean for numerical stability); chunks are
+then combined with Chan et al.'s pairwise update, so results can be built
+incrementally, in parallel, or across processes and still match a single
+pass. As in ``DataFrame.corr``, every pair only uses rows where both
+variables are present.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class PairwiseMoments:
+    """Co-moments of ``variables``; entry ``[i, j]`` covers rows where i and j are both valid.
+
+    ``mean[i, j]`` and ``m2[i, j]`` describe variable ``i`` over those rows;
+    ``cxy`` is symmetric.
+    """
+
+    def __init__(self, variables, n=None, mean=None, m2=None, cxy=None):
+        self.variables = list(variables)
+        k = len(self.variables)
+        self.n = np.zeros((k, k)) if n is None else n
+        self.mean = np.zeros((k, k)) if mean is None else mean
+        self.m2 = np.zeros((k, k)) if m2 is None else m2
+        self.cxy = np.zeros((k, k)) if cxy is None else cxy
+
+    @classmethod
+    def from_array(cls, X, variables):
+        """Moments of one chunk; ``X`` is ``(rows, variables)`` with NaN for missing."""
+        X = np.asarray(X, dtype=np.float64)
+        valid = ~np.isnan(X)
+        W = valid.astype(np.float64)
+        counts = valid.sum(axis=0)
+        shift = np.where(valid, X, 0.0).sum(axis=0) / np.maximum(counts, 1)
+        Z = np.where(valid, X - shift, 0.0)
+
+        n = W.T @ W
+        s = Z.T @ W                       # s[i, j] = sum of z_i where i and j valid
+        q = (Z * Z).T @ W                 # q[i, j] = sum of z_i^2 where i and j valid
+        p = Z.T @ Z                       # p[i, j] = sum of z_i z_j where both valid
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean_z = np.where(n > 0, s / np.where(n > 0, n, 1), 0.0)
+        m2 = q - s * mean_z
+        cxy = p - s * mean_z.T
+        return cls(variables, n, mean_z + shift[:, None], m2, cxy)
+
+    @classmethod
+    def from_frame(cls, df, variables):
+        return cls.from_array(df[list(variables)].to_numpy(dtype=np.float64), variables)
+
+    def merge(self, other):
+        """Chan's parallel update; returns a new accumulator."""
+        if other.variables != self.variables:
+            raise ValueError("Cannot merge moments of different variables")
+        n = self.n + other.n
+        with np.errstate(invalid="ignore", divide="ignore"):
+            w = np.where(n > 0, other.n / np.where(n > 0, n, 1), 0.0)
+            nab = np.where(n > 0, self.n * other.n / np.where(n > 0, n, 1), 0.0)
+        delta = other.mean - self.mean
+        return PairwiseMoments(
+            self.variables,
+            n,
+            self.mean + delta * w,
+            self.m2 + other.m2 + delta * delta * nab,
+            self.cxy + other.cxy + delta * delta.T * nab,
+        )
+
+    def __add__(self, other):
+        return self.merge(other)
+
+    def subset(self, variables):
+        idx = np.ix_(*[[self.variables.index(v) for v in variables]] * 2)
+        return PairwiseMoments(variables, self.n[idx], self.mean[idx], self.m2[idx], self.cxy[idx])
+
+    def covariance(self, ddof=1):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            cov = np.where(self.n > ddof, self.cxy / (self.n - ddof), np.nan)
+        return pd.DataFrame(cov, index=self.variables, columns=self.variables)
+
+    def corr(self):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            r = self.cxy / np.sqrt(self.m2 * self.m2.T)
+        r = np.where(self.n > 1, np.clip(r, -1.0, 1.0), np.nan)
+        np.fill_diagonal(r, np.where(np.diag(self.n) > 1, 1.0, np.nan))
+        return pd.DataFrame(r, index=self.variables, columns=self.variables)
+
+
+# -------------------------------
+# Per-(year, season) moment cube
+# -------------------------------
+SEASONS = ["DJF", "MAM", "JJA", "SON"]
+SEASON_OF_MONTH = np.array([0, 0, 1, 1, 1, 2, 2, 2, 3, 3, 3, 0])  # Jan..Dec
+
+
+class MomentsCube:
+    """``PairwiseMoments`` for every (year, season) cell of a daily record.
+
+    Chunks can be added in any order and cubes built elsewhere merged in, so
+    one chunked pass yields the full, per-year, per-season and any
+    year-window correlation matrix without rescanning the rows.
+    """
+
+    def __init__(self, variables, cells=None):
+        self.variables = list(variables)
+        self.cells = {} if cells is None else cells
+
+    def add(self, year, month, X):
+        """Accumulate one chunk: ``X`` is ``(rows, variables)``."""
+        year = np.asarray(year, dtype=np.int64)
+        season = SEASON_OF_MONTH[np.asarray(month, dtype=np.int64) - 1]
+        codes = year * 4 + season
+        order = np.argsort(codes, kind="stable")
+        codes, X = codes[order], np.asarray(X, dtype=np.float64)[order]
+        starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+        for lo, hi in zip(starts, np.r_[starts[1:], len(codes)]):
+            key = (int(codes[lo] // 4), int(codes[lo] % 4))
+            part = PairwiseMoments.from_array(X[lo:hi], self.variables)
+            self.cells[key] = self.cells[key] + part if key in self.cells else part
+        return self
+
+    def add_frame(self, df, year="YEAR", month="MO"):
+        return self.add(df[year].to_numpy(), df[month].to_numpy(), df[self.variables].to_numpy(dtype=np.float64))
+
+    def merge(self, other):
+        if other.variables != self.variables:
+            raise ValueError("Cannot merge cubes of different variables")
+        cells = dict(self.cells)
+        for key, part in other.cells.items():
+            cells[key] = cells[key] + part if key in cells else part
+        return MomentsCube(self.variables, cells)
+
+    def __add__(self, other):
+        return self.merge(other)
+
+    @property
+    def years(self):
+        return sorted({year for year, _ in self.cells})
+
+    def select(self, years=None, seasons=None, variables=None):
+        """Merged moments for a year range ``(first, last)`` and season names."""
+        season_ids = None if seasons is None else {SEASONS.index(s) for s in seasons}
+        total = PairwiseMoments(self.variables)
+        for (year, season), part in self.cells.items():
+            if years is not None and not years[0] <= year <= years[1]:
+                continue
+            if season_ids is not None and season not in season_ids:
+                continue
+            total = total + part
+        return total if variables is None else total.subset(variables)
+
+    def by_year(self, variables=None):
+        return {y: self.select(years=(y, y), variables=variables) for y in self.years}
+
+    def by_season(self, variables=None):
+        return {s: self.select(seasons=[s], variables=variables) for s in SEASONS}
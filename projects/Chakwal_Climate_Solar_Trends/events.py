@@ -0,0 +1,144 @@
+# ===============================
+# ⚠ Extreme-Event Run Detection
+# ===============================
+"""Consecutive-day event runs found with vectorized run-length encoding.
+
+A rule marks each day as in or out of an event (e.g. rain below 1 mm);
+runs of marked days are located for the whole record at once from the
+change points of that mask, and a gap in the dates always ends a run. The
+start, end, length and peak value of each run come from index arithmetic and
+``ufunc.reduceat``, so detection is linear in the number of days with no
+Python loop over rows.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+RUN_COLUMNS = ["event", "start", "end", "length", "peak", "year"]
+
+
+@dataclass(frozen=True)
+class EventRule:
+    """Days where ``column`` is below (or at/above) ``threshold`` form an event."""
+
+    name: str
+    column: str
+    threshold: float
+    below: bool = True
+    min_length: int = 1
+    peak: str = "max"   # "max" or "min" of ``column`` within the run
+
+
+def find_runs(mask, dates=None, min_length=1):
+    """``(starts, ends)`` index arrays (``ends`` exclusive) of runs of ``True``.
+
+    When ``dates`` is given, a step other than one day also breaks a run.
+    """
+    mask = np.asarray(mask, dtype=bool)
+    n = len(mask)
+    if n == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+    breaks = np.zeros(n + 1, dtype=bool)
+    breaks[0] = breaks[n] = True
+    if dates is not None:
+        days = np.asarray(dates, dtype="datetime64[D]").astype(np.int64)
+        breaks[1:n] = np.diff(days) != 1
+
+    prev = np.r_[False, mask[:-1]]
+    nxt = np.r_[mask[1:], False]
+    starts = np.flatnonzero(mask & (~prev | breaks[:-1]))
+    ends = np.flatnonzero(mask & (~nxt | breaks[1:])) + 1
+
+    keep = (ends - starts) >= min_length
+    return starts[keep], ends[keep]
+
+
+def run_peaks(values, starts, ends, how="max"):
+    """Max or min of ``values`` over each ``[start, end)`` run, NaN-aware."""
+    if len(starts) == 0:
+        return np.empty(0)
+    values = np.asarray(values, dtype=np.float64)
+    ufunc = np.fmax if how == "max" else np.fmin
+    # interleave bounds and keep every other segment; the sentinel makes
+    # an end index equal to len(values) valid for reduceat
+    padded = np.r_[values, np.nan]
+    bounds = np.column_stack([starts, ends]).ravel()
+    return ufunc.reduceat(padded, bounds)[::2]
+
+
+def detect_events(df, rules, date_column="DATE"):
+    """One row per event run for every rule, ordered by start date."""
+    dates = df[date_column].to_numpy()
+    frames = []
+    for rule in rules:
+        values = df[rule.column].to_numpy(dtype=np.float64)
+        with np.errstate(invalid="ignore"):
+            mask = values < rule.threshold if rule.below else values >= rule.threshold
+        starts, ends = find_runs(mask, dates, rule.min_length)
+        start_dates = pd.DatetimeIndex(dates[starts])
+        frames.append(pd.DataFrame({
+            "event": rule.name,
+            "start": start_dates,
+            "end": pd.DatetimeIndex(dates[ends - 1]),
+            "length": ends - starts,
+            "peak": run_peaks(values, starts, ends, rule.peak),
+            "year": start_dates.year,
+        }))
+    if not frames:
+        return pd.DataFrame(columns=RUN_COLUMNS)
+    return pd.concat(frames, ignore_index=True).sort_values("start", kind="stable").reset_index(drop=True)
+
+
+def _open_run_start(events, rule, dates, values, n_old):
+    """Index where ``rule``'s run in progress on the old last day began (``n_old`` if none)."""
+    last = dates[n_old - 1]
+    open_run = events[(events["event"] == rule.name) & (events["end"] == last)]
+    if len(open_run):
+        return int(np.searchsorted(dates, open_run["start"].iloc[0].to_datetime64()))
+    # a run too short to be listed has fewer than min_length days
+    lo = max(n_old - rule.min_length + 1, 0)
+    with np.errstate(invalid="ignore"):
+        mask = values[lo:n_old] < rule.threshold if rule.below else values[lo:n_old] >= rule.threshold
+    starts, ends = find_runs(mask, dates[lo:n_old])
+    return lo + int(starts[-1]) if len(ends) and ends[-1] == n_old - lo else n_old
+
+
+def extend_events(events, df, n_old, rules, date_column="DATE"):
+    """``detect_events`` after rows were appended to the first ``n_old`` of ``df``.
+
+    Runs that closed before the old last day are final; each rule is
+    re-detected only from the start of its run still open on that day, so
+    the cost follows the new rows plus the open runs.
+    """
+    if n_old == 0:
+        return detect_events(df, rules, date_column)
+    dates = df[date_column].to_numpy()
+    frames = []
+    for rule in rules:
+        values = df[rule.column].to_numpy(dtype=np.float64)
+        start = _open_run_start(events, rule, dates, values, n_old)
+        if start < n_old:
+            events = events[~((events["event"] == rule.name) & (events["start"] >= dates[start]))]
+        frames.append(detect_events(df.iloc[start:], [rule], date_column))
+    frames = [f for f in [events, *frames] if len(f)]
+    if not frames:
+        return detect_events(df.iloc[:0], rules, date_column)
+    merged = pd.concat(frames, ignore_index=True)
+    rank = merged["event"].map({rule.name: i for i, rule in enumerate(rules)}).to_numpy()
+    return merged.iloc[np.lexsort((rank, merged["start"].to_numpy()))].reset_index(drop=True)
+
+
+def longest_runs(events):
+    """Longest run of each event type (ties: the earliest)."""
+    if events.empty:
+        return events
+    idx = events.sort_values(["length", "start"], ascending=[False, True]).groupby("event", sort=False).head(1).index
+    return events.loc[idx].set_index("event")
+
+
+def longest_by_year(events):
+    """Year x event table of the longest run length starting in that year."""
+    return events.pivot_table(index="year", columns="event", values="length", aggfunc="max", fill_value=0)
@@ -0,0 +1,113 @@
+# ===============================
+# 🖼 Figure Cache & Downsampling
+# ===============================
+"""Server-side cache of serialized plotly figures plus LTTB downsampling.
+
+Figures are stored as plotly JSON keyed on (tab, figure, widget values,
+dataset version), so a rerun that does not change any of those skips the
+``px``/``go`` construction entirely. The cache is shared by every session and
+bounded by entry count and total bytes. Daily-resolution series are reduced
+with Largest-Triangle-Three-Buckets before they reach a figure, so browsers
+receive a few thousand points that keep the visual shape of the record.
+"""
+
+import json
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from instrumentation import timed
+
+MAX_POINTS = 2000
+
+
+def lttb(x, y, n_out=MAX_POINTS):
+    """Downsample ``(x, y)`` to ``n_out`` points with Largest-Triangle-Three-Buckets.
+
+    ``x`` may be numeric or datetime64; NaN points in ``y`` are dropped first.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=np.float64)
+    keep = ~np.isnan(y)
+    x, y = x[keep], y[keep]
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return x, y
+
+    xf = x.astype("datetime64[ns]").astype(np.int64) if np.issubdtype(x.dtype, np.datetime64) else x
+    xf = xf.astype(np.float64)
+
+    # n_out - 2 buckets between the fixed first and last points
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    cx = np.concatenate([[0.0], np.cumsum(xf)])
+    cy = np.concatenate([[0.0], np.cumsum(y)])
+    lo, hi = edges[:-1], edges[1:]
+    mean_x = (cx[hi] - cx[lo]) / np.maximum(hi - lo, 1)
+    mean_y = (cy[hi] - cy[lo]) / np.maximum(hi - lo, 1)
+    # the "next bucket" of the last bucket is the last point
+    next_x = np.append(mean_x[1:], xf[-1])
+    next_y = np.append(mean_y[1:], y[-1])
+
+    idx = np.empty(n_out, dtype=np.int64)
+    idx[0], idx[-1] = 0, n - 1
+    a = 0
+    for b in range(n_out - 2):
+        s, e = lo[b], max(hi[b], lo[b] + 1)
+        area = np.abs(
+            (xf[a] - next_x[b]) * (y[s:e] - y[a])
+            - (xf[a] - xf[s:e]) * (next_y[b] - y[a])
+        )
+        a = s + int(np.argmax(area))
+        idx[b + 1] = a
+    return x[idx], y[idx]
+
+
+def figure_key(tab, name, widget_values, dataset_version):
+    """Cache key of one figure: a new dataset version never reuses an old figure."""
+    return (tab, name, tuple(widget_values), dataset_version)
+
+
+class FigureCache:
+    """Thread-safe LRU of serialized figures, bounded by entries and bytes."""
+
+    def __init__(self, max_entries=512, max_bytes=128 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_build(self, key, builder):
+        """Plotly figure dict for ``key``; ``builder()`` runs only on a miss."""
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return json.loads(payload)
+            self.misses += 1
+
+        with timed("figure_build"):
+            fig = builder()
+        with timed("figure_serialize"):
+            payload = fig.to_json()
+
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = payload
+                self._bytes += len(payload)
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+        return json.loads(payload)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,86 @@
+# ===============================
+# 🧱 Growable Column Buffers
+# ===============================
+"""Columns kept in over-allocated arrays so appended days cost O(new rows).
+
+``pd.concat`` copies the whole record on every append. Here each column lives
+in a NumPy array with spare capacity that grows geometrically; new rows are
+written into the spare tail and the frame handed out is a zero-copy view of
+the used rows. Rows already handed out are never rewritten, so earlier views
+stay valid after later appends. Categorical columns keep their codes in the
+buffer and their categories alongside.
+"""
+
+import numpy as np
+import pandas as pd
+
+GROWTH = 1.25
+
+
+class ColumnBuffer:
+    """One 1-D array with spare capacity; ``append`` fills it in place."""
+
+    def __init__(self, values, growth=GROWTH):
+        # adopted without a copy: the first append moves it into a larger buffer
+        self._data = np.asarray(values)
+        self._used = len(self._data)
+        self.growth = growth
+
+    def __len__(self):
+        return self._used
+
+    @property
+    def values(self):
+        return self._data[:self._used]
+
+    def append(self, values):
+        """Write ``values`` after the used rows and return the grown view."""
+        values = np.asarray(values, dtype=self._data.dtype)
+        used = self._used + len(values)
+        if used > len(self._data):
+            grown = np.empty(max(used, int(len(self._data) * self.growth)), dtype=self._data.dtype)
+            grown[:self._used] = self._data[:self._used]
+            self._data = grown
+        self._data[self._used:used] = values
+        self._used = used
+        return self.values
+
+
+class FrameBuffer:
+    """The columns of a frame as ``ColumnBuffer``s, appended to in place."""
+
+    def __init__(self, df, growth=GROWTH):
+        self.columns = list(df.columns)
+        self.categories = {}
+        self._buffers = {}
+        for name in self.columns:
+            column = df[name]
+            if isinstance(column.dtype, pd.CategoricalDtype):
+                self.categories[name] = column.cat.categories
+                column = column.cat.codes
+            self._buffers[name] = ColumnBuffer(column.to_numpy(), growth)
+
+    def __len__(self):
+        return len(self._buffers[self.columns[0]]) if self.columns else 0
+
+    @property
+    def frame(self):
+        """The used rows as a frame of views (no copy)."""
+        data = {}
+        for name in self.columns:
+            values = self._buffers[name].values
+            if name in self.categories:
+                values = pd.Categorical.from_codes(values, categories=self.categories[name], validate=False)
+            data[name] = values
+        return pd.DataFrame(data, copy=False)
+
+    def append(self, df):
+        """Append the rows of ``df`` (same columns and categories) and return the grown frame."""
+        for name in self.columns:
+            column = df[name]
+            if name in self.categories:
+                if not column.cat.categories.equals(self.categories[name]):
+                    raise ValueError(f"Categories of {name!r} differ from the buffered ones")
+                column = column.cat.codes
+            self._buffers[name].append(column.to_numpy())
+        return self.frame
@@ -0,0 +1,322 @@
+# ===============================
+# ⏱ Hot-Path Instrumentation
+# ===============================
+"""Stage timers, counters and Prometheus-format metrics for the dashboard.
+
+``timed("stage")`` works as a context manager or decorator and records the
+duration into one histogram labelled by stage (CSV parse, aggregation,
+figure build, serialization, ...); ``count`` increments labelled counters
+such as rows processed. Objects that already keep their own counters (e.g.
+cache hits) are exported through collectors at scrape time, so the hot path
+does no extra work for them. ``render`` produces the Prometheus text
+exposition format without a client library.
+
+Opt-in profiling: with ``PROFILE_DIR`` set, requests are profiled (one at a
+time) and the first ``PROFILE_LIMIT`` slower than ``PROFILE_MIN_MS`` are
+written there, as pyinstrument HTML when it is installed, otherwise as
+cProfile ``.prof`` files for snakeviz/flameprof.
+"""
+
+import cProfile
+import functools
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _label_text(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels) + "}"
+
+
+class Metrics:
+    """Thread-safe registry of counters and histograms with optional collectors."""
+
+    def __init__(self, prefix="", buckets=DEFAULT_BUCKETS):
+        self.prefix = prefix
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._help = {}
+        self._counters = {}
+        self._histograms = {}
+        self._collectors = []
+
+    def _name(self, name):
+        return self.prefix + name
+
+    def inc(self, name, value=1.0, help="", **labels):
+        key = (self._name(name), tuple(sorted(labels.items())))
+        with self._lock:
+            self._help.setdefault(key[0], ("counter", help))
+            self._counters[key] = self._counters.get(key, 0.0) + value
+
+    def observe(self, name, value, help="", **labels):
+        key = (self._name(name), tuple(sorted(labels.items())))
+        with self._lock:
+            self._help.setdefault(key[0], ("histogram", help))
+            hist = self._histograms.get(key)
+            if hist is None:
+                hist = self._histograms[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    hist[0][i] += 1
+            hist[1] += value
+            hist[2] += 1
+
+    def collector(self, fn):
+        """Register ``fn() -> [(name, kind, help, labels_dict, value), ...]`` read at scrape time."""
+        with self._lock:
+            self._collectors.append(fn)
+        return fn
+
+    def snapshot(self):
+        """``{name: [(labels_dict, count, sum), ...]}`` of every histogram, e.g. for benchmarks."""
+        with self._lock:
+            result = {}
+            for (name, labels), (_, total, n) in self._histograms.items():
+                result.setdefault(name, []).append((dict(labels), n, total))
+            return result
+
+    def render(self):
+        """Prometheus text exposition of every metric."""
+        lines = []
+        with self._lock:
+            families = {}
+            for (name, labels), value in self._counters.items():
+                families.setdefault(name, []).append((name, labels, value))
+            for (name, labels), (counts, total, n) in self._histograms.items():
+                rows = families.setdefault(name, [])
+                for bound, c in zip(self.buckets, counts):
+                    rows.append((f"{name}_bucket", labels + (("le", repr(bound)),), c))
+                rows.append((f"{name}_bucket", labels + (("le", "+Inf"),), n))
+                rows.append((f"{name}_sum", labels, total))
+                rows.append((f"{name}_count", labels, n))
+            helps = dict(self._help)
+            collectors = list(self._collectors)
+
+        for fn in collectors:
+            for name, kind, help_text, labels, value in fn():
+                name = self._name(name)
+                helps.setdefault(name, (kind, help_text))
+                families.setdefault(name, []).append((name, tuple(sorted(labels.items())), value))
+
+        for name in sorted(families):
+            kind, help_text = helps.get(name, ("untyped", ""))
+            if help_text:
+                lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for sample, labels, value in families[name]:
+                lines.append(f"{sample}{_label_text(labels)} {float(value)!r}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics(prefix=re.sub(r"\W", "_", os.environ.get("METRICS_PREFIX", "dashboard_")))
+
+
+class timed:
+    """Record the duration of a stage: ``with timed("csv_parse"):``, ``@timed("load_data")``
+    or explicit ``start()``/``stop()`` around code that cannot be indented into a block.
+    """
+
+    def __init__(self, stage, registry=None, **labels):
+        self.stage = stage
+        self.registry = registry or metrics
+        self.labels = labels
+
+    def start(self):
+        self._start = time.perf_counter()
+        return self
+
+    def stop(self):
+        self.elapsed = time.perf_counter() - self._start
+        self.registry.observe("stage_duration_seconds", self.elapsed,
+                              help="Wall time of instrumented stages", stage=self.stage, **self.labels)
+        return self.elapsed
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+    def __call__(self, func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with timed(self.stage, self.registry, **self.labels):
+                return func(*args, **kwargs)
+        return wrapper
+
+
+def count(name, value=1, **labels):
+    """Increment a labelled counter, e.g. ``count("rows_processed_total", len(df), stage="load")``."""
+    metrics.inc(name, value, **labels)
+
+
+# -------------------------------
+# Opt-in request profiling
+# -------------------------------
+class RequestProfiler:
+    """Profile one request at a time and dump the slow ones to ``directory``."""
+
+    def __init__(self, directory=None, min_ms=0.0, limit=1):
+        self.directory = directory
+        self.min_ms = min_ms
+        self.limit = limit
+        self.dumped = 0
+        self._busy = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        return cls(os.environ.get("PROFILE_DIR"), float(os.environ.get("PROFILE_MIN_MS", "0")),
+                   int(os.environ.get("PROFILE_LIMIT", "1")))
+
+    @property
+    def enabled(self):
+        return bool(self.directory) and self.dumped < self.limit
+
+    def start(self, name):
+        """Begin profiling ``name``; returns an idempotent ``stop(discard=False)``.
+
+        ``stop`` is a no-op when not profiling; ``discard=True`` releases the
+        profiler without writing the profile (e.g. for an abandoned run).
+        """
+        # only one profiler can be active per interpreter; others run unprofiled
+        if not self.enabled or not self._busy.acquire(blocking=False):
+            return lambda discard=False: None
+        profiler = _start_profiler()
+        started = time.perf_counter()
+        stopped = []
+
+        def stop(discard=False):
+            if stopped:
+                return
+            stopped.append(True)
+            try:
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                if not discard and elapsed_ms >= self.min_ms and self.dumped < self.limit:
+                    self.dumped += 1
+                    _dump_profile(profiler, self.directory, name, elapsed_ms)
+                else:
+                    _stop_profiler(profiler)
+            finally:
+                self._busy.release()
+        return stop
+
+    @contextmanager
+    def profile(self, name):
+        stop = self.start(name)
+        try:
+            yield
+        finally:
+            stop()
+
+
+def _start_profiler():
+    try:
+        from pyinstrument import Profiler
+    except ImportError:
+        profiler = cProfile.Profile()
+        profiler.enable()
+        return profiler
+    profiler = Profiler(async_mode="disabled")
+    profiler.start()
+    return profiler
+
+
+def _stop_profiler(profiler):
+    if isinstance(profiler, cProfile.Profile):
+        profiler.disable()
+    else:
+        profiler.stop()
+
+
+def _dump_profile(profiler, directory, name, elapsed_ms):
+    _stop_profiler(profiler)
+    os.makedirs(directory, exist_ok=True)
+    stem = os.path.join(directory, f"{time.strftime('%Y%m%d-%H%M%S')}-{re.sub(r'[^A-Za-z0-9_.-]+', '_', name)}-{elapsed_ms:.0f}ms")
+    if isinstance(profiler, cProfile.Profile):
+        profiler.dump_stats(stem + ".prof")
+    else:
+        with open(stem + ".html", "w", encoding="utf-8") as f:
+            f.write(profiler.output_html())
+
+
+# -------------------------------
+# HTTP integration
+# -------------------------------
+class _ClosingBody:
+    """WSGI response iterable that runs ``on_close`` after the server closes it."""
+
+    def __init__(self, body, on_close):
+        self._body = body
+        self._on_close = on_close
+
+    def __iter__(self):
+        return iter(self._body)
+
+    def close(self):
+        try:
+            if hasattr(self._body, "close"):
+                self._body.close()
+        finally:
+            self._on_close()
+
+
+def instrument_wsgi(wsgi_app, profiler=None, registry=None):
+    """Wrap a WSGI app so every request is timed (by first path segment) and optionally profiled.
+
+    The body is streamed through unbuffered; timing and profiling end when the
+    server closes the response, so streamed bodies are covered too.
+    """
+    def app(environ, start_response):
+        path = "/" + environ.get("PATH_INFO", "/").lstrip("/").split("/", 1)[0]
+        stop_profile = profiler.start(path) if profiler else lambda: None
+        timer = timed("request", registry, path=path).start()
+
+        def finish():
+            timer.stop()
+            stop_profile()
+
+        try:
+            body = wsgi_app(environ, start_response)
+        except BaseException:
+            finish()
+            raise
+        return _ClosingBody(body, finish)
+    return app
+
+
+def serve_metrics(port, host="127.0.0.1", registry=None):
+    """Serve ``/metrics`` from a daemon thread (localhost unless ``host`` is given); returns the server."""
+    registry = registry or metrics
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, name="metrics-endpoint", daemon=True).start()
+    return server
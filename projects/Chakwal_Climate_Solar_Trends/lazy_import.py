@@ -0,0 +1,35 @@
+# ===============================
+# 💤 Deferred Module Imports
+# ===============================
+"""Import heavy modules on first use instead of at startup.
+
+``px = lazy_import("plotly.express")`` binds a name right away but imports
+the module only when an attribute is first read (e.g. by the first figure),
+so a process starts serving before paying for the import. The import itself
+goes through ``importlib``, which is thread-safe.
+"""
+
+import importlib
+import sys
+
+
+class LazyModule:
+    """Stand-in for a module that is imported on first attribute access."""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+    def __repr__(self):
+        state = "imported" if self._module is not None else "not imported yet"
+        return f"<lazy module {self._name!r} ({state})>"
+
+
+def lazy_import(name):
+    """Module ``name`` if it is already imported, otherwise a ``LazyModule`` for it."""
+    return sys.modules.get(name) or LazyModule(name)
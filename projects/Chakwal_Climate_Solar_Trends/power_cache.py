@@ -0,0 +1,282 @@
+# ===============================
+# ⚡ POWER Columnar Ingest Cache
+# ===============================
+"""Convert a NASA POWER point CSV into a typed Arrow IPC (Feather v2) cache.
+
+The CSV is streamed through :mod:`power_reader` (fill values masked to NaN)
+and written batch by batch, uncompressed, so it can be memory-mapped on load.
+The cache is keyed on the source CSV's size and mtime: replacing the CSV
+triggers a single re-ingest, every other cold start just maps the columns it needs.
+
+Newly published days can be appended without a re-ingest: ``append_days``
+writes them as a small Arrow segment next to the base file and lists it in a
+manifest. The source CSV is never modified; the manifest records the
+fingerprint of the CSV its segments extend, so replacing the CSV still
+triggers a clean re-ingest (which drops the segments).
+"""
+
+import glob
+import json
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from instrumentation import count, timed
+from power_reader import DEFAULT_CHUNKSIZE, iter_power_chunks, read_header
+
+CACHE_VERSION = 2
+CACHE_DIRNAME = ".power_cache"
+METADATA_KEY = b"power_source"
+
+
+def source_key(csv_path):
+    """Fingerprint of the source CSV that the cache must match."""
+    st = os.stat(csv_path)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "version": CACHE_VERSION}
+
+
+def cache_path_for(csv_path, cache_dir=None):
+    """Location of the columnar cache for ``csv_path``."""
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(os.path.abspath(csv_path)), CACHE_DIRNAME)
+    name = os.path.splitext(os.path.basename(csv_path))[0] + ".arrow"
+    return os.path.join(cache_dir, name)
+
+
+def _with_dates(chunk):
+    if "MO" in chunk and "DY" in chunk:
+        parts = dict(year=chunk["YEAR"], month=chunk["MO"], day=chunk["DY"])
+        if "HR" in chunk:
+            parts["hour"] = chunk["HR"]
+        chunk["DATE"] = pd.to_datetime(parts, errors="coerce")
+    elif "DOY" in chunk:
+        chunk["DATE"] = pd.to_datetime(chunk["YEAR"].astype(str), format="%Y") + pd.to_timedelta(chunk["DOY"] - 1, unit="D")
+    else:
+        raise ValueError("POWER file has neither MO/DY nor DOY date columns!")
+    return chunk
+
+
+@timed("csv_ingest")
+def ingest(csv_path, cache_path=None, chunksize=DEFAULT_CHUNKSIZE):
+    """Stream ``csv_path`` once into its typed columnar cache."""
+    cache_path = cache_path or cache_path_for(csv_path)
+    key = source_key(csv_path)
+    header = read_header(csv_path)
+    if "YEAR" not in header.columns:
+        raise ValueError("Column 'YEAR' is missing from the dataset!")
+
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    writer = None
+    try:
+        for chunk in iter_power_chunks(csv_path, chunksize=chunksize, header=header):
+            batch = pa.RecordBatch.from_pandas(_with_dates(chunk), preserve_index=False)
+            count("rows_processed_total", batch.num_rows, stage="csv_ingest")
+            if writer is None:
+                metadata = {**(batch.schema.metadata or {}), METADATA_KEY: json.dumps(key).encode()}
+                schema = batch.schema.with_metadata(metadata)
+                writer = pa.ipc.new_file(tmp_path, schema)
+            writer.write_batch(batch)
+    finally:
+        if writer is not None:
+            writer.close()
+    if writer is None:
+        raise ValueError(f"{csv_path} has no data rows")
+    os.replace(tmp_path, cache_path)
+
+    # a fresh base file supersedes any previously appended segments
+    for stale in [manifest_path_for(cache_path), *glob.glob(_segment_pattern(cache_path))]:
+        if os.path.exists(stale):
+            os.remove(stale)
+    return cache_path
+
+
+# -------------------------------
+# Appended segments
+# -------------------------------
+def manifest_path_for(cache_path):
+    return os.path.splitext(cache_path)[0] + ".manifest.json"
+
+
+def _segment_pattern(cache_path):
+    return os.path.splitext(cache_path)[0] + ".seg*.arrow"
+
+
+def read_manifest(cache_path):
+    try:
+        with open(manifest_path_for(cache_path), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_manifest(cache_path, manifest):
+    path = manifest_path_for(cache_path)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, path)
+
+
+def appended_through(csv_path, cache_dir=None):
+    """Last date appended to ``csv_path``'s cache (ISO string), or ``None``."""
+    manifest = read_manifest(cache_path_for(csv_path, cache_dir))
+    if not manifest or manifest["key"] != source_key(csv_path):
+        return None
+    return manifest["end"]
+
+
+def cache_files(cache_path):
+    """Base file followed by its appended segments, oldest first."""
+    manifest = read_manifest(cache_path) or {}
+    cache_dir = os.path.dirname(cache_path)
+    return [cache_path] + [os.path.join(cache_dir, seg["file"]) for seg in manifest.get("segments", [])]
+
+
+def cached_key(cache_path):
+    """Source fingerprint stored in an existing cache, or ``None``."""
+    if not os.path.exists(cache_path):
+        return None
+    manifest = read_manifest(cache_path)
+    if manifest:
+        return manifest["key"]
+    try:
+        metadata = _schema(cache_path).metadata or {}
+    except (OSError, pa.ArrowInvalid):
+        return None
+    raw = metadata.get(METADATA_KEY)
+    return json.loads(raw) if raw else None
+
+
+def _ensure_cache(csv_path, cache_dir):
+    """Cache path for ``csv_path``; ``True`` as second item if it was re-ingested."""
+    cache_path = cache_path_for(csv_path, cache_dir)
+    if cached_key(cache_path) != source_key(csv_path):
+        ingest(csv_path, cache_path)
+        return cache_path, True
+    return cache_path, False
+
+
+def _schema(cache_path):
+    with pa.memory_map(cache_path) as source:
+        return pa.ipc.open_file(source).schema
+
+
+def _empty(cache_path, columns=None):
+    schema = _schema(cache_path)
+    names = schema.names if columns is None else columns
+    return schema.empty_table().select(names).to_pandas()
+
+
+def _read_files(paths, columns):
+    tables = [feather.read_table(p, columns=columns, memory_map=True) for p in paths]
+    return pa.concat_tables(tables).to_pandas(split_blocks=True)
+
+
+@timed("cache_load")
+def load_power_table(csv_path, columns=None, cache_dir=None):
+    """Memory-map the cached POWER table, re-ingesting only if the CSV changed."""
+    cache_path, _ = _ensure_cache(csv_path, cache_dir)
+    return _read_files(cache_files(cache_path), columns)
+
+
+def iter_cached_batches(csv_path, columns=None, cache_dir=None):
+    """Stream the cached table (base plus segments) one record batch at a time."""
+    cache_path, _ = _ensure_cache(csv_path, cache_dir)
+    for path in cache_files(cache_path):
+        with pa.memory_map(path) as source:
+            reader = pa.ipc.open_file(source)
+            for i in range(reader.num_record_batches):
+                batch = reader.get_batch(i)
+                if columns is not None:
+                    batch = batch.select(columns)
+                yield batch.to_pandas()
+
+
+def load_power_tail(csv_path, since, columns=None, cache_dir=None):
+    """Rows appended after ``since``, or ``None`` if the CSV was replaced outright.
+
+    Only the segments written after ``since`` are read, so the cost follows
+    the number of new days rather than the length of the record.
+    """
+    cache_path, reingested = _ensure_cache(csv_path, cache_dir)
+    if reingested:
+        return None
+    since = pd.Timestamp(since)
+    manifest = read_manifest(cache_path) or {}
+    cache_dir = os.path.dirname(cache_path)
+    paths = [os.path.join(cache_dir, seg["file"]) for seg in manifest.get("segments", [])
+             if pd.Timestamp(seg["end"]) > since]
+    if not paths:
+        return _empty(cache_path, columns)
+    if columns is not None and "DATE" not in columns:
+        columns = ["DATE", *columns]
+    tail = _read_files(paths, columns)
+    return tail[tail["DATE"] > since].reset_index(drop=True)
+
+
+def _last_date(cache_path):
+    manifest = read_manifest(cache_path)
+    if manifest:
+        return pd.Timestamp(manifest["end"])
+    dates = feather.read_table(cache_path, columns=["DATE"], memory_map=True)["DATE"]
+    return pd.Timestamp(dates[len(dates) - 1].as_py())
+
+
+def append_days(csv_path, new_days_path, cache_dir=None):
+    """Append the days of ``new_days_path`` that are newer than the cache.
+
+    ``new_days_path`` is a POWER export covering the newly published days
+    (overlap with the existing record is ignored). ``csv_path`` is only read.
+    Returns the typed rows that were appended.
+    """
+    cache_path, _ = _ensure_cache(csv_path, cache_dir)
+    header = read_header(csv_path)
+    new_header = read_header(new_days_path)
+    missing = [c for c in header.columns if c not in new_header.columns]
+    if missing:
+        raise ValueError(f"{new_days_path} lacks columns {missing} present in {csv_path}")
+
+    chunks = list(iter_power_chunks(new_days_path, columns=header.measure_columns, header=new_header))
+    end = _last_date(cache_path)
+    rows = _with_dates(pd.concat(chunks, ignore_index=True)) if chunks else None
+    if rows is None or not (rows["DATE"] > end).any():
+        return _empty(cache_path)
+    rows = rows[rows["DATE"] > end].sort_values("DATE").reset_index(drop=True)
+    new_end = rows["DATE"].iloc[-1]
+
+    base_schema = _schema(cache_path)
+    manifest = read_manifest(cache_path) or {"segments": [], "key": cached_key(cache_path)}
+    segment = f"{os.path.splitext(os.path.basename(cache_path))[0]}.seg{len(manifest['segments']) + 1:04d}.arrow"
+    segment_path = os.path.join(os.path.dirname(cache_path), segment)
+    table = pa.Table.from_pandas(rows[base_schema.names], schema=base_schema.remove_metadata(), preserve_index=False)
+    tmp_path = f"{segment_path}.{os.getpid()}.tmp"
+    feather.write_feather(table, tmp_path, compression="uncompressed")
+    os.replace(tmp_path, segment_path)
+
+    # the segment only becomes part of the cache once the manifest lists it
+    manifest["segments"].append({"file": segment, "end": new_end.isoformat(), "rows": len(rows)})
+    manifest["end"] = new_end.isoformat()
+    _write_manifest(cache_path, manifest)
+    return rows
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Maintain the POWER columnar cache.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("ingest", help="(re)build the cache of a POWER CSV").add_argument("csv")
+    append = sub.add_parser("append", help="append newly published days to a POWER CSV's cache")
+    append.add_argument("csv")
+    append.add_argument("new_days")
+    parser.add_argument("--cache-dir", default=None)
+    args = parser.parse_args()
+
+    if args.command == "ingest":
+        print(ingest(args.csv, cache_path_for(args.csv, args.cache_dir)))
+    else:
+        added = append_days(args.csv, args.new_days, args.cache_dir)
+        print(f"appended {len(added)} day(s)")
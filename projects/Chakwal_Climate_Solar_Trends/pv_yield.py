@@ -0,0 +1,250 @@
+# ===============================
+# 🔆 Batched PV Yield Simulator
+# ===============================
+"""Daily PV energy yield for a whole grid of system configurations at once.
+
+Each day's horizontal irradiation is split into beam and diffuse parts (the
+POWER diffuse series, or the Erbs daily correlation where it is missing) and
+transposed onto an equator-facing plane with the Liu–Jordan daily model.
+Module temperature follows Faiman from the daily mean air temperature, wind
+speed and mean daytime plane-of-array irradiance, and derates the output by
+the module's temperature coefficient:
+
+    E = capacity · H_poa / 1 kW/m² · (1 + γ · (T_cell − 25 °C)) · (1 − losses)
+
+Only the tilt changes the irradiance and cell temperature, so those are one
+``(tilts, days)`` broadcast over the record. ``E`` is linear in ``γ`` and
+scales with ``capacity · (1 − losses)``, so the monthly sums of ``H_poa`` and
+``H_poa · (T_cell − 25)`` per tilt yield every configuration's tables in a
+single ``(configs, months)`` broadcast. The same is done for the clear-sky
+series to give clear-sky ratios.
+"""
+
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from frame_buffer import ColumnBuffer
+
+PV_PARAMETERS = ["ALLSKY_SFC_SW_DWN", "CLRSKY_SFC_SW_DWN", "ALLSKY_SFC_SW_DIFF", "T2M", "WS10M"]
+CONFIG_COLUMNS = ["tilt", "capacity_kw", "losses", "temp_coeff"]
+SOLAR_CONSTANT = 1.367            # kW/m²
+ALBEDO = 0.2
+FAIMAN_U0, FAIMAN_U1 = 25.0, 6.84  # W/m²K, W·s/m³K
+STC_TEMP = 25.0
+DAY_FIELDS = ("dates", "months", "ghi", "diffuse", "clear_ghi", "clear_diffuse", "air_temp", "wind",
+              "decl", "sunset", "valid")
+
+
+def system_grid(tilts, capacities=(1.0,), losses=(0.14,), temp_coeffs=(-0.004,)):
+    """Every combination of tilt (°), capacity (kWp), loss fraction and γ (1/°C)."""
+    return pd.DataFrame(list(itertools.product(tilts, capacities, losses, temp_coeffs)),
+                        columns=CONFIG_COLUMNS, dtype=np.float64).rename_axis("config")
+
+
+def sun_geometry(day_of_year, latitude):
+    """Declination, sunset hour angle (radians) and extraterrestrial kWh/m²/day."""
+    phi = np.radians(latitude)
+    decl = np.radians(23.45) * np.sin(2 * np.pi * (284 + day_of_year) / 365)
+    sunset = np.arccos(np.clip(-np.tan(phi) * np.tan(decl), -1, 1))
+    eccentricity = 1 + 0.033 * np.cos(2 * np.pi * day_of_year / 365)
+    h0 = 24 / np.pi * SOLAR_CONSTANT * eccentricity * (
+        np.cos(phi) * np.cos(decl) * np.sin(sunset) + sunset * np.sin(phi) * np.sin(decl))
+    return decl, sunset, h0
+
+
+def diffuse_fraction(kt, sunset):
+    """Erbs et al. (1982) daily diffuse fraction from the clearness index."""
+    kt = np.clip(kt, 0, 1)
+    summer = sunset > np.radians(81.4)
+    low = np.where(summer,
+                   1 + 0.2832 * kt - 2.5557 * kt ** 2 + 0.8448 * kt ** 3,
+                   1 - 0.2727 * kt + 2.4495 * kt ** 2 - 11.9514 * kt ** 3 + 9.3879 * kt ** 4)
+    return np.where(kt < np.where(summer, 0.722, 0.715), low, np.where(summer, 0.175, 0.143))
+
+
+def beam_factor(latitude, decl, sunset, tilts):
+    """Daily tilted/horizontal beam ratio ``R_b``, shape ``(tilts, days)``."""
+    phi = np.radians(latitude)
+    # an equator-facing plane sees the sun as a horizontal one at latitude φ ∓ β
+    phi_t = phi - np.copysign(np.radians(np.asarray(tilts, dtype=np.float64))[:, None], phi or 1.0)
+    sunset_t = np.minimum(sunset, np.arccos(np.clip(-np.tan(phi_t) * np.tan(decl), -1, 1)))
+    tilted = np.cos(phi_t) * np.cos(decl) * np.sin(sunset_t) + sunset_t * np.sin(phi_t) * np.sin(decl)
+    horizontal = np.cos(phi) * np.cos(decl) * np.sin(sunset) + sunset * np.sin(phi) * np.sin(decl)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(horizontal > 0, np.maximum(tilted, 0) / horizontal, 0.0)
+
+
+class PVWeather:
+    """Daily irradiance split, temperature and wind of one station, with its geometry."""
+
+    def __init__(self, dates, months, ghi, diffuse, clear_ghi, clear_diffuse, air_temp, wind,
+                 decl, sunset, latitude, albedo=ALBEDO):
+        self.dates = dates
+        self.months = months              # year * 12 + month - 1 per day, ascending
+        self.ghi, self.diffuse = ghi, diffuse
+        self.clear_ghi, self.clear_diffuse = clear_ghi, clear_diffuse
+        self.air_temp, self.wind = air_temp, wind
+        self.decl, self.sunset = decl, sunset
+        self.latitude = latitude
+        self.albedo = albedo
+        # days missing any input count towards neither sums nor coverage
+        self.valid = ~np.isnan(ghi + clear_ghi + air_temp + wind)
+        starts = np.flatnonzero(np.r_[True, np.diff(months) != 0])
+        self._month_starts = starts
+        self.month_codes = months[starts]
+        self.coverage = np.add.reduceat(self.valid.astype(np.float64), starts)
+        self._buffers = None
+
+    @classmethod
+    def from_frame(cls, df, latitude, albedo=ALBEDO):
+        dates = df["DATE"].to_numpy("datetime64[D]")
+        months = (df["YEAR"].to_numpy(np.int64) * 12 + df["MO"].to_numpy(np.int64) - 1)
+        doy = (dates - dates.astype("datetime64[Y]")).astype(np.int64) + 1
+        decl, sunset, h0 = sun_geometry(doy, latitude)
+
+        ghi = df["ALLSKY_SFC_SW_DWN"].to_numpy(np.float64)
+        clear = df["CLRSKY_SFC_SW_DWN"].to_numpy(np.float64)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            kt, kt_clear = ghi / h0, clear / h0
+        diffuse = df["ALLSKY_SFC_SW_DIFF"].to_numpy(np.float64)
+        diffuse = np.where(np.isnan(diffuse), diffuse_fraction(kt, sunset) * ghi, diffuse)
+        return cls(dates, months,
+                   ghi, np.clip(diffuse, 0, ghi),
+                   clear, diffuse_fraction(kt_clear, sunset) * clear,
+                   df["T2M"].to_numpy(np.float64), df["WS10M"].to_numpy(np.float64),
+                   decl, sunset, latitude, albedo)
+
+    def extend(self, df):
+        """Append the days of ``df`` in place; only the new days are split and transposed."""
+        if df.empty:
+            return self
+        new = PVWeather.from_frame(df, self.latitude, self.albedo)
+        offset = len(self.dates)
+        if self._buffers is None:
+            self._buffers = {name: ColumnBuffer(getattr(self, name)) for name in DAY_FIELDS}
+        for name in DAY_FIELDS:
+            setattr(self, name, self._buffers[name].append(getattr(new, name)))
+
+        # the first new month may continue the old last one
+        starts, codes, coverage = new._month_starts + offset, new.month_codes, new.coverage
+        if codes[0] == self.month_codes[-1]:
+            coverage = np.r_[self.coverage[-1] + coverage[0], coverage[1:]]
+            self.coverage = self.coverage[:-1]
+            starts, codes = starts[1:], codes[1:]
+        self._month_starts = np.r_[self._month_starts, starts]
+        self.month_codes = np.r_[self.month_codes, codes]
+        self.coverage = np.r_[self.coverage, coverage]
+        return self
+
+    def transposition(self, tilts):
+        """Beam, sky-diffuse and ground-reflected factors of each tilt (shared by both skies)."""
+        beta = np.radians(np.asarray(tilts, dtype=np.float64))[:, None]
+        return (beam_factor(self.latitude, self.decl, self.sunset, tilts),
+                (1 + np.cos(beta)) / 2, self.albedo * (1 - np.cos(beta)) / 2)
+
+    def plane_of_array(self, tilts, clear=False, factors=None):
+        """Plane-of-array irradiation (kWh/m²/day), shape ``(tilts, days)``."""
+        ghi, diffuse = (self.clear_ghi, self.clear_diffuse) if clear else (self.ghi, self.diffuse)
+        r_b, sky, ground = self.transposition(tilts) if factors is None else factors
+        return (ghi - diffuse) * r_b + diffuse * sky + ghi * ground
+
+    def cell_temp(self, poa):
+        """Faiman cell temperature from the mean daytime plane-of-array irradiance."""
+        daylight_h = 24 * self.sunset / np.pi
+        with np.errstate(invalid="ignore", divide="ignore"):
+            irradiance = np.where(daylight_h > 0, 1000 * poa / daylight_h, 0.0)
+        return self.air_temp + irradiance / (FAIMAN_U0 + FAIMAN_U1 * self.wind)
+
+    def daily_yield(self, configs, clear=False):
+        """Daily energy (kWh) of every configuration, shape ``(configs, days)``."""
+        tilts, which = np.unique(configs["tilt"].to_numpy(np.float64), return_inverse=True)
+        poa = self.plane_of_array(tilts, clear)
+        derate = 1 + configs["temp_coeff"].to_numpy()[:, None] * (self.cell_temp(poa)[which] - STC_TEMP)
+        scale = (configs["capacity_kw"] * (1 - configs["losses"])).to_numpy()[:, None]
+        return scale * poa[which] * derate
+
+    def _monthly_sums(self, tilts, clear, factors):
+        # per tilt and month: Σ H_poa and Σ H_poa · (T_cell − 25) over the valid days
+        poa = self.plane_of_array(tilts, clear, factors)
+        poa = np.where(self.valid, poa, 0.0)
+        excess = np.where(self.valid, self.cell_temp(poa) - STC_TEMP, 0.0)
+        return (np.add.reduceat(poa, self._month_starts, axis=1),
+                np.add.reduceat(poa * excess, self._month_starts, axis=1))
+
+    def simulate(self, configs):
+        """Monthly all-sky and clear-sky yields of every row of ``configs``."""
+        configs = configs.reset_index(drop=True).rename_axis("config")
+        tilts, which = np.unique(configs["tilt"].to_numpy(np.float64), return_inverse=True)
+        gamma = configs["temp_coeff"].to_numpy()[:, None]
+        scale = (configs["capacity_kw"] * (1 - configs["losses"])).to_numpy()[:, None]
+
+        factors = self.transposition(tilts)
+        poa, poa_excess = self._monthly_sums(tilts, False, factors)
+        clear, clear_excess = self._monthly_sums(tilts, True, factors)
+        return PVYield(
+            configs, self.month_codes, self.coverage,
+            scale * (poa[which] + gamma * poa_excess[which]),
+            scale * (clear[which] + gamma * clear_excess[which]),
+            configs["capacity_kw"].to_numpy()[:, None] * poa[which],
+        )
+
+
+class PVYield:
+    """``(configs, months)`` energy sums over the valid days of each month."""
+
+    def __init__(self, configs, month_codes, coverage, energy, clear_energy, reference):
+        self.configs = configs
+        self.month_codes = month_codes
+        self.energy = energy              # all-sky kWh
+        self.clear_energy = clear_energy  # clear-sky kWh
+        self.reference = reference        # capacity · H_poa, the loss-free STC yield
+        self.covered = coverage > 0
+        first = (month_codes - 1970 * 12).astype("datetime64[M]")
+        days = ((first + 1).astype("datetime64[D]") - first.astype("datetime64[D]")).astype(np.float64)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            self._fill = np.where(coverage > 0, days / coverage, np.nan)  # scale gaps to whole months
+
+    def _table(self, keys, grouped):
+        energy, clear, reference = (grouped(x) for x in (self.energy, self.clear_energy, self.reference))
+        n_configs, n_groups = energy.shape
+        table = pd.DataFrame({"config": np.repeat(np.arange(n_configs), n_groups)})
+        for name, values in keys.items():
+            table[name] = np.tile(values, n_configs)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            table["Yield_kWh"] = energy.ravel()
+            table["Clear_Sky_kWh"] = clear.ravel()
+            table["Specific_Yield_kWh_per_kWp"] = (energy / self.configs["capacity_kw"].to_numpy()[:, None]).ravel()
+            table["Performance_Ratio"] = (energy / reference).ravel()
+            table["Clear_Sky_Ratio"] = (energy / clear).ravel()
+        return table
+
+    def monthly(self):
+        """One row per configuration and month."""
+        return self._table(
+            {"year": self.month_codes // 12, "month": self.month_codes % 12 + 1},
+            lambda x: x * self._fill,
+        )
+
+    def yearly(self):
+        """One row per configuration and year; ``months`` counts the months with data."""
+        years, which = np.unique(self.month_codes // 12, return_inverse=True)
+        starts = np.flatnonzero(np.r_[True, np.diff(which) != 0])
+        return self._table(
+            {"year": years, "months": np.add.reduceat(self.covered.astype(np.int64), starts)},
+            lambda x: np.add.reduceat(np.nan_to_num(x * self._fill), starts, axis=1),
+        )
+
+    def summary(self):
+        """Configurations with their mean annual yield (complete years) and whole-record ratios."""
+        yearly = self.yearly()
+        if (yearly["months"] == 12).any():
+            yearly = yearly[yearly["months"] == 12]
+        yearly = yearly.groupby("config")[["Yield_kWh", "Specific_Yield_kWh_per_kWp"]].mean()
+        with np.errstate(invalid="ignore", divide="ignore"):
+            ratios = pd.DataFrame({
+                "Performance_Ratio": self.energy.sum(axis=1) / self.reference.sum(axis=1),
+                "Clear_Sky_Ratio": self.energy.sum(axis=1) / self.clear_energy.sum(axis=1),
+            }, index=self.configs.index)
+        return self.configs.join(yearly).join(ratios)
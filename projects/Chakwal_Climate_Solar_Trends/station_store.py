@@ -0,0 +1,226 @@
+# ===============================
+# 🗂 POWER Station Store
+# ===============================
+"""Shared store for many NASA POWER point extracts.
+
+One metadata index (location, date range, parameters) is filled from the
+POWER headers of every CSV in a directory and persisted next to the columnar
+caches, so only new or changed files are re-read. Station data is loaded
+lazily through a caller-supplied loader and kept in a bounded in-memory LRU;
+the on-disk Arrow caches are bounded too, evicting the least recently used
+stations first. Days appended to a station's cache (``power_cache.append_days``)
+count as a change of that station, and its cache is never evicted since the
+appended segments are the only copy of those days.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+
+from power_cache import CACHE_DIRNAME, appended_through, cache_path_for
+from power_reader import read_header
+
+INDEX_FILENAME = "stations.json"
+INDEX_COLUMNS = ["path", "lat", "lon", "elevation", "start", "end", "parameters", "size", "mtime_ns", "appended"]
+
+
+class StationStore:
+    """Metadata index plus two-level (memory, disk) LRU cache of stations.
+
+    ``loader(csv_path, cache_dir)`` builds whatever the app needs for one
+    station (e.g. ``(df, aggregates)``); its result is what the memory LRU
+    holds. When a loaded station's CSV changes, the optional
+    ``appender(previous, csv_path, cache_dir)`` is given the previous result
+    to update incrementally instead of reloading from scratch.
+    """
+
+    def __init__(self, data_dir, loader, appender=None, cache_dir=None, max_stations=16,
+                 max_disk_mb=512, refresh_interval=60):
+        self.data_dir = data_dir
+        self.loader = loader
+        self.appender = appender
+        self.cache_dir = cache_dir or os.path.join(os.path.abspath(data_dir), CACHE_DIRNAME)
+        self.max_stations = max_stations
+        self.max_disk_bytes = max_disk_mb * 1024 * 1024
+        self.refresh_interval = refresh_interval
+
+        self._lock = threading.RLock()
+        self._memory = OrderedDict()
+        self._stale = set()
+        self._index = {}
+        self._refreshed_at = 0.0
+        self._load_index()
+        self.refresh(force=True)
+
+    # -------------------------------
+    # Metadata index
+    # -------------------------------
+    @property
+    def index_path(self):
+        return os.path.join(self.cache_dir, INDEX_FILENAME)
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, encoding="utf-8") as f:
+                self._index = json.load(f)
+        except (OSError, ValueError):
+            self._index = {}
+
+    def _save_index(self):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._index, f)
+        os.replace(tmp_path, self.index_path)
+
+    def refresh(self, force=False):
+        """Re-scan ``data_dir``; only new or modified files have their header parsed.
+
+        A station whose CSV is unchanged but whose cache gained appended days is
+        updated from the manifest alone.
+        """
+        with self._lock:
+            if not force and time.monotonic() - self._refreshed_at < self.refresh_interval:
+                return False
+
+            seen, changed = set(), False
+            for entry in os.scandir(self.data_dir):
+                if not entry.is_file() or not entry.name.lower().endswith(".csv"):
+                    continue
+                station_id = os.path.splitext(entry.name)[0]
+                st = entry.stat()
+                known = self._index.get(station_id)
+                seen.add(station_id)
+                # absolute paths: the index is shared by processes started from other directories
+                path = os.path.abspath(entry.path)
+                appended = appended_through(path, self.cache_dir)
+                if known and (known["path"], known["size"], known["mtime_ns"]) == (path, st.st_size, st.st_mtime_ns):
+                    if known.get("appended") == appended:
+                        continue
+                    record = {**known, "appended": appended}
+                else:
+                    try:
+                        header = read_header(entry.path)
+                    except ValueError:
+                        continue  # not a POWER point export
+                    record = {
+                        "path": path,
+                        "lat": header.latitude,
+                        "lon": header.longitude,
+                        "elevation": header.elevation,
+                        "start": header.start.strftime("%Y-%m-%d") if header.start is not None else None,
+                        "end": header.end.strftime("%Y-%m-%d") if header.end is not None else None,
+                        "parameters": list(header.parameters),
+                        "size": st.st_size,
+                        "mtime_ns": st.st_mtime_ns,
+                        "appended": appended,
+                    }
+                if appended:
+                    record["end"] = appended[:10]
+                self._index[station_id] = record
+                if self.appender is not None and station_id in self._memory:
+                    self._stale.add(station_id)
+                else:
+                    self._memory.pop(station_id, None)
+                changed = True
+
+            for station_id in set(self._index) - seen:
+                del self._index[station_id]
+                self._memory.pop(station_id, None)
+                self._stale.discard(station_id)
+                changed = True
+
+            if changed:
+                self._save_index()
+            self._refreshed_at = time.monotonic()
+            return changed
+
+    @property
+    def index(self):
+        """One row per station, indexed by station id."""
+        self.refresh()
+        with self._lock:
+            frame = pd.DataFrame.from_dict(self._index, orient="index", columns=INDEX_COLUMNS)
+        frame.index.name = "station_id"
+        frame["start"] = pd.to_datetime(frame["start"])
+        frame["end"] = pd.to_datetime(frame["end"])
+        return frame.sort_index()
+
+    def station(self, station_id):
+        with self._lock:
+            if station_id not in self._index:
+                raise KeyError(f"Unknown station '{station_id}'")
+            return dict(self._index[station_id])
+
+    def version(self, station_id):
+        """Dataset version of a station; changes whenever its CSV does."""
+        entry = self.station(station_id)
+        return f"{station_id}:{entry['size']}:{entry['mtime_ns']}:{entry.get('appended') or ''}"
+
+    # -------------------------------
+    # Lazy loading & eviction
+    # -------------------------------
+    def load(self, station_id):
+        """Loader result for ``station_id``, built on first use and LRU-cached."""
+        self.refresh()
+        with self._lock:
+            if station_id in self._memory and station_id not in self._stale:
+                self._memory.move_to_end(station_id)
+                self._touch(station_id)
+                return self._memory[station_id]
+            path = self.station(station_id)["path"]
+            previous = self._memory.get(station_id)
+            self._stale.discard(station_id)
+
+        if previous is not None:
+            result = self.appender(previous, path, self.cache_dir)
+        else:
+            result = self.loader(path, self.cache_dir)
+
+        with self._lock:
+            self._memory[station_id] = result
+            self._memory.move_to_end(station_id)
+            while len(self._memory) > self.max_stations:
+                self._memory.popitem(last=False)
+            self._touch(station_id)
+            self._evict_disk(keep=station_id)
+        return result
+
+    def _cache_file(self, station_id):
+        return cache_path_for(self._index[station_id]["path"], self.cache_dir)
+
+    def _touch(self, station_id):
+        cache_file = self._cache_file(station_id)
+        if os.path.exists(cache_file):
+            os.utime(cache_file)
+
+    def _evict_disk(self, keep):
+        """Drop the least recently used Arrow caches until under ``max_disk_bytes``."""
+        keep_file = self._cache_file(keep)
+        # a station's base file, appended segments and manifest go together
+        groups = {}
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith((".arrow", ".manifest.json")):
+                st = entry.stat()
+                group = groups.setdefault(entry.name.split(".", 1)[0], [0.0, 0, []])
+                group[0] = max(group[0], st.st_mtime)
+                group[1] += st.st_size
+                group[2].append(entry.path)
+
+        total = sum(size for _, size, _ in groups.values())
+        for _, size, paths in sorted(groups.values()):
+            if total <= self.max_disk_bytes:
+                break
+            # appended segments hold the only copy of their days
+            if keep_file in paths or any(p.endswith(".manifest.json") for p in paths):
+                continue
+            for path in paths:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            total -= size
@@ -0,0 +1,100 @@
+# ===============================
+# 📈 Rolling Trend Cache
+# ===============================
+"""Rolling means and standard deviations from cumulative sums.
+
+A single cumulative-sum pass per series (count, sum, sum of squares) gives
+the mean and sample std of every window in O(n), whatever the window length.
+That makes it cheap to precompute all selectable yearly windows at load time
+and to afford daily-resolution windows such as a 365-day moving mean.
+Results follow pandas ``rolling(window, center=...)`` alignment and NaN rules.
+"""
+
+import numpy as np
+import pandas as pd
+
+YEARLY_WINDOWS = (3, 5, 10)
+DAILY_WINDOW = 365
+
+
+def _window_bounds(n, window, center):
+    i = np.arange(n)
+    end = i + (window + 1) // 2 if center else i + 1
+    start = np.maximum(end - window, 0)
+    return start, np.minimum(end, n)
+
+
+def rolling_stats(values, window, center=True, min_periods=None):
+    """Rolling ``(mean, std)`` along axis 0 of a 1-D or 2-D array.
+
+    Windows with fewer than ``min_periods`` (default ``window``) non-NaN
+    values are NaN, as in pandas; the std uses ``ddof=1``.
+    """
+    x = np.asarray(values, dtype=np.float64)
+    min_periods = window if min_periods is None else min_periods
+    n = x.shape[0]
+
+    valid = ~np.isnan(x)
+    # shift by the series mean so the sum-of-squares stays well conditioned
+    with np.errstate(invalid="ignore"):
+        shift = np.nanmean(x, axis=0) if valid.any() else 0.0
+    z = np.where(valid, x - shift, 0.0)
+
+    pad = np.zeros((1,) + x.shape[1:])
+    c_n = np.concatenate([pad, np.cumsum(valid, axis=0)])
+    c_s = np.concatenate([pad, np.cumsum(z, axis=0)])
+    c_q = np.concatenate([pad, np.cumsum(z * z, axis=0)])
+
+    start, end = _window_bounds(n, window, center)
+    cnt = c_n[end] - c_n[start]
+    s = c_s[end] - c_s[start]
+    q = c_q[end] - c_q[start]
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = s / cnt
+        var = np.maximum(q - s * mean, 0.0) / (cnt - 1)
+    ok = cnt >= max(min_periods, 1)
+    mean = np.where(ok, mean + shift, np.nan)
+    std = np.where(ok & (cnt > 1), np.sqrt(var), np.nan)
+    return mean, std
+
+
+def rolling_mean(values, window, center=True, min_periods=None):
+    return rolling_stats(values, window, center, min_periods)[0]
+
+
+class TrendCache:
+    """Precomputed rolling mean/std per (variable, window) for a yearly table."""
+
+    def __init__(self, frame, variables, windows=YEARLY_WINDOWS, center=True):
+        self.years = frame["year"].to_numpy()
+        self.windows = tuple(windows)
+        self._trends = {}
+        for var in variables:
+            for window in self.windows:
+                self._trends[var, window] = rolling_stats(frame[var].to_numpy(), window, center)
+
+    def get(self, var, window):
+        """Frame of ``year``, ``Trend`` and ``Trend_Std`` for one window."""
+        mean, std = self._trends[var, window]
+        return pd.DataFrame({"year": self.years, "Trend": mean, "Trend_Std": std})
+
+
+def daily_trend(dates, values, window=DAILY_WINDOW, min_periods=None):
+    """Centered ``window``-day moving mean/std over a daily series."""
+    min_periods = window // 2 if min_periods is None else min_periods
+    mean, std = rolling_stats(values, window, center=True, min_periods=min_periods)
+    return pd.DataFrame({"DATE": dates, "Trend": mean, "Trend_Std": std})
+
+
+def extend_daily_trend(previous, dates, values, window=DAILY_WINDOW, min_periods=None):
+    """``daily_trend`` after rows were appended, recomputing only the tail.
+
+    ``previous`` covers the first ``len(previous)`` rows of ``dates``/``values``;
+    only windows that reach the old end of the record can change.
+    """
+    n_old = len(previous)
+    start = max(n_old - 2 * window, 0)
+    tail = daily_trend(dates[start:], values[start:], window, min_periods)
+    keep = max(n_old - window, 0)
+    return pd.concat([previous.iloc[:keep], tail.iloc[keep - start:]], ignore_index=True)
@@ -0,0 +1,166 @@
+# ===============================
+# 🧠 Callback Result Cache
+# ===============================
+"""Memoized Dash callback results shared across sessions and workers.
+
+Results (figures, ``Patch`` updates, component children) are serialized once
+with plotly's JSON encoder and keyed on the function, its input values and a
+dataset version, so a repeated filter combination skips the work and the
+serialization. Entries live in a per-process LRU bounded by count and TTL;
+an optional SQLite file on local disk is shared by every worker process on
+the host, so a result computed by one gunicorn worker is reused by the rest.
+"""
+
+import functools
+import hashlib
+import itertools
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from dash import no_update
+from plotly.io.json import to_json_plotly
+
+from instrumentation import timed
+
+
+class CallbackCache:
+    """Two-level (memory LRU, optional SQLite) cache of JSON callback results."""
+
+    def __init__(self, max_entries=1024, ttl=3600, path=None, max_disk_entries=100_000):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.path = path
+        self.max_disk_entries = max_disk_entries
+        self.hits = {}
+        self.misses = {}
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            with self._connect() as db:
+                db.execute("CREATE TABLE IF NOT EXISTS results "
+                           "(key TEXT PRIMARY KEY, payload TEXT, expires REAL, stored REAL)")
+
+    # -------------------------------
+    # Shared SQLite backend
+    # -------------------------------
+    def _connect(self):
+        # one connection per thread and process (connections must not cross a fork)
+        db = getattr(self._local, "db", None)
+        if db is None or self._local.pid != os.getpid():
+            db = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db, self._local.pid = db, os.getpid()
+        return db
+
+    def _disk_get(self, key, now):
+        try:
+            row = self._connect().execute(
+                "SELECT payload FROM results WHERE key = ? AND expires > ?", (key, now)).fetchone()
+        except sqlite3.Error:
+            return None
+        return row[0] if row else None
+
+    def _disk_put(self, key, payload, now):
+        try:
+            db = self._connect()
+            db.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)", (key, payload, now + self.ttl, now))
+            if self.misses_total % 256 == 0:
+                db.execute("DELETE FROM results WHERE expires <= ?", (now,))
+                db.execute("DELETE FROM results WHERE key IN (SELECT key FROM results ORDER BY stored DESC "
+                           "LIMIT -1 OFFSET ?)", (self.max_disk_entries,))
+        except sqlite3.Error:
+            pass  # the shared tier is best effort; the result is still cached in memory
+
+    # -------------------------------
+    # Lookup
+    # -------------------------------
+    @property
+    def misses_total(self):
+        return sum(self.misses.values())
+
+    def get_or_compute(self, name, key_parts, compute):
+        """JSON-decoded result for ``key_parts``; ``compute()`` runs only on a miss."""
+        key = hashlib.sha1(json.dumps([name, key_parts], default=str).encode()).hexdigest()
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits[name] = self.hits.get(name, 0) + 1
+                return json.loads(entry[1])
+
+        payload = self._disk_get(key, now) if self.path else None
+        with self._lock:
+            counter = self.hits if payload is not None else self.misses
+            counter[name] = counter.get(name, 0) + 1
+        if payload is None:
+            result = compute()
+            if _has_no_update(result):
+                return result  # "nothing changed" answers are not cacheable
+            with timed("serialize", function=name):
+                payload = to_json_plotly(result)
+            if self.path:
+                self._disk_put(key, payload, now)
+
+        with self._lock:
+            self._entries[key] = (now + self.ttl, payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return json.loads(payload)
+
+    def memoize(self, version=None, ignore=(), multi=False):
+        """Decorator caching a function by its arguments and ``version()``.
+
+        ``ignore`` lists positional argument indices left out of the key
+        (e.g. an ``n_intervals`` counter); ``multi`` returns cached results
+        as a tuple, as Dash expects from multi-output callbacks.
+        """
+        def decorator(func):
+            name = func.__qualname__
+
+            @functools.wraps(func)
+            def wrapper(*args):
+                key_args = [a for i, a in enumerate(args) if i not in ignore]
+                result = self.get_or_compute(
+                    name, [key_args, version() if version else None], lambda: func(*args))
+                return tuple(result) if multi else result
+
+            return wrapper
+        return decorator
+
+    def warm(self, func, *grids):
+        """Precompute ``func`` for every combination of the given argument values."""
+        for args in itertools.product(*grids):
+            func(*args)
+
+    def stats(self):
+        names = sorted(set(self.hits) | set(self.misses))
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": sum(self.hits.values()),
+                "misses": self.misses_total,
+                "functions": {n: {"hits": self.hits.get(n, 0), "misses": self.misses.get(n, 0)} for n in names},
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        if self.path:
+            try:
+                self._connect().execute("DELETE FROM results")
+            except sqlite3.Error:
+                pass
+
+
+def _has_no_update(result):
+    items = result if isinstance(result, (tuple, list)) else (result,)
+    return any(isinstance(item, type(no_update)) for item in items)
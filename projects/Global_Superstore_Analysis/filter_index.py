@@ -0,0 +1,223 @@
+# ===============================
+# 🧭 Multi-Dimensional Filter Index
+# ===============================
+"""Bitmap filter engine over every Superstore dimension, with rollups.
+
+At startup each dimension (Market, Country, Region, Segment, Category,
+Sub-Category, Ship Mode, Order Priority) is dictionary-encoded to integer
+codes (straight from the Arrow cache's categoricals) and every value gets a
+packed row bitmap. Any filter combination resolves by OR-ing the selected
+values' bitmaps within a dimension and AND-ing across dimensions; only the
+matching rows are aggregated.
+
+Common shapes skip the bitmaps altogether: Region/Category-only filters read
+the ``SalesCube``, and the drill-down paths (Market→Country,
+Category→Sub-Category) have precomputed parent→child maps and child totals,
+so their dropdowns and charts are lookups.
+"""
+
+import numpy as np
+import pandas as pd
+
+from sales_cube import SalesCube
+
+DIMENSIONS = ["Market", "Country", "Region", "Segment", "Category", "Sub-Category", "Ship_Mode", "Order_Priority"]
+HIERARCHIES = {"Market": "Country", "Category": "Sub-Category"}
+MEASURES = ["Sales", "Profit"]
+CUBE_DIMENSIONS = {"Region", "Category"}
+
+
+def active_filters(filters):
+    """``{dimension: [values]}`` for the dimensions that are actually filtered."""
+    active = {}
+    for dim, selected in (filters or {}).items():
+        if selected is None or selected == [] or selected == "":
+            continue
+        active[dim] = list(selected) if isinstance(selected, (list, tuple)) else [selected]
+    return active
+
+
+def month_series(months, values):
+    """Dense month-start ``ds``/``y`` frame from month numbers (``year * 12 + month - 1``)."""
+    if len(months) == 0:
+        return pd.DataFrame({"ds": pd.DatetimeIndex([]), "y": np.empty(0)})
+    first = months.min()
+    y = np.bincount(months - first, weights=values, minlength=months.max() - first + 1)
+    ds = (np.arange(len(y)) + first - 1970 * 12).astype("datetime64[M]").astype("datetime64[ns]")
+    return pd.DataFrame({"ds": pd.DatetimeIndex(ds), "y": y.astype(np.float64)})
+
+
+class FilterIndex:
+    """Encoded dimensions, per-value bitmaps, measures and rollups of the order table."""
+
+    def __init__(self, n_rows, dimensions, codes, bitmaps, month_codes, measures, cube, children, rollups):
+        self.n_rows = n_rows
+        self.dimensions = dimensions      # name -> sorted values
+        self.codes = codes                # name -> int codes per row (-1 = missing)
+        self.bitmaps = bitmaps            # name -> (values, ceil(rows / 8)) packed bitmaps
+        self.month_codes = month_codes    # year * 12 + month - 1 per row
+        self.measures = measures          # name -> float64 per row
+        self.cube = cube                  # (Region, Category, month) rollup
+        self.children = children          # parent dim -> parent value -> child values
+        self.rollups = rollups            # (dim, parent value or None) -> {measure/"Orders": totals per value}
+
+    @classmethod
+    def from_frame(cls, df, dimensions=DIMENSIONS, date="Order_Date"):
+        n = len(df)
+        values, codes, bitmaps = {}, {}, {}
+        present = np.zeros(n, dtype=bool)
+        for dim in dimensions:
+            column = df[dim].astype("category").cat.remove_unused_categories()
+            values[dim] = [str(v) for v in column.cat.categories]
+            codes[dim] = column.cat.codes.to_numpy(dtype=np.int32)
+            # one packed bitmap per value, built from that value's row indices
+            order = np.argsort(codes[dim], kind="stable")
+            bounds = np.searchsorted(codes[dim][order], np.arange(len(values[dim]) + 1))
+            packed = np.empty((len(values[dim]), (n + 7) // 8), dtype=np.uint8)
+            for i in range(len(values[dim])):
+                present[:] = False
+                present[order[bounds[i]:bounds[i + 1]]] = True
+                packed[i] = np.packbits(present)
+            bitmaps[dim] = packed
+
+        dates = df[date].dt
+        month_codes = (dates.year * 12 + dates.month - 1).to_numpy(dtype=np.int64)
+        measures = {m: df[m].to_numpy(dtype=np.float64) for m in MEASURES}
+        index = cls(n, values, codes, bitmaps, month_codes, measures, SalesCube.from_frame(df), {}, {})
+        index._build_rollups()
+        return index
+
+    def _build_rollups(self):
+        # totals per value of every dimension (unfiltered breakdowns)
+        for dim in self.dimensions:
+            self.rollups[dim, None] = self._totals(self.codes[dim], len(self.dimensions[dim]))
+        # drill-down paths: children of each parent value and their totals
+        for parent, child in HIERARCHIES.items():
+            if parent not in self.dimensions or child not in self.dimensions:
+                continue
+            n_child = len(self.dimensions[child])
+            pair = self.codes[parent].astype(np.int64) * n_child + self.codes[child]
+            totals = self._totals(pair, len(self.dimensions[parent]) * n_child)
+            self.children[parent] = {}
+            for p, name in enumerate(self.dimensions[parent]):
+                block = slice(p * n_child, (p + 1) * n_child)
+                orders = totals["Orders"][block]
+                self.children[parent][name] = [self.dimensions[child][c] for c in np.flatnonzero(orders)]
+                self.rollups[child, name] = {k: v[block] for k, v in totals.items()}
+
+    def _totals(self, codes, size, rows=None):
+        if rows is not None:
+            codes = codes[rows]
+        valid = codes >= 0
+        totals = {"Orders": np.bincount(codes[valid], minlength=size).astype(np.float64)}
+        for m in MEASURES:
+            weights = self.measures[m] if rows is None else self.measures[m][rows]
+            totals[m] = np.bincount(codes[valid], weights=weights[valid], minlength=size)
+        return totals
+
+    # -------------------------------
+    # Bitmap selection
+    # -------------------------------
+    def _codes_for(self, dim, selected):
+        lookup = {v: i for i, v in enumerate(self.dimensions[dim])}
+        return [lookup[v] for v in selected if v in lookup]
+
+    def _mask(self, active):
+        """Packed bitmap of rows matching ``active`` (``None`` when nothing is filtered)."""
+        mask = None
+        for dim, selected in active.items():
+            codes = self._codes_for(dim, selected)
+            dim_mask = np.bitwise_or.reduce(self.bitmaps[dim][codes], axis=0) if codes else \
+                np.zeros(self.bitmaps[dim].shape[1], dtype=np.uint8)
+            mask = dim_mask if mask is None else np.bitwise_and(mask, dim_mask, out=mask)
+        return mask
+
+    def _rows(self, active):
+        mask = self._mask(active)
+        if mask is None:
+            return None
+        return np.flatnonzero(np.unpackbits(mask, count=self.n_rows))
+
+    def _cube_filter(self, active):
+        # the cube holds single known Region/Category selections ("All" otherwise)
+        if set(active) <= CUBE_DIMENSIONS and all(len(v) == 1 and v[0] in self.dimensions[d]
+                                                  for d, v in active.items()):
+            return active.get("Region", [None])[0], active.get("Category", [None])[0]
+        return None
+
+    # -------------------------------
+    # Queries
+    # -------------------------------
+    def values(self, dim):
+        return list(self.dimensions[dim])
+
+    @property
+    def regions(self):
+        return self.values("Region")
+
+    @property
+    def categories(self):
+        return self.values("Category")
+
+    def options(self, dim, filters=None):
+        """Values of ``dim`` that still have orders under the filters on the other dimensions."""
+        others = {d: v for d, v in active_filters(filters).items() if d != dim}
+        if not others:
+            return self.values(dim)
+        if len(others) == 1:
+            (parent, selected), = others.items()
+            if HIERARCHIES.get(parent) == dim:
+                found = {c for p in selected for c in self.children[parent].get(p, [])}
+                return [v for v in self.dimensions[dim] if v in found]
+        mask = self._mask(others)
+        return [v for v, bitmap in zip(self.dimensions[dim], self.bitmaps[dim])
+                if np.bitwise_and(bitmap, mask).any()]
+
+    def kpis(self, filters=None):
+        active = active_filters(filters)
+        cell = self._cube_filter(active)
+        if cell is not None:
+            return self.cube.kpis(*cell)
+        rows = self._rows(active)
+        sales, profit = (self.measures[m][rows].sum() for m in MEASURES)
+        return {
+            "total_sales": sales,
+            "total_profit": profit,
+            "avg_order": sales / len(rows) if len(rows) else 0,
+        }
+
+    def breakdown(self, dim, measure, filters=None):
+        """Totals of ``measure`` per value of ``dim`` present in the filtered orders."""
+        active = active_filters(filters)
+        cell = self._cube_filter(active)
+        if dim in CUBE_DIMENSIONS and cell is not None:
+            return (self.cube.by_region if dim == "Region" else self.cube.by_category)(measure, *cell)
+
+        names = np.asarray(self.dimensions[dim], dtype=object)
+        parent = next((p for p, c in HIERARCHIES.items() if c == dim), None)
+        if not active:
+            totals = self.rollups[dim, None]
+        elif set(active) == {parent} and len(active[parent]) == 1 and (dim, active[parent][0]) in self.rollups:
+            totals = self.rollups[dim, active[parent][0]]
+        elif set(active) == {dim}:
+            totals = self.rollups[dim, None]
+        else:
+            totals = self._totals(self.codes[dim], len(names), self._rows(active))
+
+        keep = totals["Orders"] > 0
+        if dim in active:
+            keep &= np.isin(names, active[dim])
+        return pd.DataFrame({dim: names[keep], measure: totals[measure][keep]})
+
+    def monthly(self, measure="Sales", filters=None):
+        """``ds``/``y`` month-start series from the first to last month with orders."""
+        active = active_filters(filters)
+        cell = self._cube_filter(active)
+        if cell is not None:
+            return self.cube.monthly(measure, *cell)
+        rows = self._rows(active)
+        return month_series(self.month_codes[rows], self.measures[measure][rows])
+
+    def segments(self, measure="Sales"):
+        """Monthly series of every (region, category) pair, ``None`` standing for "All"."""
+        return self.cube.segments(measure)
@@ -0,0 +1,160 @@
+# ===============================
+# 🔮 Forecast Model Registry
+# ===============================
+"""Persisted forecast artifacts keyed by training data and hyperparameters.
+
+Fitted models and their precomputed forecasts are pickled together under a
+hash of the training series and the parameters, so restarts and every worker
+process reuse the same artifact instead of re-training. A missing artifact
+is trained on a background thread while callers see a "warming up" state;
+an exclusive lock file makes sure only one process (e.g. one of several
+forked gunicorn workers) trains while the others wait for the file to appear.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import threading
+import time
+
+import numpy as np
+
+log = logging.getLogger(__name__)
+
+REGISTRY_VERSION = 1
+STALE_LOCK_SECONDS = 3600
+
+
+def training_key(series, params):
+    """Hash of ``ds``/``y`` training series (one frame or a dict of them) plus hyperparameters."""
+    digest = hashlib.sha256()
+    digest.update(str(REGISTRY_VERSION).encode())
+    for name, frame in sorted(series.items(), key=repr) if isinstance(series, dict) else [(None, series)]:
+        digest.update(repr(name).encode())
+        digest.update(frame["ds"].to_numpy(dtype="datetime64[ns]").astype(np.int64).tobytes())
+        digest.update(frame["y"].to_numpy(dtype=np.float64).tobytes())
+    digest.update(json.dumps(params, sort_keys=True, default=str).encode())
+    return digest.hexdigest()[:16]
+
+
+class ForecastRegistry:
+    """Disk-backed artifacts plus one background training job per key.
+
+    ``trainer(series, params)`` returns the artifact (e.g. a dict of fitted
+    models and forecasts), which is pickled into ``<directory>/<key>.pkl``. ``status(key)`` is one of
+    ``"ready"``, ``"training"`` or ``"failed"``.
+    """
+
+    def __init__(self, directory, trainer):
+        self.directory = directory
+        self.trainer = trainer
+        self._lock = threading.Lock()
+        self._artifacts = {}
+        self._jobs = {}
+        self._errors = {}
+
+    def artifact_path(self, key):
+        return os.path.join(self.directory, f"{key}.pkl")
+
+    def _lock_path(self, key):
+        return os.path.join(self.directory, f"{key}.lock")
+
+    def ensure(self, series, params):
+        """Key of the artifact for ``series``/``params``; starts training if it is missing."""
+        key = training_key(series, params)
+        if self.get(key) is None:
+            with self._lock:
+                job = self._jobs.get(key)
+                if job is None or not job.is_alive():
+                    self._errors.pop(key, None)
+                    job = threading.Thread(target=self._train, args=(key, series, params),
+                                           name=f"forecast-{key}", daemon=True)
+                    self._jobs[key] = job
+                    job.start()
+        return key
+
+    def get(self, key):
+        """Artifact for ``key`` or ``None`` while it is not available."""
+        with self._lock:
+            artifact = self._artifacts.get(key)
+        if artifact is not None:
+            return artifact
+        try:
+            with open(self.artifact_path(key), "rb") as f:
+                artifact = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+        with self._lock:
+            self._artifacts[key] = artifact
+        return artifact
+
+    def status(self, key):
+        if self.get(key) is not None:
+            return "ready"
+        with self._lock:
+            return "failed" if key in self._errors else "training"
+
+    def wait(self, key, timeout=None):
+        """Block until ``key`` is ready or failed (``None`` when it failed or timed out)."""
+        with self._lock:
+            job = self._jobs.get(key)
+        if job is not None:
+            job.join(timeout)
+        return self.get(key)
+
+    # -------------------------------
+    # Background training
+    # -------------------------------
+    def _lock_age(self, key):
+        try:
+            return time.time() - os.path.getmtime(self._lock_path(key))
+        except OSError:
+            return None
+
+    def _acquire(self, key):
+        path = self._lock_path(key)
+        for _ in range(2):
+            try:
+                fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                age = self._lock_age(key)
+                if age is not None and age < STALE_LOCK_SECONDS:
+                    return False
+                try:
+                    os.remove(path)  # left behind by a crashed trainer
+                except OSError:
+                    pass
+                continue
+            with os.fdopen(fd, "w") as f:
+                f.write(str(os.getpid()))
+            return True
+        return False
+
+    def _train(self, key, series, params):
+        os.makedirs(self.directory, exist_ok=True)
+        try:
+            if not self._acquire(key):
+                # another process is training; wait for its artifact
+                while (age := self._lock_age(key)) is not None and age < STALE_LOCK_SECONDS:
+                    time.sleep(1.0)
+                if self.get(key) is None:
+                    raise RuntimeError(f"Training of forecast {key} by another process did not finish")
+                return
+            try:
+                started = time.perf_counter()
+                artifact = self.trainer(series, params)
+                tmp_path = f"{self.artifact_path(key)}.{os.getpid()}.tmp"
+                with open(tmp_path, "wb") as f:
+                    pickle.dump(artifact, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, self.artifact_path(key))
+                with self._lock:
+                    self._artifacts[key] = artifact
+                log.info("Trained forecast %s in %.1fs", key, time.perf_counter() - started)
+            finally:
+                os.remove(self._lock_path(key))
+        except Exception as exc:  # surfaced through status()
+            log.exception("Forecast training %s failed", key)
+            with self._lock:
+                self._errors[key] = exc
@@ -1,225 +1,501 @@
-{
- "cells": [
-  {
-   "cell_type": "code",
-   "execution_count": null,
-   "id": "a1bc1641-b600-4fb7-a1bd-c5320a4d9021",
-   "metadata": {},
-   "outputs": [],
-   "source": [
-    "# ===============================\n",
-    "# 1. Imports & Logging Setup\n",
-    "# ===============================\n",
-    "import warnings\n",
-    "import logging\n",
-    "warnings.filterwarnings('ignore')\n",
-    "logging.getLogger(\"neuralprophet\").setLevel(logging.ERROR)\n",
-    "logging.getLogger(\"NP\").setLevel(logging.ERROR)\n",
-    "\n",
-    "import pandas as pd\n",
-    "import plotly.express as px\n",
-    "import plotly.graph_objects as go\n",
-    "from dash import Dash, dcc, html, Input, Output, State\n",
-    "from neuralprophet import NeuralProphet\n",
-    "\n",
-    "# ===============================\n",
-    "# 2. Load & Preprocess Data\n",
-    "# ===============================\n",
-    "df = pd.read_csv(\"Global_Superstore2.csv\", encoding=\"ISO-8859-1\")\n",
-    "df[\"Order Date\"] = pd.to_datetime(df[\"Order Date\"])\n",
-    "df.columns = [c.strip().replace(\" \", \"_\") for c in df.columns]\n",
-    "\n",
-    "# Aggregate monthly total sales for global model\n",
-    "monthly_sales = df.groupby(pd.Grouper(key=\"Order_Date\", freq=\"MS\"))[[\"Sales\"]].sum().reset_index()\n",
-    "monthly_sales.columns = [\"ds\", \"y\"]\n",
-    "\n",
-    "# ===============================\n",
-    "# 3. Fit Single Global NeuralProphet Model\n",
-    "# ===============================\n",
-    "m = NeuralProphet(\n",
-    "    yearly_seasonality=True,\n",
-    "    weekly_seasonality=False,\n",
-    "    daily_seasonality=False,\n",
-    "    epochs=50,\n",
-    "    learning_rate=1.0\n",
-    ")\n",
-    "m.fit(monthly_sales, freq=\"MS\", checkpointing=False)\n",
-    "\n",
-    "# Precompute global forecast (max 24 months ahead)\n",
-    "future = m.make_future_dataframe(monthly_sales, periods=24)\n",
-    "global_forecast = m.predict(future)\n",
-    "\n",
-    "# ===============================\n",
-    "# 4. Dash App Layout\n",
-    "# ===============================\n",
-    "app = Dash(__name__)\n",
-    "\n",
-    "app.layout = html.Div([\n",
-    "    html.H1(\"📊 Global Superstore Dashboard\", style={\"textAlign\": \"center\"}),\n",
-    "\n",
-    "    # Filters\n",
-    "    html.Div([\n",
-    "        html.Div([\n",
-    "            html.Label(\"Select Region:\"),\n",
-    "            dcc.Dropdown(\n",
-    "                id=\"region-filter\",\n",
-    "                options=[{\"label\": r, \"value\": r} for r in df[\"Region\"].unique()],\n",
-    "                value=None,\n",
-    "                placeholder=\"All Regions\"\n",
-    "            )\n",
-    "        ], style={\"width\": \"24%\", \"display\": \"inline-block\", \"marginRight\": \"1%\"}),\n",
-    "\n",
-    "        html.Div([\n",
-    "            html.Label(\"Select Category:\"),\n",
-    "            dcc.Dropdown(\n",
-    "                id=\"category-filter\",\n",
-    "                options=[{\"label\": c, \"value\": c} for c in df[\"Category\"].unique()],\n",
-    "                value=None,\n",
-    "                placeholder=\"All Categories\"\n",
-    "            )\n",
-    "        ], style={\"width\": \"24%\", \"display\": \"inline-block\", \"marginRight\": \"1%\"}),\n",
-    "\n",
-    "        html.Div([\n",
-    "            html.Label(\"Forecast Horizon (months):\"),\n",
-    "            dcc.Dropdown(\n",
-    "                id=\"forecast-horizon\",\n",
-    "                options=[{\"label\": str(h), \"value\": h} for h in [6, 12, 24]],\n",
-    "                value=12\n",
-    "            )\n",
-    "        ], style={\"width\": \"24%\", \"display\": \"inline-block\", \"marginRight\": \"1%\"}),\n",
-    "\n",
-    "        html.Div([\n",
-    "            html.Label(\"Mode:\"),\n",
-    "            dcc.RadioItems(\n",
-    "                id=\"mode-switch\",\n",
-    "                options=[{\"label\": \"Light\", \"value\": \"light\"}, {\"label\": \"Dark\", \"value\": \"dark\"}],\n",
-    "                value=\"light\",\n",
-    "                inline=True\n",
-    "            )\n",
-    "        ], style={\"width\": \"24%\", \"display\": \"inline-block\"})\n",
-    "    ], style={\"marginBottom\": \"20px\"}),\n",
-    "\n",
-    "    # KPI cards\n",
-    "    html.Div(id=\"kpi-cards\", style={\"display\": \"flex\", \"justifyContent\": \"space-around\", \"marginBottom\": \"20px\"}),\n",
-    "\n",
-    "    # Tabs\n",
-    "    dcc.Tabs([\n",
-    "        dcc.Tab(label=\"Sales by Region\", children=[dcc.Graph(id=\"sales-region\")]),\n",
-    "        dcc.Tab(label=\"Profit by Category\", children=[dcc.Graph(id=\"profit-category\")]),\n",
-    "        dcc.Tab(label=\"Sales Forecast\", children=[\n",
-    "            dcc.Graph(id=\"sales-forecast\"),\n",
-    "            html.Button(\"Export Forecast PNG\", id=\"export-btn\")\n",
-    "        ])\n",
-    "    ])\n",
-    "])\n",
-    "\n",
-    "# ===============================\n",
-    "# 5. Callback for Interactive Charts + KPIs\n",
-    "# ===============================\n",
-    "@app.callback(\n",
-    "    Output(\"sales-region\", \"figure\"),\n",
-    "    Output(\"profit-category\", \"figure\"),\n",
-    "    Output(\"sales-forecast\", \"figure\"),\n",
-    "    Output(\"kpi-cards\", \"children\"),\n",
-    "    Input(\"region-filter\", \"value\"),\n",
-    "    Input(\"category-filter\", \"value\"),\n",
-    "    Input(\"forecast-horizon\", \"value\"),\n",
-    "    Input(\"mode-switch\", \"value\")\n",
-    ")\n",
-    "def update_charts(region, category, horizon, mode):\n",
-    "    # Filter data\n",
-    "    dff = df.copy()\n",
-    "    if region:\n",
-    "        dff = dff[dff[\"Region\"] == region]\n",
-    "    if category:\n",
-    "        dff = dff[dff[\"Category\"] == category]\n",
-    "\n",
-    "    # KPI values\n",
-    "    total_sales = dff[\"Sales\"].sum()\n",
-    "    total_profit = dff[\"Profit\"].sum()\n",
-    "    avg_order = dff[\"Sales\"].mean() if not dff.empty else 0\n",
-    "\n",
-    "    kpi_children = [\n",
-    "        html.Div([\n",
-    "            html.H4(\"Total Sales\"),\n",
-    "            html.P(f\"${total_sales:,.0f}\")\n",
-    "        ], style={\"border\": \"1px solid #ccc\", \"padding\": \"10px\", \"borderRadius\": \"10px\", \"width\": \"30%\", \"textAlign\": \"center\"}),\n",
-    "        html.Div([\n",
-    "            html.H4(\"Total Profit\"),\n",
-    "            html.P(f\"${total_profit:,.0f}\")\n",
-    "        ], style={\"border\": \"1px solid #ccc\", \"padding\": \"10px\", \"borderRadius\": \"10px\", \"width\": \"30%\", \"textAlign\": \"center\"}),\n",
-    "        html.Div([\n",
-    "            html.H4(\"Avg Order Value\"),\n",
-    "            html.P(f\"${avg_order:,.2f}\")\n",
-    "        ], style={\"border\": \"1px solid #ccc\", \"padding\": \"10px\", \"borderRadius\": \"10px\", \"width\": \"30%\", \"textAlign\": \"center\"})\n",
-    "    ]\n",
-    "\n",
-    "    # Sales by Region\n",
-    "    sales_region = dff.groupby(\"Region\")[\"Sales\"].sum().reset_index()\n",
-    "    fig1 = px.bar(sales_region, x=\"Region\", y=\"Sales\", title=\"Total Sales by Region\")\n",
-    "    if mode == \"dark\":\n",
-    "        fig1.update_layout(template=\"plotly_dark\")\n",
-    "\n",
-    "    # Profit by Category\n",
-    "    profit_category = dff.groupby(\"Category\")[\"Profit\"].sum().reset_index()\n",
-    "    fig2 = px.bar(profit_category, x=\"Category\", y=\"Profit\", title=\"Total Profit by Category\")\n",
-    "    if mode == \"dark\":\n",
-    "        fig2.update_layout(template=\"plotly_dark\")\n",
-    "\n",
-    "    # Sales Forecast\n",
-    "    fig3 = go.Figure()\n",
-    "    actual = dff.groupby(pd.Grouper(key=\"Order_Date\", freq=\"MS\"))[[\"Sales\"]].sum().reset_index()\n",
-    "    actual.columns = [\"ds\", \"y\"]\n",
-    "\n",
-    "    # Historical line\n",
-    "    if not actual.empty:\n",
-    "        fig3.add_trace(go.Scatter(x=actual[\"ds\"], y=actual[\"y\"], mode=\"lines+markers\",\n",
-    "                                  name=\"Actual\", hovertemplate=\"%{x|%b %Y}: $%{y:.2f}\"))\n",
-    "\n",
-    "        # Scale forecast\n",
-    "        scale_factor = actual[\"y\"].iloc[-1] / monthly_sales[\"y\"].iloc[-1]\n",
-    "        scaled_forecast_y = global_forecast[\"yhat1\"][:horizon] * scale_factor\n",
-    "        fig3.add_trace(go.Scatter(x=global_forecast[\"ds\"][:horizon], y=scaled_forecast_y,\n",
-    "                                  mode=\"lines+markers\", name=\"Forecast (Scaled)\",\n",
-    "                                  hovertemplate=\"%{x|%b %Y}: $%{y:.2f}\"))\n",
-    "    else:\n",
-    "        fig3.add_trace(go.Scatter(x=global_forecast[\"ds\"][:horizon], y=global_forecast[\"yhat1\"][:horizon],\n",
-    "                                  mode=\"lines+markers\", name=\"Forecast\",\n",
-    "                                  hovertemplate=\"%{x|%b %Y}: $%{y:.2f}\"))\n",
-    "\n",
-    "    fig3.update_layout(title=\"Sales Forecast\", xaxis_title=\"Date\", yaxis_title=\"Sales\")\n",
-    "    if mode == \"dark\":\n",
-    "        fig3.update_layout(template=\"plotly_dark\")\n",
-    "\n",
-    "    return fig1, fig2, fig3, kpi_children\n",
-    "\n",
-    "# ===============================\n",
-    "# 6. Run App\n",
-    "# ===============================\n",
-    "if __name__ == \"__main__\":\n",
-    "    app.run(debug=False, port=8050)\n"
-   ]
-  }
- ],
- "metadata": {
-  "kernelspec": {
-   "display_name": "Python [conda env:base] *",
-   "language": "python",
-   "name": "conda-base-py"
-  },
-  "language_info": {
-   "codemirror_mode": {
-    "name": "ipython",
-    "version": 3
-   },
-   "file_extension": ".py",
-   "mimetype": "text/x-python",
-   "name": "python",
-   "nbconvert_exporter": "python",
-   "pygments_lexer": "ipython3",
-   "version": "3.12.7"
-  }
- },
- "nbformat": 4,
- "nbformat_minor": 5
+# ===============================
+# 1. Imports & Logging Setup
+# ===============================
+import json
+import os
+import warnings
+import logging
+from concurrent.futures import ThreadPoolExecutor
+warnings.filterwarnings('ignore')
+logging.getLogger("neuralprophet").setLevel(logging.ERROR)
+logging.getLogger("NP").setLevel(logging.ERROR)
+
+import plotly.graph_objects as go
+import plotly.io as pio
+from dash import Dash, Patch, ctx, dcc, html, no_update, Input, Output, State
+
+from callback_cache import CallbackCache
+from filter_index import DIMENSIONS, HIERARCHIES, FilterIndex, active_filters
+from forecast_registry import ForecastRegistry
+from instrumentation import CONTENT_TYPE, RequestProfiler, instrument_wsgi, metrics, timed
+from lazy_import import lazy_import
+from segment_forecasts import HORIZONS, forecast_segments
+from superstore_cache import load_orders, source_key
+
+# plotly.express is only needed once the first figure is built
+px = lazy_import("plotly.express")
+
+# ===============================
+# 2. Load Data & Per-Segment NeuralProphet Models
+# ===============================
+ORDERS_CSV = "Global_Superstore2.csv"
+ORDER_COLUMNS = ["Order_Date", *DIMENSIONS, "Sales", "Profit"]
+# FAST_STARTUP=1 boots the server while data and models load in the background;
+# the page shell is served at once and the first layout waits for the data
+FAST_STARTUP = os.environ.get("FAST_STARTUP") == "1"
+# STORAGE_BACKEND=sql keeps the orders in an embedded database (ORDERS_DB_URL,
+# default SQLite next to the CSV) and pushes every aggregation down to it
+STORAGE_BACKEND = os.environ.get("STORAGE_BACKEND", "cube")
+
+FORECAST_DIR = os.environ.get("FORECAST_MODEL_DIR", ".forecast_models")
+FORECAST_PARAMS = {
+    "model": dict(
+        yearly_seasonality=True,
+        weekly_seasonality=False,
+        daily_seasonality=False,
+        epochs=50,
+        learning_rate=1.0
+    ),
+    "horizons": HORIZONS,
 }
+# FORECAST_METHOD=seasonal-naive skips NeuralProphet (e.g. builds without torch);
+# the default leaves the parameters, and so the keys of stored models, unchanged
+FORECAST_METHOD = os.environ.get("FORECAST_METHOD", "neuralprophet")
+if FORECAST_METHOD != "neuralprophet":
+    FORECAST_PARAMS["method"] = FORECAST_METHOD
+forecasts = ForecastRegistry(FORECAST_DIR, forecast_segments)
+
+def load_dataset():
+    if STORAGE_BACKEND == "sql":
+        # Imported here so the default backend never loads SQLAlchemy
+        from order_store import OrderStore
+
+        # Orders ingested once into one database file shared by every worker
+        sales = OrderStore.open(ORDERS_CSV, os.environ.get("ORDERS_DB_URL"))
+    else:
+        # Typed, memory-mapped cache (categorical dimensions, float32 measures),
+        # rebuilt only when the CSV changes; only the columns the app uses are read
+        df = load_orders(ORDERS_CSV, columns=ORDER_COLUMNS)
+
+        # Encoded dimensions with per-value row bitmaps, the (Region, Category,
+        # month) cube and the drill-down rollups serve every callback
+        with timed("index_build"):
+            sales = FilterIndex.from_frame(df)
+
+    # One model per (Region, Category) series plus the "All" marginals, fitted
+    # across a process pool; loaded from disk if an earlier run already trained
+    # them, otherwise trained without blocking startup
+    return sales, forecasts.ensure(sales.segments("Sales"), FORECAST_PARAMS)
+
+# Spawned pool workers re-import this script as __mp_main__ and need none of it
+if __name__ != "__mp_main__":
+    dataset = ThreadPoolExecutor(max_workers=1, thread_name_prefix="dataset").submit(load_dataset)
+    if not FAST_STARTUP:
+        dataset.result()
+
+def get_sales():
+    """Sales queries: a ``FilterIndex`` or, with ``STORAGE_BACKEND=sql``, an ``OrderStore``."""
+    return dataset.result()[0]
+
+def get_forecast_key():
+    return dataset.result()[1]
+
+# Rendered results by (inputs, dataset version); CALLBACK_CACHE_DIR adds a
+# SQLite tier shared by every worker on the host
+CALLBACK_CACHE_DIR = os.environ.get("CALLBACK_CACHE_DIR")
+callback_cache = CallbackCache(
+    path=os.path.join(CALLBACK_CACHE_DIR, "callbacks.sqlite") if CALLBACK_CACHE_DIR else None
+)
+DATASET_VERSION = json.dumps(source_key(ORDERS_CSV))
+
+def dataset_version():
+    return DATASET_VERSION
+
+def forecast_version():
+    return DATASET_VERSION, get_forecast_key(), forecasts.status(get_forecast_key())
+
+# ===============================
+# 3. Figures & KPI Cards (filter index or SQL aggregates)
+# ===============================
+CARD_STYLE = {"border": "1px solid #ccc", "padding": "10px", "borderRadius": "10px", "width": "30%", "textAlign": "center"}
+FILTER_STYLE = {"width": "24%", "display": "inline-block", "marginRight": "1%"}
+HOVER = "%{x|%b %Y}: $%{y:.2f}"
+DEFAULT_HORIZON = 12
+THEMES = {"light": pio.templates["plotly"], "dark": pio.templates["plotly_dark"]}
+
+# One dropdown per dimension; callbacks receive their values in DIMENSIONS order
+FILTER_IDS = {dim: f"{dim.lower().replace('_', '-')}-filter" for dim in DIMENSIONS}
+FILTER_INPUTS = [Input(FILTER_IDS[dim], "value") for dim in DIMENSIONS]
+# Drill-down charts: clicking a parent bar (Market, Category) shows its children
+DRILL_IDS = {"Market": "market-drill", "Category": "category-drill"}
+DRILL_MEASURES = {"Market": "Sales", "Category": "Profit"}
+
+def label(dim):
+    return dim.replace("_", " ")
+
+def plural(dim):
+    name = label(dim)
+    return name[:-1] + "ies" if name.endswith("y") else name + "s"
+
+def filters_of(values):
+    return dict(zip(DIMENSIONS, values))
+
+def kpi_values(*values):
+    # KPI values (no row-level filtering in Python), as (title, text) pairs
+    kpis = get_sales().kpis(filters_of(values))
+    return [
+        ("Total Sales", f"${kpis['total_sales']:,.0f}"),
+        ("Total Profit", f"${kpis['total_profit']:,.0f}"),
+        ("Avg Order Value", f"${kpis['avg_order']:,.2f}"),
+    ]
+
+@callback_cache.memoize(version=dataset_version)
+@timed("figure_build", figure="kpi_cards")
+def kpi_cards(*values):
+    return [
+        html.Div([
+            html.H4(title),
+            html.P(text)
+        ], style=CARD_STYLE)
+        for title, text in kpi_values(*values)
+    ]
+
+@callback_cache.memoize(version=dataset_version)
+@timed("figure_build", figure="region")
+def region_figure(*values):
+    sales_region = get_sales().breakdown("Region", "Sales", filters_of(values))
+    return px.bar(sales_region, x="Region", y="Sales", title="Total Sales by Region")
+
+@callback_cache.memoize(version=dataset_version)
+@timed("figure_build", figure="category")
+def category_figure(*values):
+    profit_category = get_sales().breakdown("Category", "Profit", filters_of(values))
+    return px.bar(profit_category, x="Category", y="Profit", title="Total Profit by Category")
+
+def drill_level(parent, values):
+    """Bars of a drill-down chart: the parent's values, or the children of the selected one."""
+    filters = filters_of(values)
+    measure = DRILL_MEASURES[parent]
+    if filters[parent]:
+        dim, title = HIERARCHIES[parent], f"Total {measure} by {label(HIERARCHIES[parent])} in {filters[parent]}"
+    else:
+        dim, title = parent, f"Total {measure} by {label(parent)}"
+    return get_sales().breakdown(dim, measure, filters), dim, measure, title
+
+@callback_cache.memoize(version=dataset_version)
+@timed("figure_build", figure="drill")
+def drill_figure(parent, *values):
+    frame, dim, measure, title = drill_level(parent, values)
+    return px.bar(frame, x=dim, y=measure, title=title, labels={dim: label(dim)})
+
+def segment_filters(values):
+    """(region, category) of the precomputed forecast segment, or ``None`` if other filters are set."""
+    filters = filters_of(values)
+    if set(active_filters(filters)) - {"Region", "Category"}:
+        return None
+    return filters["Region"] or None, filters["Category"] or None
+
+def forecast_trace(values, horizon):
+    """Forecast trace properties plus the annotations to show with them."""
+    segment = segment_filters(values)
+    if segment is None:
+        note = "Forecasts cover Region × Category segments; clear the other filters to see one"
+        annotations = [dict(text=note, xref="paper", yref="paper", x=0.5, y=0.95, showarrow=False)]
+        return dict(x=[], y=[], name="Forecast"), annotations
+    artifact = forecasts.get(get_forecast_key())
+    if artifact is None:
+        status = forecasts.status(get_forecast_key())
+        note = "Forecast unavailable (training failed)" if status == "failed" else "Forecast warming up…"
+        annotations = [dict(text=note, xref="paper", yref="paper", x=0.5, y=0.95, showarrow=False)]
+        return dict(x=[], y=[], name="Forecast"), annotations
+
+    # Precomputed forecast of exactly this segment and horizon
+    forecast = artifact["forecast"].get((*segment, horizon))
+    if forecast is None:
+        return dict(x=[], y=[], name="Forecast"), []
+    return dict(x=forecast["ds"], y=forecast["yhat1"], name=f"Forecast ({artifact['method'][segment]})"), []
+
+@callback_cache.memoize(version=forecast_version)
+@timed("figure_build", figure="forecast")
+def forecast_figure(horizon, *values):
+    # Always two traces (actual, forecast) so callbacks can patch them in place
+    actual = get_sales().monthly("Sales", filters_of(values))
+    trace, annotations = forecast_trace(values, horizon)
+    fig3 = go.Figure()
+    fig3.add_trace(go.Scatter(x=actual["ds"], y=actual["y"], mode="lines+markers",
+                              name="Actual", hovertemplate=HOVER))
+    fig3.add_trace(go.Scatter(mode="lines+markers", hovertemplate=HOVER, **trace))
+    fig3.update_layout(title="Sales Forecast", xaxis_title="Date", yaxis_title="Sales", annotations=annotations)
+    return fig3
+
+def forecast_ready():
+    return forecasts.status(get_forecast_key()) != "training"
+
+# ===============================
+# 4. Dash App Layout
+# ===============================
+app = Dash(__name__)
+server = app.server  # WSGI entry point, e.g. gunicorn global_superstore_dashboard:server
+
+def filter_dropdown(dim, sales):
+    return html.Div([
+        html.Label(f"Select {label(dim)}:"),
+        dcc.Dropdown(
+            id=FILTER_IDS[dim],
+            options=[{"label": v, "value": v} for v in sales.values(dim)],
+            value=None,
+            placeholder=f"All {plural(dim)}"
+        )
+    ], style=FILTER_STYLE)
+
+# Built per page load so a freshly trained forecast shows without waiting for a poll
+def serve_layout():
+    sales = get_sales()
+    unfiltered = [None] * len(DIMENSIONS)
+    return html.Div([
+        html.H1("📊 Global Superstore Dashboard", style={"textAlign": "center"}),
+
+        # Filters (options narrow to the values compatible with the other filters)
+        html.Div([filter_dropdown(dim, sales) for dim in DIMENSIONS], style={"marginBottom": "10px"}),
+        html.Div([
+            html.Div([
+                html.Label("Forecast Horizon (months):"),
+                dcc.Dropdown(
+                    id="forecast-horizon",
+                    options=[{"label": str(h), "value": h} for h in HORIZONS],
+                    value=DEFAULT_HORIZON
+                )
+            ], style=FILTER_STYLE),
+
+            html.Div([
+                html.Label("Mode:"),
+                dcc.RadioItems(
+                    id="mode-switch",
+                    options=[{"label": "Light", "value": "light"}, {"label": "Dark", "value": "dark"}],
+                    value="light",
+                    inline=True
+                )
+            ], style={"width": "24%", "display": "inline-block"})
+        ], style={"marginBottom": "20px"}),
+        dcc.Store(id="theme-templates", data={mode: t.to_plotly_json() for mode, t in THEMES.items()}),
+
+        # KPI cards
+        html.Div(kpi_cards(*unfiltered), id="kpi-cards", style={"display": "flex", "justifyContent": "space-around", "marginBottom": "20px"}),
+
+        # Tabs
+        dcc.Tabs([
+            dcc.Tab(label="Sales by Region", children=[dcc.Graph(id="sales-region", figure=region_figure(*unfiltered))]),
+            dcc.Tab(label="Profit by Category", children=[dcc.Graph(id="profit-category", figure=category_figure(*unfiltered))]),
+            dcc.Tab(label="Drill-down", children=[
+                html.P("Click a bar to drill into it; clear the Market or Category filter to go back up."),
+                *(dcc.Graph(id=DRILL_IDS[parent], figure=drill_figure(parent, *unfiltered)) for parent in DRILL_IDS)
+            ]),
+            dcc.Tab(label="Sales Forecast", children=[
+                dcc.Graph(id="sales-forecast", figure=forecast_figure(DEFAULT_HORIZON, *unfiltered)),
+                html.Button("Export Forecast PNG", id="export-btn"),
+                # Re-renders the forecast until the background model is ready
+                dcc.Interval(id="forecast-poll", interval=5000, disabled=forecast_ready())
+            ])
+        ])
+    ])
+
+app.layout = serve_layout
+
+# ===============================
+# 5. Callbacks (one per output group, partial updates)
+# ===============================
+# Theme switch never reaches the server: it only patches layout.template
+app.clientside_callback(
+    """
+    function(mode, templates) {
+        const template = templates[mode];
+        return [0, 1, 2, 3, 4].map(() => new dash_clientside.Patch().assign(["layout", "template"], template).build());
+    }
+    """,
+    Output("sales-region", "figure", allow_duplicate=True),
+    Output("profit-category", "figure", allow_duplicate=True),
+    Output("market-drill", "figure", allow_duplicate=True),
+    Output("category-drill", "figure", allow_duplicate=True),
+    Output("sales-forecast", "figure", allow_duplicate=True),
+    Input("mode-switch", "value"),
+    State("theme-templates", "data"),
+    prevent_initial_call=True
+)
+
+@callback_cache.memoize(version=dataset_version)
+@timed("figure_build", figure="filter_options")
+def filter_options(trigger, *values):
+    """Dropdown options and kept values after a filter change, resolved from the index.
+
+    The changed filter wins: every other selection is kept only if it still
+    has orders together with the selections kept before it.
+    """
+    sales = get_sales()
+    selected = filters_of(values)
+    kept = {trigger: selected[trigger]} if trigger in selected else {}
+    for dim in DIMENSIONS:
+        if dim not in kept:
+            value = selected[dim]
+            kept[dim] = value if value and value in sales.options(dim, kept) else None
+    options = [[{"label": v, "value": v} for v in sales.options(dim, kept)] for dim in DIMENSIONS]
+    return options, [kept[dim] for dim in DIMENSIONS]
+
+@app.callback(
+    [Output(FILTER_IDS[dim], "options") for dim in DIMENSIONS],
+    [Output(FILTER_IDS[dim], "value", allow_duplicate=True) for dim in DIMENSIONS],
+    *FILTER_INPUTS,
+    prevent_initial_call=True
+)
+def update_filter_options(*values):
+    trigger = next((dim for dim, id_ in FILTER_IDS.items() if id_ == ctx.triggered_id), None)
+    options, kept = filter_options(trigger, *values)
+    # Only cleared selections are sent back, so unchanged filters trigger nothing
+    return [*options, *(no_update if new == old else new for new, old in zip(kept, values))]
+
+@app.callback(
+    [Output(FILTER_IDS[dim], "value", allow_duplicate=True) for pair in HIERARCHIES.items() for dim in pair],
+    [Input(DRILL_IDS[parent], "clickData") for parent in HIERARCHIES],
+    prevent_initial_call=True
+)
+def drill_down(*clicks):
+    # A parent bar selects that parent (clearing its child); a child bar selects the child
+    updates = []
+    for (parent, child), click in zip(HIERARCHIES.items(), clicks):
+        if ctx.triggered_id != DRILL_IDS[parent] or not click:
+            updates += [no_update, no_update]
+            continue
+        bar = click["points"][0]["x"]
+        if bar in get_sales().values(parent):
+            updates += [bar, None]
+        else:
+            updates += [no_update, bar]
+    return updates
+
+@app.callback(
+    Output("kpi-cards", "children"),
+    *FILTER_INPUTS,
+    prevent_initial_call=True
+)
+def update_kpis(*values):
+    return kpi_cards(*values)
+
+@callback_cache.memoize(version=dataset_version)
+@timed("patch_build", figure="region")
+def region_patch(*values):
+    # Only the bar data is re-sent; layout (and the current theme) stays
+    sales_region = get_sales().breakdown("Region", "Sales", filters_of(values))
+    patch = Patch()
+    patch["data"][0]["x"] = sales_region["Region"]
+    patch["data"][0]["y"] = sales_region["Sales"]
+    return patch
+
+@app.callback(
+    Output("sales-region", "figure"),
+    *FILTER_INPUTS,
+    prevent_initial_call=True
+)
+def update_region_chart(*values):
+    return region_patch(*values)
+
+@callback_cache.memoize(version=dataset_version)
+@timed("patch_build", figure="category")
+def category_patch(*values):
+    profit_category = get_sales().breakdown("Category", "Profit", filters_of(values))
+    patch = Patch()
+    patch["data"][0]["x"] = profit_category["Category"]
+    patch["data"][0]["y"] = profit_category["Profit"]
+    return patch
+
+@app.callback(
+    Output("profit-category", "figure"),
+    *FILTER_INPUTS,
+    prevent_initial_call=True
+)
+def update_category_chart(*values):
+    return category_patch(*values)
+
+@callback_cache.memoize(version=dataset_version)
+@timed("patch_build", figure="drill")
+def drill_patch(parent, *values):
+    frame, dim, measure, title = drill_level(parent, values)
+    patch = Patch()
+    patch["data"][0]["x"] = frame[dim]
+    patch["data"][0]["y"] = frame[measure]
+    patch["layout"]["title"]["text"] = title
+    patch["layout"]["xaxis"]["title"]["text"] = label(dim)
+    return patch
+
+@app.callback(
+    Output("market-drill", "figure"),
+    Output("category-drill", "figure"),
+    *FILTER_INPUTS,
+    prevent_initial_call=True
+)
+def update_drill_charts(*values):
+    return [drill_patch(parent, *values) for parent in DRILL_IDS]
+
+@callback_cache.memoize(version=forecast_version)
+@timed("patch_build", figure="forecast")
+def forecast_patch(horizon, with_actual, *values):
+    patch = Patch()
+    if with_actual:
+        actual = get_sales().monthly("Sales", filters_of(values))
+        patch["data"][0]["x"] = actual["ds"]
+        patch["data"][0]["y"] = actual["y"]
+    trace, annotations = forecast_trace(values, horizon)
+    for prop, value in trace.items():
+        patch["data"][1][prop] = value
+    patch["layout"]["annotations"] = annotations
+    return patch
+
+@app.callback(
+    Output("sales-forecast", "figure"),
+    Output("forecast-poll", "disabled"),
+    *FILTER_INPUTS,
+    Input("forecast-horizon", "value"),
+    Input("forecast-poll", "n_intervals"),
+    prevent_initial_call=True
+)
+def update_forecast(*args):
+    *values, horizon, _poll = args
+    ready = forecast_ready()
+    if ctx.triggered_id == "forecast-poll" and not ready:
+        return no_update, False
+    # Horizon changes and the poll only touch the forecast trace
+    with_actual = ctx.triggered_id in FILTER_IDS.values()
+    return forecast_patch(horizon, with_actual, *values), ready
+
+# Hit/miss counters per cached function
+@server.route("/_callback_cache")
+def callback_cache_stats():
+    return callback_cache.stats()
+
+# ===============================
+# 6. Metrics & Opt-in Profiling
+# ===============================
+@metrics.collector
+def cache_metrics():
+    stats = callback_cache.stats()
+    rows = [("cache_entries", "gauge", "Entries held per cache", {"cache": "callback"}, stats["entries"])]
+    for function, counts in stats["functions"].items():
+        for result, key in (("hit", "hits"), ("miss", "misses")):
+            rows.append(("cache_requests_total", "counter", "Cache lookups by result",
+                         {"cache": "callback", "function": function, "result": result}, counts[key]))
+    rows.append(("forecast_ready", "gauge", "1 once the segment forecasts are available", {},
+                 float(forecasts.status(get_forecast_key()) == "ready")))
+    return rows
+
+@server.route("/metrics")
+def prometheus_metrics():
+    return metrics.render(), 200, {"Content-Type": CONTENT_TYPE}
+
+# Every request is timed; PROFILE_DIR dumps the first slow one(s) as flame data
+server.wsgi_app = instrument_wsgi(server.wsgi_app, RequestProfiler.from_env())
+
+# Optionally render every filter combination up front (CALLBACK_CACHE_WARM=1)
+if os.environ.get("CALLBACK_CACHE_WARM") == "1" and __name__ != "__mp_main__":
+    # Region x Category (the forecast segments); other filters are rendered on demand
+    grids = [[None, *get_sales().values(dim)] if dim in ("Region", "Category") else [None] for dim in DIMENSIONS]
+    for builder in (kpi_cards, region_patch, category_patch, region_figure, category_figure):
+        callback_cache.warm(builder, *grids)
+    for builder in (drill_patch, drill_figure):
+        callback_cache.warm(builder, list(DRILL_IDS), *grids)
+    if forecast_ready():
+        callback_cache.warm(forecast_patch, HORIZONS, [True, False], *grids)
+        callback_cache.warm(forecast_figure, HORIZONS, *grids)
+
+# ===============================
+# 7. Run App
+# ===============================
+if __name__ == "__main__":
+    app.run(debug=False, port=int(os.environ.get("PORT", "8050")))
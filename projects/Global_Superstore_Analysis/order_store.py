@@ -0,0 +1,296 @@
+# ===============================
+# 🗄 Embedded SQL Order Store
+# ===============================
+"""Order lines in an embedded SQL database, aggregated by the database.
+
+The CSV is streamed once (per CSV size/mtime) into an ``orders`` table
+with every filter dimension indexed, plus Order_Date and an integer month
+bucket. Every dashboard query is then a parameterized ``GROUP BY`` pushed
+down to the database, so a worker holds no row-level data, all workers on a
+host share one file (and its page cache), and order histories larger than
+RAM work. ``OrderStore`` answers the same filter-dict calls as
+``FilterIndex`` (``options``, ``kpis``, ``breakdown``, ``monthly``,
+``segments``), so the dashboard can use either. Connections come from
+SQLAlchemy's per-process pool; any SQLAlchemy URL works (SQLite by default,
+DuckDB via ``duckdb_engine``). Workers starting together ingest under an
+exclusive file lock, so only the first one streams the CSV.
+"""
+
+import json
+import os
+import weakref
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: a byte-range lock on the same file instead
+    fcntl = None
+    import msvcrt
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import (Column, Date, Float, Index, Integer, MetaData, String, Table, create_engine, delete,
+                        event, func, insert, inspect, select, text)
+
+from filter_index import DIMENSIONS, HIERARCHIES, active_filters, month_series
+from instrumentation import count, timed
+from superstore_cache import CACHE_DIRNAME, DTYPES, ENCODING, column_name, parse_dates, source_key
+
+SOURCE_COLUMNS = ["Order Date", *(d.replace("_", " ") for d in DIMENSIONS), "Sales", "Profit"]
+DEFAULT_CHUNKSIZE = 200_000
+# bumped whenever the table layout changes, forcing one re-ingest
+SCHEMA_VERSION = 2
+
+
+def _orders_table(name, metadata):
+    return Table(
+        name, metadata,
+        Column("Order_Date", Date, nullable=False),
+        Column("Month", Integer, nullable=False),  # year * 12 + month - 1
+        *(Column(dim, String, nullable=False) for dim in DIMENSIONS),
+        Column("Sales", Float, nullable=False),
+        Column("Profit", Float, nullable=False),
+    )
+
+
+def _bulk_insert(conn, table, frame):
+    # driver-level executemany of plain tuples: SQLAlchemy's per-row parameter
+    # processing would cost several times the insert itself
+    compiled = insert(table).compile(dialect=conn.dialect)
+    names = list(compiled.positiontup) if compiled.positional else list(frame.columns)
+    columns = [frame[name].tolist() for name in names]
+    rows = list(zip(*columns)) if compiled.positional else [dict(zip(names, row)) for row in zip(*columns)]
+    conn.exec_driver_sql(str(compiled), rows)
+
+
+# pooled connections must not be shared with forked (e.g. gunicorn) workers
+_ENGINES = weakref.WeakSet()
+
+
+def _dispose_engines():
+    for engine in list(_ENGINES):
+        engine.dispose(close=False)
+
+
+if hasattr(os, "register_at_fork"):  # POSIX only; nothing forks on Windows
+    os.register_at_fork(after_in_child=_dispose_engines)
+
+
+def _sqlite_pragmas(dbapi_connection, _record):
+    cursor = dbapi_connection.cursor()
+    # readers never block the (rare) re-ingest; workers map the same file pages
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA mmap_size=1073741824")
+    cursor.close()
+
+
+def store_key(csv_path):
+    """Fingerprint an up-to-date store records for ``csv_path``."""
+    return {**source_key(csv_path), "schema": SCHEMA_VERSION}
+
+
+def _cache_file(csv_path, suffix):
+    cache_dir = os.path.join(os.path.dirname(os.path.abspath(csv_path)), CACHE_DIRNAME)
+    os.makedirs(cache_dir, exist_ok=True)
+    return os.path.join(cache_dir, os.path.splitext(os.path.basename(csv_path))[0] + suffix)
+
+
+def default_url(csv_path):
+    """SQLite file next to the Arrow cache of ``csv_path``."""
+    return "sqlite:///" + _cache_file(csv_path, ".sqlite")
+
+
+def _lock_file(f):
+    if fcntl is not None:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        return
+    while True:
+        try:
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            return
+        except OSError:
+            pass  # LK_LOCK gives up after ten one-second retries; keep waiting
+
+
+def _unlock_file(f):
+    if fcntl is not None:
+        fcntl.flock(f, fcntl.LOCK_UN)
+    else:
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+@contextmanager
+def _ingest_lock(csv_path):
+    """Exclusive lock on ingesting ``csv_path``, held across processes (released if the holder dies)."""
+    # "a+" keeps the file; byte-range locks (Windows) need the position at byte 0
+    with open(_cache_file(csv_path, ".ingest.lock"), "a+") as f:
+        f.seek(0)
+        _lock_file(f)
+        try:
+            yield
+        finally:
+            _unlock_file(f)
+
+
+class OrderStore:
+    """``FilterIndex``-compatible queries over an SQL ``orders`` table."""
+
+    def __init__(self, url):
+        self.engine = create_engine(url)
+        if self.engine.dialect.name == "sqlite":
+            event.listen(self.engine, "connect", _sqlite_pragmas)
+        _ENGINES.add(self.engine)
+        self.metadata = MetaData()
+        self.orders = _orders_table("orders", self.metadata)
+        self.meta = Table("store_meta", self.metadata, Column("key", String, primary_key=True),
+                          Column("value", String))
+        self._dimensions = {}
+
+    @classmethod
+    def open(cls, csv_path, url=None):
+        """Store for ``csv_path``, (re)ingesting it only if the CSV changed."""
+        store = cls(url or default_url(csv_path))
+        if store.source() != store_key(csv_path):
+            store.ingest(csv_path)
+        return store
+
+    def source(self):
+        """Fingerprint of the ingested CSV, or ``None``."""
+        if not inspect(self.engine).has_table(self.meta.name):
+            return None
+        with self.engine.connect() as conn:
+            value = conn.execute(select(self.meta.c.value).where(self.meta.c.key == "source")).scalar()
+        return json.loads(value) if value else None
+
+    # -------------------------------
+    # Ingest
+    # -------------------------------
+    def ingest(self, csv_path, chunksize=DEFAULT_CHUNKSIZE):
+        """Stream ``csv_path`` into a staging table, then swap it in with the indexes.
+
+        Skipped when another process finished the same ingest while this one
+        waited for the lock.
+        """
+        with _ingest_lock(csv_path):
+            if self.source() != store_key(csv_path):
+                self._ingest(csv_path, chunksize)
+
+    @timed("sql_ingest")
+    def _ingest(self, csv_path, chunksize):
+        key = store_key(csv_path)
+        staging = _orders_table(f"orders_staging_{os.getpid()}", MetaData())
+        dtypes = {c: DTYPES[c] for c in SOURCE_COLUMNS if c in DTYPES}
+        with self.engine.begin() as conn:
+            staging.drop(conn, checkfirst=True)
+            staging.create(conn)
+            for chunk in pd.read_csv(csv_path, encoding=ENCODING, usecols=SOURCE_COLUMNS, dtype=dtypes,
+                                     chunksize=chunksize):
+                chunk.columns = [column_name(c) for c in chunk.columns]
+                dates = parse_dates(chunk["Order_Date"])
+                chunk["Order_Date"] = np.datetime_as_string(dates.to_numpy(), unit="D")
+                chunk["Month"] = dates.dt.year * 12 + dates.dt.month - 1
+                _bulk_insert(conn, staging, chunk.astype({dim: str for dim in DIMENSIONS}))
+                count("rows_processed_total", len(chunk), stage="sql_ingest")
+
+            self.orders.drop(conn, checkfirst=True)
+            conn.execute(text(f'ALTER TABLE "{staging.name}" RENAME TO "{self.orders.name}"'))
+            # one index per filter dimension, the drill-down paths and the forecast segments
+            for columns in ([[d] for d in DIMENSIONS] + [list(p) for p in HIERARCHIES.items()]
+                            + [["Order_Date"], ["Region", "Category", "Month"]]):
+                name = "_".join(columns).lower().replace("-", "_")
+                Index(f"ix_orders_{name}", *(self.orders.c[c] for c in columns)).create(conn)
+            self.meta.create(conn, checkfirst=True)
+            conn.execute(delete(self.meta).where(self.meta.c.key == "source"))
+            conn.execute(insert(self.meta).values(key="source", value=json.dumps(key)))
+        self._dimensions = {}
+
+    # -------------------------------
+    # Pushed-down queries
+    # -------------------------------
+    def _rows(self, query):
+        with self.engine.connect() as conn:
+            return conn.execute(query).all()
+
+    def _where(self, query, filters, exclude=None):
+        for dim, selected in active_filters(filters).items():
+            if dim != exclude:
+                query = query.where(self.orders.c[dim].in_(selected))
+        return query
+
+    def values(self, dim):
+        if dim not in self._dimensions:
+            column = self.orders.c[dim]
+            self._dimensions[dim] = [v for (v,) in self._rows(select(column).distinct().order_by(column))]
+        return list(self._dimensions[dim])
+
+    @property
+    def regions(self):
+        return self.values("Region")
+
+    @property
+    def categories(self):
+        return self.values("Category")
+
+    @timed("sql_query", query="options")
+    def options(self, dim, filters=None):
+        """Values of ``dim`` that still have orders under the filters on the other dimensions."""
+        if not any(d != dim for d in active_filters(filters)):
+            return self.values(dim)
+        column = self.orders.c[dim]
+        return [v for (v,) in self._rows(self._where(select(column).distinct().order_by(column), filters, dim))]
+
+    @timed("sql_query", query="kpis")
+    def kpis(self, filters=None):
+        o = self.orders.c
+        sales, profit, orders = self._rows(self._where(
+            select(func.coalesce(func.sum(o.Sales), 0.0), func.coalesce(func.sum(o.Profit), 0.0), func.count()),
+            filters))[0]
+        return {
+            "total_sales": sales,
+            "total_profit": profit,
+            "avg_order": sales / orders if orders else 0,
+        }
+
+    @timed("sql_query", query="breakdown")
+    def breakdown(self, dim, measure, filters=None):
+        """Totals of ``measure`` per value of ``dim`` present in the filtered orders."""
+        column = self.orders.c[dim]
+        rows = self._rows(self._where(
+            select(column, func.sum(self.orders.c[measure])).group_by(column).order_by(column), filters))
+        return pd.DataFrame(rows, columns=[dim, measure])
+
+    @timed("sql_query", query="monthly")
+    def monthly(self, measure="Sales", filters=None):
+        """``ds``/``y`` month-start series from the first to last month with orders."""
+        o = self.orders.c
+        rows = self._rows(self._where(
+            select(o.Month, func.sum(o[measure])).group_by(o.Month).order_by(o.Month), filters))
+        months = np.array([r[0] for r in rows], dtype=np.int64)
+        return month_series(months, np.array([r[1] for r in rows], dtype=np.float64))
+
+    @timed("sql_query", query="segments")
+    def segments(self, measure="Sales"):
+        """Monthly series of every (region, category) pair, ``None`` standing for "All".
+
+        One grouped query; the "All" marginals are summed from its result.
+        """
+        o = self.orders.c
+        cells = pd.DataFrame(
+            self._rows(select(o.Region, o.Category, o.Month, func.sum(o[measure]))
+                       .group_by(o.Region, o.Category, o.Month)),
+            columns=["Region", "Category", "Month", "y"],
+        )
+        result = {}
+        for region in [None, *self.regions]:
+            for category in [None, *self.categories]:
+                subset = cells
+                if region:
+                    subset = subset[subset["Region"] == region]
+                if category:
+                    subset = subset[subset["Category"] == category]
+                if subset.empty:
+                    continue
+                monthly = subset.groupby("Month")["y"].sum()
+                result[region, category] = month_series(monthly.index.to_numpy(), monthly.to_numpy())
+        return result
@@ -0,0 +1,116 @@
+# ===============================
+# 🧊 Sales Filter Cube
+# ===============================
+"""Sales, profit and order counts pre-aggregated by (Region, Category, month).
+
+The order table is reduced once at startup into dense arrays with one extra
+"All" slot on the region and category axes holding the marginals, so every
+filter combination of the dashboard is an array slice. Callbacks never touch
+row-level data and their cost depends only on the number of regions,
+categories and months, not on the number of orders.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class SalesCube:
+    """Dense ``(regions + 1, categories + 1, months)`` arrays per measure.
+
+    Index ``-1`` on the region and category axes is the "All" marginal;
+    ``Orders`` counts order lines, matching the row counts of the table.
+    """
+
+    def __init__(self, regions, categories, months, values):
+        self.regions = list(regions)
+        self.categories = list(categories)
+        self.months = pd.DatetimeIndex(months)
+        self.values = values
+
+    @classmethod
+    def from_frame(cls, df, date="Order_Date", region="Region", category="Category"):
+        r_codes, regions = pd.factorize(df[region], sort=True)
+        c_codes, categories = pd.factorize(df[category], sort=True)
+        dates = df[date].dt
+        month_number = (dates.year * 12 + dates.month - 1).to_numpy(dtype=np.int64)
+        first = int(month_number.min())
+        m_codes = month_number - first
+        n_months = int(m_codes.max()) + 1
+        months = pd.date_range(pd.Timestamp(first // 12, first % 12 + 1, 1), periods=n_months, freq="MS")
+
+        shape = (len(regions) + 1, len(categories) + 1, n_months)
+        flat = (r_codes * shape[1] + c_codes) * n_months + m_codes
+        size = shape[0] * shape[1] * n_months
+        weights = {
+            "Sales": df["Sales"].to_numpy(dtype=np.float64),
+            "Profit": df["Profit"].to_numpy(dtype=np.float64),
+            "Orders": None,
+        }
+        values = {}
+        for name, w in weights.items():
+            cube = np.bincount(flat, weights=w, minlength=size).astype(np.float64).reshape(shape)
+            # "All" marginals in the extra last slot of each filter axis
+            cube[-1] = cube[:-1].sum(axis=0)
+            cube[:, -1] = cube[:, :-1].sum(axis=1)
+            values[name] = cube
+        return cls(regions, categories, months, values)
+
+    def _index(self, region=None, category=None):
+        ri = self.regions.index(region) if region else -1
+        ci = self.categories.index(category) if category else -1
+        return ri, ci
+
+    def cell(self, measure, region=None, category=None):
+        """Monthly series of ``measure`` for one filter combination."""
+        ri, ci = self._index(region, category)
+        return self.values[measure][ri, ci]
+
+    def kpis(self, region=None, category=None):
+        sales = self.cell("Sales", region, category).sum()
+        profit = self.cell("Profit", region, category).sum()
+        orders = self.cell("Orders", region, category).sum()
+        return {
+            "total_sales": sales,
+            "total_profit": profit,
+            "avg_order": sales / orders if orders else 0,
+        }
+
+    def by_region(self, measure, region=None, category=None):
+        """Totals per region present in the filtered orders."""
+        _, ci = self._index(region, category)
+        return self._breakdown("Region", self.regions, measure, self.values[measure][:-1, ci],
+                               self.values["Orders"][:-1, ci], region)
+
+    def by_category(self, measure, region=None, category=None):
+        """Totals per category present in the filtered orders."""
+        ri, _ = self._index(region, category)
+        return self._breakdown("Category", self.categories, measure, self.values[measure][ri, :-1],
+                               self.values["Orders"][ri, :-1], category)
+
+    @staticmethod
+    def _breakdown(label, names, measure, values, orders, selected):
+        keep = orders.sum(axis=1) > 0
+        if selected:
+            keep &= np.asarray(names) == selected
+        return pd.DataFrame({
+            label: np.asarray(names, dtype=object)[keep],
+            measure: values.sum(axis=1)[keep],
+        })
+
+    def monthly(self, measure="Sales", region=None, category=None):
+        """``ds``/``y`` month-start series from the first to last month with orders."""
+        orders = self.cell("Orders", region, category)
+        active = np.flatnonzero(orders)
+        if len(active) == 0:
+            return pd.DataFrame({"ds": pd.DatetimeIndex([]), "y": np.empty(0)})
+        span = slice(active[0], active[-1] + 1)
+        return pd.DataFrame({"ds": self.months[span], "y": self.cell(measure, region, category)[span]})
+
+    def segments(self, measure="Sales"):
+        """Monthly series of every (region, category) pair, ``None`` standing for "All"."""
+        return {
+            (region, category): self.monthly(measure, region, category)
+            for region in [None, *self.regions]
+            for category in [None, *self.categories]
+            if self.cell("Orders", region, category).any()
+        }
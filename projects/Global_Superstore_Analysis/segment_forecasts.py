@@ -0,0 +1,103 @@
+# ===============================
+# 📈 Per-Segment Batch Forecasts
+# ===============================
+"""One forecast per (Region, Category) monthly series, trained in parallel.
+
+Every segment of the sales cube, including the "All" marginals, gets its own
+NeuralProphet model; fits run in a process pool across all cores, each worker
+limited to one torch thread so they do not oversubscribe the CPU. Series too
+short for yearly seasonality (or whose fit fails) fall back to a vectorized
+seasonal-naive forecast; ``"method": "seasonal-naive"`` in the parameters uses
+it for every segment, in-process and without importing torch. Results are
+materialized for every dashboard horizon so a callback only does a
+dictionary lookup.
+"""
+
+import logging
+import os
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+import numpy as np
+import pandas as pd
+
+from instrumentation import metrics, timed
+
+HORIZONS = (6, 12, 24)
+SEASON = 12
+MIN_MONTHS = 2 * SEASON  # two full cycles before yearly seasonality is fitted
+METHODS = ("neuralprophet", "seasonal-naive")
+
+
+def seasonal_naive(series, horizon, season=SEASON):
+    """Repeat the last ``season`` months (or the last value for shorter series)."""
+    y = series["y"].to_numpy(dtype=np.float64)
+    last = y[-season:] if len(y) >= season else y[-1:]
+    ds = pd.date_range(series["ds"].iloc[-1], periods=horizon + 1, freq="MS")[1:]
+    return pd.DataFrame({"ds": ds, "yhat1": np.resize(last, horizon)})
+
+
+def fit_segment(series, params, horizon, method="neuralprophet"):
+    """``(model, forecast, method)`` for one series; runs inside a pool worker."""
+    if method == "neuralprophet" and len(series) >= MIN_MONTHS:
+        try:
+            import torch
+            from neuralprophet import NeuralProphet
+
+            torch.set_num_threads(1)
+            warnings.filterwarnings("ignore")
+            logging.getLogger("neuralprophet").setLevel(logging.ERROR)
+            logging.getLogger("NP").setLevel(logging.ERROR)
+
+            m = NeuralProphet(**params)
+            m.fit(series, freq="MS", checkpointing=False)
+            future = m.make_future_dataframe(series, periods=horizon)
+            forecast = m.predict(future)[["ds", "yhat1"]].reset_index(drop=True)
+            return m, forecast, "NeuralProphet"
+        except Exception:
+            logging.getLogger(__name__).exception("NeuralProphet fit failed; using seasonal naive")
+    return None, seasonal_naive(series, horizon), "seasonal naive"
+
+
+def _timed_fit(series, params, horizon, method):
+    # metrics do not cross processes, so the worker reports its own fit time
+    started = time.perf_counter()
+    return (*fit_segment(series, params, horizon, method), time.perf_counter() - started)
+
+
+@timed("forecast_training")
+def forecast_segments(segments, params, max_workers=None):
+    """Fit every segment in parallel.
+
+    ``segments`` maps ``(region, category)`` (``None`` for "All") to a
+    ``ds``/``y`` frame; ``params`` holds the NeuralProphet ``"model"``
+    arguments, the ``"horizons"`` to materialize and optionally the
+    ``"method"`` (one of ``METHODS``). Returns the artifact
+    ``{"models", "method", "forecast"}`` where ``forecast`` is keyed by
+    ``(region, category, horizon)``.
+    """
+    horizons = params["horizons"]
+    method = params.get("method", "neuralprophet")
+    if method not in METHODS:
+        raise ValueError(f"Unknown forecast method {method!r}; expected one of {METHODS}")
+    keys = list(segments)
+    jobs = [(segments[key], params["model"], max(horizons), method) for key in keys]
+    if method == "seasonal-naive":
+        results = [_timed_fit(*job) for job in jobs]
+    else:
+        workers = min(max_workers or os.cpu_count() or 1, len(keys)) or 1
+        # spawn keeps workers independent of the serving process's threads
+        with ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn")) as pool:
+            futures = [pool.submit(_timed_fit, *job) for job in jobs]
+            results = [future.result() for future in futures]
+
+    artifact = {"models": {}, "method": {}, "forecast": {}}
+    for (region, category), (model, forecast, method, seconds) in zip(keys, results):
+        metrics.observe("stage_duration_seconds", seconds, stage="forecast_fit", method=method)
+        artifact["models"][region, category] = model
+        artifact["method"][region, category] = method
+        for horizon in horizons:
+            artifact["forecast"][region, category, horizon] = forecast.iloc[:horizon]
+    return artifact
@@ -0,0 +1,133 @@
+# ===============================
+# 🗃 Superstore Columnar Ingest Cache
+# ===============================
+"""Convert ``Global_Superstore2.csv`` into a typed Arrow IPC (Feather v2) cache.
+
+The CSV is parsed once with explicit types: text dimensions become
+categoricals (dictionary-encoded on disk), dates use a fixed format instead
+of per-value inference, measures are float32 and counts small integers.
+Column names get the dashboard's underscore form. The cache is written
+uncompressed so workers memory-map only the columns they project, and it is
+keyed on the CSV's size and mtime so replacing the CSV triggers one re-ingest.
+"""
+
+import json
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from instrumentation import count, timed
+
+CACHE_VERSION = 1
+CACHE_DIRNAME = ".superstore_cache"
+METADATA_KEY = b"superstore_source"
+ENCODING = "ISO-8859-1"
+DATE_FORMAT = "%d-%m-%Y"
+
+DATES = ["Order Date", "Ship Date"]
+DIMENSIONS = [
+    "Order ID", "Ship Mode", "Customer ID", "Customer Name", "Segment", "City", "State",
+    "Country", "Market", "Region", "Product ID", "Category", "Sub-Category", "Product Name",
+    "Order Priority",
+]
+DTYPES = {
+    **{c: "category" for c in DIMENSIONS},
+    "Row ID": "int32",
+    "Postal Code": "float32",
+    "Sales": "float32",
+    "Quantity": "int16",
+    "Discount": "float32",
+    "Profit": "float32",
+    "Shipping Cost": "float32",
+}
+
+
+def column_name(name):
+    return name.strip().replace(" ", "_")
+
+
+def source_key(csv_path):
+    """Fingerprint of the source CSV that the cache must match."""
+    st = os.stat(csv_path)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "version": CACHE_VERSION}
+
+
+def cache_path_for(csv_path, cache_dir=None):
+    """Location of the columnar cache for ``csv_path``."""
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(os.path.abspath(csv_path)), CACHE_DIRNAME)
+    name = os.path.splitext(os.path.basename(csv_path))[0] + ".arrow"
+    return os.path.join(cache_dir, name)
+
+
+def parse_dates(values):
+    try:
+        return pd.to_datetime(values, format=DATE_FORMAT)
+    except ValueError:
+        # exports re-saved by spreadsheets use other (still day-first) layouts
+        return pd.to_datetime(values, dayfirst=True, format="mixed")
+
+
+def read_orders_csv(csv_path):
+    """Typed frame straight from the CSV, with underscore column names."""
+    header = pd.read_csv(csv_path, encoding=ENCODING, nrows=0).columns
+    dtypes = {c: t for c, t in DTYPES.items() if c in header}
+    df = pd.read_csv(csv_path, encoding=ENCODING, dtype=dtypes)
+    for c in DATES:
+        if c in df:
+            df[c] = parse_dates(df[c])
+    df.columns = [column_name(c) for c in df.columns]
+    return df
+
+
+@timed("csv_ingest")
+def ingest(csv_path, cache_path=None):
+    """Parse ``csv_path`` once into its typed columnar cache."""
+    cache_path = cache_path or cache_path_for(csv_path)
+    key = source_key(csv_path)
+    table = pa.Table.from_pandas(read_orders_csv(csv_path), preserve_index=False)
+    count("rows_processed_total", table.num_rows, stage="csv_ingest")
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), METADATA_KEY: json.dumps(key).encode()})
+
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    feather.write_feather(table, tmp_path, compression="uncompressed")
+    os.replace(tmp_path, cache_path)
+    return cache_path
+
+
+def cached_key(cache_path):
+    """Source fingerprint stored in an existing cache, or ``None``."""
+    try:
+        with pa.memory_map(cache_path) as source:
+            metadata = pa.ipc.open_file(source).schema.metadata or {}
+    except (OSError, pa.ArrowInvalid):
+        return None
+    raw = metadata.get(METADATA_KEY)
+    return json.loads(raw) if raw else None
+
+
+@timed("cache_load")
+def load_orders(csv_path, columns=None, cache_dir=None):
+    """Memory-map the cached order table, re-ingesting only if the CSV changed.
+
+    ``columns`` use the underscore names (e.g. ``"Order_Date"``); only those
+    are read.
+    """
+    cache_path = cache_path_for(csv_path, cache_dir)
+    if cached_key(cache_path) != source_key(csv_path):
+        ingest(csv_path, cache_path)
+    table = feather.read_table(cache_path, columns=columns, memory_map=True)
+    return table.to_pandas(split_blocks=True)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="(Re)build the Superstore columnar cache.")
+    parser.add_argument("csv")
+    parser.add_argument("--cache-dir", default=None)
+    args = parser.parse_args()
+    print(ingest(args.csv, cache_path_for(args.csv, args.cache_dir)))
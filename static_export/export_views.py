@@ -0,0 +1,347 @@
+# ===============================
+# 📦 Static Dashboard Export
+# ===============================
+"""Pre-render every view of both dashboards for static (GitHub Pages) hosting.
+
+The widget space of each dashboard is finite, so every view is rendered once
+at build time and served as files:
+
+- ``climate``: the Streamlit script itself runs through ``streamlit.testing``
+  for every station × tab, and within a tab for each rolling window
+  (Overview), month (Monthly Trends) and season (Correlation). The page
+  elements (markdown, metrics, notes, plotly figures) are captured in order.
+  The remaining widgets (parameter picker, year range, event thresholds,
+  PV system grid) keep their defaults.
+- ``superstore``: the Dash app's own figure and KPI builders render every
+  tab × region × category, plus each horizon on the forecast tab. Light and
+  dark mode are one template swap, done in the browser as the live app does.
+
+Views are sharded across a process pool. Each figure is stored once under
+the hash of its compact JSON: floats rounded to 6 significant digits and the
+(shared) template stored separately. A manifest maps every widget
+combination to its blocks. ``index.html``/``viewer.js`` rebuild the controls
+from the manifest and swap views client-side, so the common case needs no
+Python server:
+
+    python static_export/export_views.py --out dashboards
+    # -> dashboards/climate/index.html, dashboards/superstore/index.html
+
+The Superstore export needs the Global Superstore CSV next to the app (or in
+``$SUPERSTORE_DATA_DIR``) and reuses (or first trains) its forecast models;
+``FORECAST_METHOD=seasonal-naive`` exports without NeuralProphet. On every
+push to main, ``.github/workflows/static-dashboards.yml`` runs the export and
+publishes it with the portfolio on GitHub Pages under ``/dashboards/``;
+``link_portfolio.py`` then links the exports that were actually written from
+the portfolio page.
+"""
+
+import argparse
+import hashlib
+import importlib
+import itertools
+import json
+import multiprocessing
+import os
+import shutil
+import sys
+import textwrap
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SHELL_DIR = os.path.dirname(os.path.abspath(__file__))
+CLIMATE_DIR = os.path.join(ROOT, "projects", "Chakwal_Climate_Solar_Trends")
+CLIMATE_SCRIPT = os.path.join(CLIMATE_DIR, "Climate_Analysis_Dashboard.py")
+SUPERSTORE_DIR = os.path.join(ROOT, "projects", "Global_Superstore_Analysis")
+# the app reads its CSV (and forecast models) relative to the working directory
+SUPERSTORE_DATA_DIR = os.environ.get("SUPERSTORE_DATA_DIR", SUPERSTORE_DIR)
+APPS = {
+    "climate": {"title": "🌍 Chakwal Climate Dashboard",
+                "live_url": "https://aleezazia27-climate-chakwal.streamlit.app/",
+                "link": "Climate & Solar Trends (static)"},
+    "superstore": {"title": "📊 Global Superstore Dashboard",
+                   "live_url": "https://aleezazia27.pythonanywhere.com/",
+                   "link": "Global Superstore (static)"},
+}
+# Climate widgets enumerated per tab (by label); all others keep their defaults
+CLIMATE_CONTROLS = {
+    "Overview": ["Select Rolling Trend Window (years)"],
+    "Monthly Trends & Heatmaps": ["Select Month for Trends"],
+    "Correlation & Insights": ["Season"],
+}
+SUPERSTORE_TABS = ["Sales by Region", "Profit by Category", "Drill-down", "Sales Forecast"]
+SIGNIFICANT_DIGITS = 6
+RUN_TIMEOUT = 600  # seconds per Streamlit run (the first one may build the caches)
+
+
+# -------------------------------
+# Content-addressed figure store
+# -------------------------------
+def compact(value):
+    """JSON value with floats rounded to ``SIGNIFICANT_DIGITS``."""
+    if isinstance(value, float):
+        return float(f"{value:.{SIGNIFICANT_DIGITS}g}")
+    if isinstance(value, dict):
+        return {k: compact(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [compact(v) for v in value]
+    return value
+
+
+def store(data_dir, value):
+    """Write ``value`` once as ``<hash>.json``; its hash."""
+    payload = json.dumps(value, separators=(",", ":"), sort_keys=True, ensure_ascii=False)
+    digest = hashlib.sha1(payload.encode()).hexdigest()[:16]
+    path = os.path.join(data_dir, f"{digest}.json")
+    if not os.path.exists(path):
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+    return digest
+
+
+def figure_block(data_dir, figure):
+    """Block referencing a stored figure and, separately, its template."""
+    figure = json.loads(figure) if isinstance(figure, str) else figure
+    figure = compact(figure.to_plotly_json() if hasattr(figure, "to_plotly_json") else figure)
+    layout = dict(figure.get("layout", {}))
+    template = layout.pop("template", None)
+    return {
+        "type": "figure",
+        "figure": store(data_dir, {"data": figure.get("data", []), "layout": layout}),
+        "template": store(data_dir, template) if template else None,
+    }
+
+
+def view_key(values):
+    # mirrored by viewKey() in viewer.js
+    return "|".join("" if v is None else str(v) for v in values)
+
+
+# -------------------------------
+# Climate (Streamlit) views
+# -------------------------------
+def _climate_app():
+    from streamlit.testing.v1 import AppTest
+
+    os.environ.setdefault("POWER_DATA_DIR", CLIMATE_DIR)
+    os.environ["METRICS_PORT"] = ""
+    if CLIMATE_DIR not in sys.path:
+        sys.path.insert(0, CLIMATE_DIR)
+    at = AppTest.from_file(CLIMATE_SCRIPT, default_timeout=RUN_TIMEOUT)
+    return _checked(at.run())
+
+
+def _station_ids():
+    from station_store import StationStore
+
+    # same order (and lat/lon filter) as the dashboard's station selectbox
+    index = StationStore(os.environ["POWER_DATA_DIR"], loader=None).index
+    return list(index.dropna(subset=["lat", "lon"]).index)
+
+
+def _checked(at):
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    return at
+
+
+def _widget(at, label):
+    return next(w for w in at.main.selectbox if w.label == label)
+
+
+def _blocks(node, data_dir):
+    """Page elements under ``node`` in order; widgets are left to the shell."""
+    from markdown_it import MarkdownIt
+
+    markdown = MarkdownIt("commonmark", {"html": True, "breaks": False})
+    blocks = []
+    for child in node.children.values():
+        kind = getattr(child, "type", None)
+        if kind == "markdown":
+            blocks.append({"type": "html", "html": markdown.render(textwrap.dedent(child.value))})
+        elif kind == "metric":
+            blocks.append({"type": "metric", "label": child.label, "value": child.value, "delta": child.delta})
+        elif kind in ("info", "warning", "error", "success"):
+            blocks.append({"type": "note", "level": kind, "text": child.value})
+        elif kind == "plotly_chart":
+            blocks.append(figure_block(data_dir, child.proto.spec))
+        elif kind == "deck_gl_json_chart":
+            blocks.append({"type": "note", "level": "info", "text": "The station map is in the live dashboard."})
+        elif kind == "horizontal":
+            columns = [_blocks(column, data_dir) for column in child.children.values()]
+            if any(columns):
+                blocks.append({"type": "columns", "columns": columns})
+        elif kind not in ("expander",) and hasattr(child, "children"):
+            blocks += _blocks(child, data_dir)
+    return blocks
+
+
+def climate_controls():
+    """Station and tab options, plus the enumerated widgets of each tab."""
+    at = _climate_app()
+    station = at.sidebar.selectbox[0]
+    controls = [
+        {"name": "Station", "options": list(station.options), "default": station.options[station.index]},
+        {"name": "Navigate", "options": list(at.sidebar.radio[0].options)},
+    ]
+    for tab, labels in CLIMATE_CONTROLS.items():
+        _checked(at.sidebar.radio[0].set_value(tab).run())
+        for label in labels:
+            widget = _widget(at, label)
+            controls.append({"name": label, "options": list(widget.options),
+                             "default": widget.options[widget.index], "when": {"Navigate": [tab]}})
+    return controls
+
+
+def render_climate(station_index, tab, data_dir):
+    """``{key: blocks}`` for one station and tab over its enumerated widgets."""
+    at = _climate_app()
+    # set by id: select_index() would pass the format_func label as the value
+    _checked(at.sidebar.selectbox[0].set_value(_station_ids()[station_index]).run())
+    _checked(at.sidebar.radio[0].set_value(tab).run())
+    station = at.sidebar.selectbox[0]
+    labels = CLIMATE_CONTROLS.get(tab, [])
+    grids = [range(len(_widget(at, label).options)) for label in labels]
+    views = {}
+    for indices in itertools.product(*grids):
+        for label, i in zip(labels, indices):
+            _checked(_widget(at, label).select_index(i).run())
+        values = [station.options[station.index], tab, *(_widget(at, label).options[i]
+                                                          for label, i in zip(labels, indices))]
+        views[view_key(values)] = _blocks(at.main, data_dir)
+    return views
+
+
+def export_climate(pool, data_dir):
+    controls = pool.submit(climate_controls).result()
+    stations, tabs = controls[0]["options"], controls[1]["options"]
+    jobs = [pool.submit(render_climate, s, tab, data_dir) for s in range(len(stations)) for tab in tabs]
+    views = {}
+    for job in jobs:
+        views.update(job.result())
+    for control in controls:
+        control.setdefault("default", control["options"][0])
+        control["options"] = [{"label": o, "value": o} for o in control["options"]]
+    return {"controls": controls, "views": views}
+
+
+# -------------------------------
+# Superstore (Dash) views
+# -------------------------------
+def _superstore_app(forecast_timeout):
+    os.chdir(SUPERSTORE_DATA_DIR)
+    if SUPERSTORE_DIR not in sys.path:
+        sys.path.insert(0, SUPERSTORE_DIR)
+    import global_superstore_dashboard as app
+
+    app.forecasts.wait(app.get_forecast_key(), forecast_timeout)
+    return app
+
+
+def superstore_controls(forecast_timeout):
+    """Tab, filter, horizon and mode controls, plus the two mode templates."""
+    app = _superstore_app(forecast_timeout)
+    sales = app.get_sales()
+
+    def options(values, everything):
+        return [{"label": everything, "value": None}, *({"label": str(v), "value": v} for v in values)]
+
+    controls = [
+        {"name": "Tab", "options": [{"label": t, "value": t} for t in SUPERSTORE_TABS]},
+        {"name": "Region", "options": options(sales.values("Region"), "All Regions")},
+        {"name": "Category", "options": options(sales.values("Category"), "All Categories")},
+        {"name": "Forecast Horizon (months)", "options": [{"label": str(h), "value": h} for h in app.HORIZONS],
+         "default": app.DEFAULT_HORIZON, "when": {"Tab": ["Sales Forecast"]}},
+        {"name": "Mode", "options": [{"label": m.title(), "value": m} for m in app.THEMES], "theme": True},
+    ]
+    themes = {mode: template.to_plotly_json() for mode, template in app.THEMES.items()}
+    return controls, themes
+
+
+def render_superstore(region, categories, data_dir, forecast_timeout):
+    """``{key: blocks}`` for one region across categories, tabs and horizons."""
+    app = _superstore_app(forecast_timeout)
+    views = {}
+    for category in categories:
+        # Filter values in DIMENSIONS order, Region and Category set
+        values = [{"Region": region, "Category": category}.get(dim) for dim in app.DIMENSIONS]
+        kpis = {"type": "columns", "columns": [[{"type": "metric", "label": title, "value": text, "delta": None}]
+                                               for title, text in app.kpi_values(*values)]}
+        figures = {
+            "Sales by Region": [app.region_figure(*values)],
+            "Profit by Category": [app.category_figure(*values)],
+            "Drill-down": [app.drill_figure(parent, *values) for parent in app.DRILL_IDS],
+        }
+        for tab, tab_figures in figures.items():
+            views[view_key([tab, region, category])] = [kpis, *(figure_block(data_dir, f) for f in tab_figures)]
+        for horizon in app.HORIZONS:
+            figure = app.forecast_figure(horizon, *values)
+            views[view_key(["Sales Forecast", region, category, horizon])] = [kpis, figure_block(data_dir, figure)]
+    return views
+
+
+def export_superstore(pool, data_dir, forecast_timeout):
+    controls, themes = pool.submit(superstore_controls, forecast_timeout).result()
+    regions = [o["value"] for o in controls[1]["options"]]
+    categories = [o["value"] for o in controls[2]["options"]]
+    jobs = [pool.submit(render_superstore, r, categories, data_dir, forecast_timeout) for r in regions]
+    views = {}
+    for job in jobs:
+        views.update(job.result())
+    for control in controls:
+        control.setdefault("default", control["options"][0]["value"])
+    templates = {mode: store(data_dir, compact(t)) for mode, t in themes.items()}
+    return {"controls": controls, "views": views, "themes": {"control": "Mode", "templates": templates}}
+
+
+# -------------------------------
+# Site assembly
+# -------------------------------
+def write_site(out_dir, name, manifest):
+    from plotly.offline import get_plotlyjs_version
+
+    app_dir = os.path.join(out_dir, name)
+    manifest = {**APPS[name], "plotly": get_plotlyjs_version(), **manifest}
+    with open(os.path.join(app_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, separators=(",", ":"), ensure_ascii=False)
+    with open(os.path.join(SHELL_DIR, "index.html"), encoding="utf-8") as f:
+        shell = f.read()
+    with open(os.path.join(app_dir, "index.html"), "w", encoding="utf-8") as f:
+        f.write(shell.replace("{{title}}", manifest["title"]).replace("{{plotly}}", manifest["plotly"]))
+    shutil.copy(os.path.join(SHELL_DIR, "viewer.js"), app_dir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export every dashboard view as static files.")
+    parser.add_argument("--apps", nargs="+", default=list(APPS), choices=list(APPS))
+    parser.add_argument("--out", default=os.path.join(ROOT, "dashboards"), help="site output directory")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="render processes")
+    parser.add_argument("--forecast-timeout", type=float, default=3600,
+                        help="seconds to wait for the Superstore forecast models")
+    args = parser.parse_args()
+
+    # spawn: workers import Streamlit/Dash apps and must not inherit this process's state.
+    # Jobs are pickled by module name: Streamlit's script runner replaces __main__ in workers
+    export = importlib.import_module("export_views")
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=args.workers, mp_context=context) as pool:
+        for name in args.apps:
+            started = time.perf_counter()
+            data_dir = os.path.join(os.path.abspath(args.out), name, "data")
+            shutil.rmtree(data_dir, ignore_errors=True)
+            os.makedirs(data_dir)
+            if name == "climate":
+                manifest = export.export_climate(pool, data_dir)
+            else:
+                manifest = export.export_superstore(pool, data_dir, args.forecast_timeout)
+            export.write_site(os.path.abspath(args.out), name, manifest)
+            files = os.listdir(data_dir)
+            size = sum(os.path.getsize(os.path.join(data_dir, f)) for f in files)
+            print(f"{name}: {len(manifest['views'])} views, {len(files)} unique figures/templates, "
+                  f"{size / 2**20:.2f} MB in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# ===============================
+# 🔗 Portfolio Links to the Static Exports
+# ===============================
+"""Link the published static dashboards from the portfolio page.
+
+``index.html`` carries a ``<!-- static-dashboards ... -->`` marker instead of
+hard-coded links, so the page served by a plain branch deploy (or a build
+whose export failed) never points at missing files. The Pages build runs
+this after ``export_views.py``; only exports with a written ``manifest.json``
+get a link:
+
+    python static_export/link_portfolio.py _site/index.html _site/dashboards
+"""
+
+import argparse
+import html
+import os
+import re
+import sys
+
+from export_views import APPS
+
+MARKER = re.compile(r"^(?P<indent>[ \t]*)<!-- static-dashboards\b.*?-->[ \t]*$", re.MULTILINE)
+INTRO = ("Every view of the Streamlit and Dash dashboards is also pre-rendered as a static page "
+         "that loads instantly, with no server to wake up.")
+BUTTON_CLASSES = ["cert-btn", "badge-btn"]
+
+
+def published(out_dir):
+    """Exported apps (in ``APPS`` order) whose manifest was written."""
+    return [name for name in APPS if os.path.isfile(os.path.join(out_dir, name, "manifest.json"))]
+
+
+def links_html(index_path, out_dir, names, indent=""):
+    href_base = os.path.relpath(out_dir, os.path.dirname(os.path.abspath(index_path))).replace(os.sep, "/")
+    blocks = [f'<p class="muted animate-on-scroll">{html.escape(INTRO)}</p>']
+    for i, name in enumerate(names):
+        blocks.append(
+            f'<a href="{href_base}/{name}/" target="_blank" rel="noopener noreferrer" '
+            f'class="{BUTTON_CLASSES[i % len(BUTTON_CLASSES)]} animate-on-scroll">\n'
+            f"  {html.escape(APPS[name]['link'])}\n</a>"
+        )
+    return "\n\n".join("\n".join(indent + line for line in block.splitlines()) for block in blocks)
+
+
+def link_portfolio(index_path, out_dir):
+    """Replace the marker in ``index_path`` with links to the published exports; returns their names."""
+    with open(index_path, encoding="utf-8") as f:
+        page = f.read()
+    match = MARKER.search(page)
+    if match is None:
+        raise ValueError(f"{index_path} has no <!-- static-dashboards --> marker")
+    names = published(out_dir)
+    replacement = links_html(index_path, out_dir, names, match["indent"]) if names else ""
+    with open(index_path, "w", encoding="utf-8") as f:
+        f.write(page[:match.start()] + replacement + page[match.end():])
+    return names
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Link the published static dashboards from the portfolio page.")
+    parser.add_argument("index", help="portfolio index.html to rewrite in place")
+    parser.add_argument("out", help="export_views.py output directory")
+    args = parser.parse_args()
+    names = link_portfolio(args.index, args.out)
+    print(f"linked: {', '.join(names) or 'none'}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
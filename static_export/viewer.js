@@ -0,0 +1,120 @@
+// ===============================
+// 🖥 Static Dashboard Viewer
+// ===============================
+// Rebuilds the dashboard's controls from manifest.json and swaps between the
+// pre-rendered views; figures and templates are fetched once by hash.
+
+const objects = new Map();
+const state = {};
+let manifest;
+
+function load(hash) {
+  if (!objects.has(hash)) {
+    objects.set(hash, fetch(`data/${hash}.json`).then((r) => r.json()));
+  }
+  return objects.get(hash);
+}
+
+function visible(control) {
+  return !control.when || Object.entries(control.when).every(([name, values]) => values.includes(state[name]));
+}
+
+// mirrors view_key() in export_views.py
+function viewKey() {
+  return manifest.controls
+    .filter((c) => !c.theme && visible(c))
+    .map((c) => (state[c.name] == null ? "" : String(state[c.name])))
+    .join("|");
+}
+
+function buildControls() {
+  const container = document.getElementById("controls");
+  for (const control of manifest.controls) {
+    state[control.name] = control.default;
+    const label = document.createElement("label");
+    label.textContent = control.name;
+    const select = document.createElement("select");
+    control.options.forEach((option, i) => {
+      select.add(new Option(option.label, i, false, option.value === control.default));
+    });
+    select.addEventListener("change", () => {
+      state[control.name] = control.options[select.value].value;
+      render();
+    });
+    label.appendChild(select);
+    control.element = label;
+    container.appendChild(label);
+  }
+  if (manifest.live_url) {
+    const link = document.createElement("a");
+    link.href = manifest.live_url;
+    link.textContent = "Open the live dashboard";
+    link.target = "_blank";
+    link.rel = "noopener noreferrer";
+    container.appendChild(link);
+  }
+}
+
+function templateFor(block) {
+  // a theme control (light/dark) overrides every figure's template
+  if (manifest.themes) {
+    document.body.classList.toggle("dark", state[manifest.themes.control] === "dark");
+    return manifest.themes.templates[state[manifest.themes.control]];
+  }
+  return block.template;
+}
+
+function renderBlock(block, parent) {
+  const element = document.createElement("div");
+  parent.appendChild(element);
+  if (block.type === "html") {
+    element.innerHTML = block.html;
+  } else if (block.type === "metric") {
+    element.className = "metric";
+    for (const part of ["label", "value", "delta"]) {
+      if (block[part]) {
+        const span = document.createElement("div");
+        span.className = part;
+        span.textContent = block[part];
+        element.appendChild(span);
+      }
+    }
+  } else if (block.type === "note") {
+    element.className = `note ${block.level}`;
+    element.textContent = block.text;
+  } else if (block.type === "columns") {
+    element.className = "columns";
+    for (const column of block.columns) {
+      const cell = document.createElement("div");
+      element.appendChild(cell);
+      column.forEach((child) => renderBlock(child, cell));
+    }
+  } else if (block.type === "figure") {
+    element.className = "figure";
+    const template = templateFor(block);
+    Promise.all([load(block.figure), template ? load(template) : null]).then(([figure, tmpl]) => {
+      const layout = { ...figure.layout, template: tmpl || undefined };
+      Plotly.react(element, figure.data, layout, { responsive: true });
+    });
+  }
+}
+
+function render() {
+  for (const control of manifest.controls) {
+    control.element.style.display = visible(control) ? "" : "none";
+  }
+  const view = document.getElementById("view");
+  const blocks = manifest.views[viewKey()];
+  view.replaceChildren();
+  if (!blocks) {
+    renderBlock({ type: "note", level: "warning", text: "This combination was not exported." }, view);
+    return;
+  }
+  blocks.forEach((block) => renderBlock(block, view));
+}
+
+window.addEventListener("DOMContentLoaded", async () => {
+  manifest = await (await fetch("manifest.json")).json();
+  buildControls();
+  render();
+});
@@ -0,0 +1,67 @@
+"""Shared fixtures: the project engines and static export on ``sys.path``, synthetic POWER / Superstore exports."""
+
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CLIMATE_DIR = os.path.join(ROOT, "projects", "Chakwal_Climate_Solar_Trends")
+SUPERSTORE_DIR = os.path.join(ROOT, "projects", "Global_Superstore_Analysis")
+# the module names of the two projects do not overlap (the shared ones are identical copies)
+sys.path[:0] = [CLIMATE_DIR, SUPERSTORE_DIR, os.path.join(ROOT, "benchmarks"), os.path.join(ROOT, "static_export")]
+
+from power_reader import read_power  # noqa: E402
+from superstore_cache import read_orders_csv  # noqa: E402
+from synthetic_data import write_power_csv, write_superstore_csv  # noqa: E402
+
+# the dashboard's names for the four parameters it plots
+RENAME = {
+    "T2M": "Mean_Temp_C",
+    "T2M_MAX": "Max_Temp_C",
+    "PRECTOTCORR": "Total_Rain_mm",
+    "ALLSKY_SFC_SW_DWN": "Solar_Irradiance_kWh_per_m²_per_day",
+}
+MONTH_ORDER = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+YEARS = 6
+ORDER_ROWS = 5000
+
+
+@pytest.fixture(scope="session")
+def power_csv(tmp_path_factory):
+    """A daily POWER export of ``YEARS`` years with 1% fill values."""
+    path = tmp_path_factory.mktemp("power") / f"POWER_Point_Daily_2000_{1999 + YEARS}_synthetic.csv"
+    write_power_csv(path, years=YEARS, missing=0.01)
+    return str(path)
+
+
+def prepare(df):
+    """``df`` with the dashboard's derived columns and names (as ``prepare_frame``)."""
+    df = df.copy()
+    df["year"] = df["YEAR"]
+    df["month"] = df["MO"]
+    df["month_name"] = pd.Categorical.from_codes(df["MO"] - 1, categories=MONTH_ORDER)
+    return df.rename(columns=RENAME)
+
+
+@pytest.fixture(scope="session")
+def daily(power_csv):
+    """The export read straight from the CSV (no cache), as the dashboard names it."""
+    _, df = read_power(power_csv)
+    df["DATE"] = pd.to_datetime(dict(year=df["YEAR"], month=df["MO"], day=df["DY"]))
+    return prepare(df)
+
+
+@pytest.fixture(scope="session")
+def superstore_csv(tmp_path_factory):
+    """A ``Global_Superstore2.csv``-shaped export of ``ORDER_ROWS`` order lines (2011–2014)."""
+    path = tmp_path_factory.mktemp("superstore") / "Global_Superstore2.csv"
+    write_superstore_csv(path, rows=ORDER_ROWS)
+    return str(path)
+
+
+@pytest.fixture(scope="session")
+def orders(superstore_csv):
+    """The typed order table read straight from the CSV (no cache)."""
+    return read_orders_csv(superstore_csv)
@@ -0,0 +1,109 @@
+"""``aggregates`` against the groupby pipeline it replaced."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from aggregates import MONTH_ORDER, RAIN, SOLAR, TEMP, TMAX, VARIABLES, BinnedStats, bin_daily, derive_aggregates
+
+
+def groupby_reference(df):
+    """The dashboard's original per-table groupby passes."""
+    ref = {}
+    ref["yearly_temp"] = df.groupby("year")[TEMP].mean().reset_index()
+    ref["yearly_max_temp"] = df.groupby("year")[TMAX].max().reset_index()
+    ref["annual_rain"] = df.groupby("year")[RAIN].sum().reset_index()
+    annual_solar = df.groupby("year")[SOLAR].mean().reset_index()
+    mu, sigma = annual_solar[SOLAR].mean(), annual_solar[SOLAR].std()
+    annual_solar["Clipped"] = annual_solar[SOLAR].clip(lower=mu - 2 * sigma, upper=mu + 2 * sigma)
+    annual_solar["Trend"] = annual_solar["Clipped"].rolling(3, center=True).mean()
+    ref["annual_solar"] = annual_solar
+
+    ref["monthly"] = df.groupby(["year", "month"]).agg({TEMP: "mean", RAIN: "sum"}).reset_index()
+    ref["monthly_solar"] = df.groupby(["year", "month"])[SOLAR].mean().reset_index()
+    for name, var in (("heatmap_temp", TEMP), ("heatmap_rain", RAIN)):
+        pivot = ref["monthly"].pivot(index="month", columns="year", values=var).sort_index()
+        pivot.index = [MONTH_ORDER[int(m) - 1] for m in pivot.index]
+        ref[name] = pivot
+
+    seasonal_avg = df.groupby("month").agg({TEMP: "mean", RAIN: "mean"}).reset_index()
+    seasonal_avg["month_name"] = seasonal_avg["month"].apply(lambda m: MONTH_ORDER[m - 1])
+    ref["seasonal_avg"] = seasonal_avg
+
+    highlights = {
+        "hottest": df.groupby("year")[TMAX].mean(), "coolest": df.groupby("year")[TEMP].mean(),
+        "wettest": df.groupby("year")[RAIN].sum(), "driest": df.groupby("year")[RAIN].sum(),
+        "solar": df.groupby("year")[SOLAR].mean(),
+    }
+    for name, series in highlights.items():
+        pick = series.idxmin() if name in ("coolest", "driest") else series.idxmax()
+        ref[f"{name}_year"], ref[f"{name}_val"] = int(pick), float(series[pick])
+    ref["rainiest_month"] = df.groupby("month_name", observed=True)[RAIN].sum().idxmax()
+    return ref
+
+
+@pytest.fixture(scope="module")
+def both(daily):
+    return derive_aggregates(bin_daily(daily)), groupby_reference(daily)
+
+
+@pytest.mark.parametrize("table", ["yearly_temp", "yearly_max_temp", "annual_rain", "annual_solar",
+                                   "monthly", "seasonal_avg"])
+def test_tables_match_groupby(both, table):
+    agg, ref = both
+    assert_frame_equal(agg[table].reset_index(drop=True), ref[table], check_dtype=False)
+
+
+def test_monthly_solar_values_match_groupby(both):
+    agg, ref = both
+    assert_frame_equal(agg["monthly_solar"].drop(columns="Trend"), ref["monthly_solar"], check_dtype=False)
+
+
+@pytest.mark.parametrize("table", ["heatmap_temp", "heatmap_rain"])
+def test_heatmaps_match_pivot(both, table):
+    agg, ref = both
+    assert_frame_equal(agg[table], ref[table], check_dtype=False, check_names=False, check_column_type=False)
+
+
+def test_highlights_match_groupby(both):
+    agg, ref = both
+    for name in ("hottest", "coolest", "wettest", "driest", "solar"):
+        assert agg[f"{name}_year"] == ref[f"{name}_year"]
+        assert agg[f"{name}_val"] == pytest.approx(ref[f"{name}_val"])
+    assert agg["rainiest_month"] == ref["rainiest_month"]
+
+
+def test_overview_matches_whole_record(both, daily):
+    agg, _ = both
+    overview = agg["overview"]
+    assert overview["temp_mean"] == pytest.approx(daily[TEMP].mean())
+    assert overview["rain_total"] == pytest.approx(daily[RAIN].sum())
+    assert overview["solar_range"] == pytest.approx(daily[SOLAR].max() - daily[SOLAR].min())
+
+
+def test_update_matches_binning_everything(daily):
+    split = daily["DATE"] >= "2003-07-15"
+    stats = bin_daily(daily[~split]).update(bin_daily(daily[split]))
+    full = bin_daily(daily)
+    assert stats.first_year == full.first_year
+    for part in ("rows", "sums", "counts", "mins", "maxs"):
+        np.testing.assert_allclose(getattr(stats, part), getattr(full, part), rtol=1e-12)
+
+
+def test_update_grows_into_earlier_and_later_years(daily):
+    middle = daily["year"].between(2002, 2003)
+    stats = bin_daily(daily[middle]).update(bin_daily(daily[~middle]))
+    full = bin_daily(daily)
+    assert stats.first_year == full.first_year
+    np.testing.assert_allclose(stats.sums, full.sums, rtol=1e-12)
+    np.testing.assert_array_equal(stats.rows, full.rows)
+
+
+def test_empty_bins_are_nan_and_skipped():
+    dates = pd.to_datetime(["2001-01-05", "2001-03-10", "2001-03-11"])
+    stats = BinnedStats.from_arrays(dates.year, dates.month, {v: [1.0, np.nan, 3.0] for v in VARIABLES})
+    assert np.isnan(stats.by_year_month(TEMP, "mean")[0, 1])
+    assert stats.by_year_month(TEMP, "mean")[0, 2] == 3.0
+    assert list(stats.month_frame({TEMP: "mean"})["month"]) == [1, 3]
+    assert stats.by_year_month(TEMP, "count")[0, 2] == 1
@@ -0,0 +1,117 @@
+"""``CallbackCache`` memory LRU, SQLite tier, versioned keys and ``Patch`` round-trips."""
+
+import pandas as pd
+import plotly.graph_objects as go
+import pytest
+from dash import Patch, no_update
+
+from callback_cache import CallbackCache
+
+
+def counting(cache, **memoize):
+    calls = []
+
+    @cache.memoize(**memoize)
+    def square(x):
+        calls.append(x)
+        return {"x": x, "y": x * x}
+
+    return square, calls
+
+
+def test_lru_evicts_least_recently_used():
+    cache = CallbackCache(max_entries=2)
+    square, calls = counting(cache)
+    for x in (1, 2, 1, 3):  # 2 is the least recently used when 3 arrives
+        assert square(x) == {"x": x, "y": x * x}
+    square(1)
+    square(2)
+    assert calls == [1, 2, 3, 2]
+    assert cache.stats()["entries"] == 2
+
+
+def test_counters():
+    cache = CallbackCache()
+    square, _ = counting(cache)
+    for x in (1, 1, 2, 1):
+        square(x)
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (2, 2)
+    assert stats["functions"] == {square.__qualname__: {"hits": 2, "misses": 2}}
+    cache.clear()
+    square(1)
+    assert cache.stats()["misses"] == 3
+
+
+def test_version_invalidates():
+    version = ["v1"]
+    cache = CallbackCache()
+    square, calls = counting(cache, version=lambda: version[0])
+    square(2)
+    square(2)
+    version[0] = "v2"
+    square(2)
+    version[0] = "v1"
+    square(2)  # still cached under the old version
+    assert calls == [2, 2]
+
+
+def test_ttl_expires_entries():
+    cache = CallbackCache(ttl=0)
+    square, calls = counting(cache)
+    square(1)
+    square(1)
+    assert calls == [1, 1]
+
+
+def test_sqlite_is_shared_across_instances(tmp_path):
+    path = str(tmp_path / "cache" / "callbacks.sqlite")
+    first, first_calls = counting(CallbackCache(path=path))
+    assert first(4) == {"x": 4, "y": 16}
+
+    second_cache = CallbackCache(path=path)
+    second, second_calls = counting(second_cache)
+    assert second(4) == {"x": 4, "y": 16}
+    assert first_calls == [4] and second_calls == []
+    assert second_cache.hits == {second.__qualname__: 1} and second_cache.misses == {}
+
+    second_cache.clear()  # clears the shared tier too
+    third, third_calls = counting(CallbackCache(path=path))
+    third(4)
+    assert third_calls == [4]
+
+
+def test_patches_and_figures_round_trip():
+    cache = CallbackCache()
+    breakdown = pd.DataFrame({"Region": ["Africa", "EMEA"], "Sales": [1.5, 2.25]})
+
+    @cache.memoize(multi=True)
+    def outputs(title):
+        patch = Patch()
+        patch["data"][0]["x"] = breakdown["Region"]
+        patch["data"][0]["y"] = breakdown["Sales"]
+        patch["layout"]["title"]["text"] = title
+        return patch, go.Figure(go.Bar(x=breakdown["Region"], y=breakdown["Sales"]))
+
+    computed, cached = outputs("Sales"), outputs("Sales")
+    assert isinstance(cached, tuple) and computed == cached
+    patch, figure = cached
+    # the dict Dash's renderer applies as a partial update
+    assert patch["__dash_patch_update"] == "__dash_patch_update"
+    assert [(op["operation"], op["location"], op["params"]["value"]) for op in patch["operations"]] == [
+        ("Assign", ["data", 0, "x"], ["Africa", "EMEA"]),
+        ("Assign", ["data", 0, "y"], [1.5, 2.25]),
+        ("Assign", ["layout", "title", "text"], "Sales"),
+    ]
+    assert figure["data"][0]["type"] == "bar" and list(figure["data"][0]["y"]) == [1.5, 2.25]
+    assert cache.stats()["hits"] == 1
+
+
+@pytest.mark.parametrize("result", [no_update, (no_update, 1)])
+def test_no_update_is_not_cached(result):
+    cache = CallbackCache()
+    calls = []
+    answer = cache.get_or_compute("f", [1], lambda: calls.append(1) or result)
+    assert answer is result
+    cache.get_or_compute("f", [1], lambda: calls.append(1) or result)
+    assert len(calls) == 2 and cache.stats()["entries"] == 0
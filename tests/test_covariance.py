@@ -0,0 +1,83 @@
+"""``covariance`` against ``DataFrame.corr`` / ``DataFrame.cov`` (pairwise-complete)."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from covariance import SEASON_OF_MONTH, SEASONS, MomentsCube, PairwiseMoments
+
+VARIABLES = ["T2M", "T2M_MAX", "PRECTOTCORR", "ALLSKY_SFC_SW_DWN", "WS10M"]
+
+
+@pytest.fixture(scope="module")
+def frame(daily):
+    df = daily.rename(columns={"Mean_Temp_C": "T2M", "Max_Temp_C": "T2M_MAX", "Total_Rain_mm": "PRECTOTCORR",
+                               "Solar_Irradiance_kWh_per_m²_per_day": "ALLSKY_SFC_SW_DWN"})
+    return df[["YEAR", "MO", *VARIABLES]].astype({v: np.float64 for v in VARIABLES})
+
+
+@pytest.fixture(scope="module")
+def cube(frame):
+    """Built from 97-row chunks, so cells are split across chunks."""
+    cube = MomentsCube(VARIABLES)
+    for lo in range(0, len(frame), 97):
+        cube.add_frame(frame.iloc[lo:lo + 97])
+    return cube
+
+
+def test_whole_record_matches_pandas(cube, frame):
+    moments = cube.select()
+    assert_frame_equal(moments.corr(), frame[VARIABLES].corr(), rtol=1e-10)
+    assert_frame_equal(moments.covariance(), frame[VARIABLES].cov(), rtol=1e-10)
+
+
+@pytest.mark.parametrize("seasons", [["JJA"], ["DJF", "SON"]])
+def test_season_subset_matches_pandas(cube, frame, seasons):
+    season = pd.Series(SEASON_OF_MONTH[frame["MO"] - 1], index=frame.index).map(dict(enumerate(SEASONS)))
+    expected = frame.loc[season.isin(seasons), VARIABLES].corr()
+    assert_frame_equal(cube.select(seasons=seasons).corr(), expected, rtol=1e-10)
+
+
+def test_year_window_and_variables_match_pandas(cube, frame):
+    subset = ["PRECTOTCORR", "T2M"]
+    expected = frame.loc[frame["YEAR"].between(2001, 2003), subset].corr()
+    assert_frame_equal(cube.select(years=(2001, 2003), variables=subset).corr(), expected, rtol=1e-10)
+    by_year = cube.by_year()
+    assert list(by_year) == sorted(frame["YEAR"].unique())
+    assert_frame_equal(by_year[2004].corr(), frame.loc[frame["YEAR"] == 2004, VARIABLES].corr(), rtol=1e-10)
+
+
+def test_pairwise_complete_nan_handling():
+    rng = np.random.default_rng(3)
+    df = pd.DataFrame(rng.normal(size=(300, 3)) + [0, 1e6, -5], columns=list("abc"))
+    df.loc[rng.random(300) < 0.2, "a"] = np.nan
+    df.loc[rng.random(300) < 0.3, "b"] = np.nan
+    df.loc[:, "c"] = np.where(df["a"].isna(), np.nan, df["c"])  # c is only present with a
+
+    moments = PairwiseMoments.from_frame(df.iloc[:120], "abc") + PairwiseMoments.from_frame(df.iloc[120:], "abc")
+    assert_frame_equal(moments.corr(), df.corr(), rtol=1e-9)
+    assert_frame_equal(moments.covariance(), df.cov(), rtol=1e-9)
+
+
+def test_too_few_rows_give_nan():
+    df = pd.DataFrame({"a": [1.0, np.nan, 3.0], "b": [np.nan, 2.0, 5.0]})
+    corr = PairwiseMoments.from_frame(df, "ab").corr()
+    assert np.isnan(corr.loc["a", "b"]) and np.isnan(df.corr().loc["a", "b"])
+    assert corr.loc["a", "a"] == 1.0
+
+
+def test_merged_cubes_match_single_pass(cube, frame):
+    late = frame["YEAR"] >= 2003
+    merged = MomentsCube(VARIABLES).add_frame(frame[late]) + MomentsCube(VARIABLES).add_frame(frame[~late])
+    single = MomentsCube(VARIABLES).add_frame(frame)
+    assert merged.cells.keys() == single.cells.keys()
+    for key, part in single.cells.items():
+        np.testing.assert_array_equal(merged.cells[key].n, part.n)
+        np.testing.assert_allclose(merged.cells[key].cxy, part.cxy, rtol=1e-9, atol=1e-9)
+    assert_frame_equal(merged.select().corr(), cube.select().corr(), rtol=1e-10)
+
+
+def test_merge_rejects_different_variables():
+    with pytest.raises(ValueError):
+        MomentsCube(["a", "b"]).merge(MomentsCube(["b", "a"]))
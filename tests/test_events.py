@@ -0,0 +1,136 @@
+"""``events`` run detection against a day-by-day loop and a pandas groupby."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from events import (RUN_COLUMNS, EventRule, detect_events, extend_events, find_runs, longest_by_year, longest_runs,
+                    run_peaks)
+
+
+def naive_runs(mask, dates=None, min_length=1):
+    """Walk the days once, closing a run on a False day or a date gap."""
+    runs, start = [], None
+    for i, marked in enumerate(mask):
+        gap = dates is not None and i > 0 and (dates[i] - dates[i - 1]) != np.timedelta64(1, "D")
+        if start is not None and (not marked or gap):
+            runs.append((start, i))
+            start = None
+        if marked and start is None:
+            start = i
+    if start is not None:
+        runs.append((start, len(mask)))
+    runs = [(s, e) for s, e in runs if e - s >= min_length]
+    return [s for s, _ in runs], [e for _, e in runs]
+
+
+def pandas_events(df, rule):
+    """Runs as groups of a cumulative change-point id (the usual pandas idiom)."""
+    values = df[rule.column]
+    mask = values < rule.threshold if rule.below else values >= rule.threshold
+    gap = df["DATE"].diff() != pd.Timedelta(days=1)
+    run_id = (mask.ne(mask.shift()) | gap).cumsum()
+    runs = df[mask].groupby(run_id[mask]).agg(start=("DATE", "first"), end=("DATE", "last"),
+                                                length=("DATE", "size"), peak=(rule.column, rule.peak))
+    runs = runs[runs["length"] >= rule.min_length]
+    return runs.assign(event=rule.name, year=runs["start"].dt.year)[RUN_COLUMNS].reset_index(drop=True)
+
+
+def as_lists(runs):
+    return [list(map(int, part)) for part in runs]
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("min_length", [1, 3])
+def test_find_runs_matches_loop(seed, min_length):
+    rng = np.random.default_rng(seed)
+    mask = rng.random(500) < 0.6
+    dates = np.datetime64("2001-01-01") + np.cumsum(rng.choice([1, 1, 1, 1, 2, 5], 500)).astype("timedelta64[D]")
+    assert as_lists(find_runs(mask, min_length=min_length)) == list(naive_runs(mask, min_length=min_length))
+    assert as_lists(find_runs(mask, dates, min_length)) == list(naive_runs(mask, dates, min_length))
+
+
+def test_date_gaps_break_runs():
+    dates = pd.to_datetime(["2001-01-01", "2001-01-02", "2001-01-04", "2001-01-05", "2001-01-06"]).to_numpy()
+    mask = np.ones(5, dtype=bool)
+    assert as_lists(find_runs(mask)) == [[0], [5]]
+    assert as_lists(find_runs(mask, dates)) == [[0, 2], [2, 5]]
+    assert as_lists(find_runs(mask, dates, min_length=3)) == [[2], [5]]
+
+
+@pytest.mark.parametrize("mask, expected", [
+    ([], [[], []]),
+    ([False, False, False], [[], []]),
+    ([True, True, True], [[0], [3]]),
+    ([True], [[0], [1]]),
+    ([True, False, False, True], [[0, 3], [1, 4]]),
+    ([False, True, True, False], [[1], [3]]),
+])
+def test_boundaries(mask, expected):
+    starts, ends = find_runs(mask)
+    assert starts.dtype == ends.dtype == np.int64
+    assert as_lists((starts, ends)) == expected
+
+
+def test_run_peaks_are_nan_aware_and_reach_the_last_day():
+    values = np.array([5.0, np.nan, 2.0, 9.0, np.nan, np.nan, 7.0])
+    starts, ends = np.array([0, 3, 4]), np.array([3, 4, 7])
+    np.testing.assert_array_equal(run_peaks(values, starts, ends, "max"), [5.0, 9.0, 7.0])
+    np.testing.assert_array_equal(run_peaks(values, starts, ends, "min"), [2.0, 9.0, 7.0])
+    assert np.isnan(run_peaks(values, np.array([4]), np.array([6]))).all()
+    assert run_peaks(values, np.array([], dtype=np.int64), np.array([], dtype=np.int64)).size == 0
+
+
+@pytest.fixture(scope="module")
+def record(daily):
+    """The synthetic record with two missing stretches, so runs meet date gaps."""
+    keep = ~daily["DATE"].between("2002-06-10", "2002-06-20") & ~daily["DATE"].between("2004-01-01", "2004-01-01")
+    return daily[keep].reset_index(drop=True)
+
+
+RULES = [
+    EventRule("dry spell", "Total_Rain_mm", 1.0, below=True, min_length=5, peak="max"),
+    EventRule("heatwave", "Max_Temp_C", 35.0, below=False, min_length=3, peak="max"),
+    EventRule("cold", "Mean_Temp_C", 8.0, below=True, min_length=1, peak="min"),
+]
+
+
+@pytest.mark.parametrize("rule", RULES, ids=lambda rule: rule.name)
+def test_detect_events_matches_pandas(record, rule):
+    events = detect_events(record, [rule])
+    assert len(events) > 0
+    assert_frame_equal(events, pandas_events(record, rule), check_dtype=False)
+
+
+def test_detect_events_orders_all_rules_by_start(record):
+    events = detect_events(record, RULES)
+    assert list(events.columns) == RUN_COLUMNS
+    assert events["start"].is_monotonic_increasing
+    assert sorted(events["event"].unique()) == sorted(rule.name for rule in RULES)
+    assert detect_events(record, []).columns.tolist() == RUN_COLUMNS
+
+
+def test_extend_events_matches_full_detection(record):
+    full = detect_events(record, RULES)
+    # splits inside long runs, right after short unlisted ones and at a date gap
+    splits = [1, 2, 400, 1000, len(record) - 1]
+    for start, length in longest_runs(full)[["start", "length"]].to_numpy():
+        first = int(record.index[record["DATE"] == start][0])
+        splits += [first + 1, first + length // 2]
+    splits += [int(record.index[record["DATE"] == "2002-06-09"][0]) + 1]
+    for n_old in splits:
+        previous = detect_events(record.iloc[:n_old], RULES)
+        assert_frame_equal(extend_events(previous, record, n_old, RULES), full, check_dtype=False, obj=f"split {n_old}")
+    assert_frame_equal(extend_events(full.iloc[:0], record, 0, RULES), full)
+
+
+def test_longest_runs(record):
+    events = detect_events(record, RULES)
+    longest = longest_runs(events)
+    for name, group in events.groupby("event"):
+        best = group[group["length"] == group["length"].max()].iloc[0]
+        assert longest.loc[name, "start"] == best["start"]
+    table = longest_by_year(events)
+    expected = events.groupby(["year", "event"])["length"].max().unstack(fill_value=0)
+    assert_frame_equal(table, expected, check_dtype=False, check_names=False)
@@ -0,0 +1,101 @@
+"""``lttb`` against the textbook algorithm and the ``FigureCache`` LRU."""
+
+import numpy as np
+import plotly.graph_objects as go
+import pytest
+
+from figure_cache import FigureCache, figure_key, lttb
+
+
+def reference_lttb(x, y, n_out):
+    """Steinarsson's LTTB, one bucket at a time."""
+    n = len(y)
+    every = (n - 2) / (n_out - 2)
+    picked, a = [0], 0
+    for i in range(n_out - 2):
+        lo, hi = int(i * every) + 1, int((i + 1) * every) + 1
+        nlo, nhi = hi, min(int((i + 2) * every) + 1, n)
+        if i == n_out - 3:
+            avg_x, avg_y = x[n - 1], y[n - 1]
+        else:
+            avg_x, avg_y = np.mean(x[nlo:nhi]), np.mean(y[nlo:nhi])
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(np.argmax(area))
+        picked.append(a)
+    return picked + [n - 1]
+
+
+@pytest.fixture(scope="module")
+def series():
+    rng = np.random.default_rng(2)
+    x = np.arange(5000, dtype=np.float64)
+    return x, np.sin(x / 150) * 10 + rng.normal(0, 2, len(x))
+
+
+@pytest.mark.parametrize("n_out", [3, 10, 333, 2000])
+def test_matches_reference(series, n_out):
+    x, y = series
+    xs, ys = lttb(x, y, n_out)
+    assert len(xs) == n_out
+    assert (xs[0], ys[0], xs[-1], ys[-1]) == (x[0], y[0], x[-1], y[-1])
+    np.testing.assert_array_equal(xs, x[reference_lttb(x, y, n_out)])
+    np.testing.assert_array_equal(ys, y[xs.astype(int)])
+
+
+def test_short_inputs_are_unchanged(series):
+    x, y = series
+    for xs, ys in (lttb(x[:50], y[:50], 50), lttb(x[:50], y[:50], 80), lttb(x, y, 2)):
+        np.testing.assert_array_equal(ys, y[:len(ys)])
+        np.testing.assert_array_equal(xs, x[:len(xs)])
+
+
+def test_datetimes_and_nan(daily):
+    dates, values = daily["DATE"].to_numpy(), daily["Mean_Temp_C"].to_numpy().copy()
+    values[[0, 10, 11]] = np.nan
+    xs, ys = lttb(dates, values, 100)
+    assert xs.dtype == dates.dtype and len(xs) == 100
+    assert xs[0] == dates[1] and xs[-1] == dates[-1]
+    assert not np.isnan(ys).any() and (np.diff(xs.astype(np.int64)) > 0).all()
+
+
+def figure(title):
+    return go.Figure(go.Scatter(x=[1, 2, 3], y=[3, 1, 2]), layout={"title": title})
+
+
+def test_cache_builds_once_per_key():
+    cache, builds = FigureCache(), []
+    build = lambda: builds.append(1) or figure("a")  # noqa: E731
+    first = cache.get_or_build(("t", "fig"), build)
+    again = cache.get_or_build(("t", "fig"), build)
+    assert first == again and first["layout"]["title"]["text"] == "a"
+    assert (len(builds), cache.hits, cache.misses) == (1, 1, 1)
+
+
+def test_key_includes_dataset_version():
+    cache, builds = FigureCache(), []
+    build = lambda: builds.append(1) or figure("a")  # noqa: E731
+    cache.get_or_build(figure_key("Temperature", "daily", (5,), "station:1:10:"), build)
+    cache.get_or_build(figure_key("Temperature", "daily", [5], "station:1:10:"), build)
+    assert len(builds) == 1
+    cache.get_or_build(figure_key("Temperature", "daily", (5,), "station:1:10:2001-01-01T00:00:00"), build)
+    cache.get_or_build(figure_key("Temperature", "daily", (6,), "station:1:10:"), build)
+    assert len(builds) == 3
+
+
+def test_lru_bounds_entries_and_bytes():
+    cache = FigureCache(max_entries=2)
+    for key in "abc":
+        cache.get_or_build(key, lambda key=key: figure(key))
+    cache.get_or_build("b", lambda: pytest.fail("b should still be cached"))
+    assert len(cache) == 2 and cache.misses == 3
+
+    size = len(figure("a").to_json())
+    cache = FigureCache(max_bytes=2 * size)
+    cache.get_or_build("a", lambda: figure("a"))
+    cache.get_or_build("b", lambda: figure("b"))
+    cache.get_or_build("a", lambda: pytest.fail("a should still be cached"))
+    cache.get_or_build("c", lambda: figure("c"))  # evicts b, the least recently used
+    assert len(cache) == 2
+    cache.get_or_build("a", lambda: pytest.fail("a should still be cached"))
+    cache.get_or_build("b", lambda: figure("b"))
+    assert cache.misses == 4
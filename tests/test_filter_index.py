@@ -0,0 +1,102 @@
+"""``FilterIndex`` queries against a pandas boolean mask and groupby."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from filter_index import DIMENSIONS, HIERARCHIES, FilterIndex, active_filters
+
+FILTERS = {
+    "none": None,
+    "empty selections": {"Market": [], "Region": None, "Segment": ""},
+    "one region (cube)": {"Region": ["Central Asia"]},
+    "region and category (cube)": {"Region": "North Asia", "Category": ["Technology"]},
+    "several regions": {"Region": ["Africa", "Oceania", "Caribbean"]},
+    "drill-down parent": {"Market": ["APAC"]},
+    "parents and child": {"Market": ["EU", "LATAM"], "Country": ["Germany", "Brazil", "Egypt"]},
+    "across dimensions": {"Segment": ["Consumer", "Corporate"], "Ship_Mode": ["Same Day"],
+                          "Order_Priority": ["High", "Critical"]},
+    "no match": {"Category": ["Furniture"], "Sub-Category": ["Phones"]},
+    "unknown value": {"Region": ["Atlantis"]},
+}
+
+
+@pytest.fixture(scope="module")
+def index(orders):
+    return FilterIndex.from_frame(orders)
+
+
+@pytest.fixture(scope="module")
+def frame(orders):
+    df = orders[["Order_Date", *DIMENSIONS]].astype({dim: str for dim in DIMENSIONS})
+    df["Month"] = df["Order_Date"].dt.year * 12 + df["Order_Date"].dt.month - 1
+    return df.assign(Sales=orders["Sales"].astype(np.float64), Profit=orders["Profit"].astype(np.float64))
+
+
+def select(frame, filters, exclude=None):
+    mask = np.ones(len(frame), dtype=bool)
+    for dim, values in active_filters(filters).items():
+        if dim != exclude:
+            mask &= frame[dim].isin(values).to_numpy()
+    return frame[mask]
+
+
+@pytest.mark.parametrize("filters", FILTERS.values(), ids=FILTERS.keys())
+def test_kpis(index, frame, filters):
+    subset = select(frame, filters)
+    kpis = index.kpis(filters)
+    assert kpis["total_sales"] == pytest.approx(subset["Sales"].sum(), rel=1e-9, abs=1e-6)
+    assert kpis["total_profit"] == pytest.approx(subset["Profit"].sum(), rel=1e-9, abs=1e-6)
+    assert kpis["avg_order"] == pytest.approx(subset["Sales"].mean() if len(subset) else 0, rel=1e-9)
+
+
+@pytest.mark.parametrize("filters", FILTERS.values(), ids=FILTERS.keys())
+@pytest.mark.parametrize("dim, measure", [("Region", "Sales"), ("Category", "Profit"), ("Country", "Sales"),
+                                          ("Sub-Category", "Profit"), ("Segment", "Sales")])
+def test_breakdown(index, frame, filters, dim, measure):
+    expected = select(frame, filters).groupby(dim)[measure].sum().reset_index()
+    result = index.breakdown(dim, measure, filters)
+    assert_frame_equal(result.reset_index(drop=True), expected, check_dtype=False, rtol=1e-9)
+
+
+@pytest.mark.parametrize("filters", FILTERS.values(), ids=FILTERS.keys())
+@pytest.mark.parametrize("measure", ["Sales", "Profit"])
+def test_monthly(index, frame, filters, measure):
+    totals = select(frame, filters).groupby("Month")[measure].sum()
+    result = index.monthly(measure, filters)
+    if totals.empty:
+        assert result.empty and list(result.columns) == ["ds", "y"]
+        return
+    # a dense month-start series from the first to the last month with orders
+    totals = totals.reindex(range(totals.index.min(), totals.index.max() + 1), fill_value=0.0)
+    ds = pd.to_datetime({"year": totals.index // 12, "month": totals.index % 12 + 1, "day": 1})
+    assert_frame_equal(result, pd.DataFrame({"ds": ds.to_numpy(), "y": totals.to_numpy()}),
+                       check_dtype=False, check_freq=False, rtol=1e-9)
+
+
+@pytest.mark.parametrize("filters", FILTERS.values(), ids=FILTERS.keys())
+@pytest.mark.parametrize("dim", ["Market", "Country", "Region", "Sub-Category", "Ship_Mode"])
+def test_options(index, frame, filters, dim):
+    # a dimension's own selection never narrows its options
+    assert index.options(dim, filters) == sorted(select(frame, filters, exclude=dim)[dim].unique())
+
+
+@pytest.mark.parametrize("parent, child", HIERARCHIES.items())
+def test_drill_down_children(index, frame, parent, child):
+    for value in index.values(parent):
+        expected = sorted(frame.loc[frame[parent] == value, child].unique())
+        assert index.children[parent][value] == expected
+        assert index.options(child, {parent: [value]}) == expected
+        breakdown = index.breakdown(child, "Sales", {parent: value})
+        assert breakdown[child].tolist() == expected
+    several = index.values(parent)[:2]
+    assert index.options(child, {parent: several}) == sorted(frame.loc[frame[parent].isin(several), child].unique())
+
+
+def test_values_and_active_filters(index, frame):
+    for dim in DIMENSIONS:
+        assert index.values(dim) == sorted(frame[dim].unique())
+    assert index.regions == index.values("Region") and index.categories == index.values("Category")
+    assert active_filters({"Region": "Africa", "Market": [], "Segment": ("Consumer",), "Country": None}) == \
+        {"Region": ["Africa"], "Segment": ["Consumer"]}
@@ -0,0 +1,137 @@
+"""``ForecastRegistry`` training, reload and lock handling with the seasonal-naive fallback."""
+
+import os
+import pickle
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from forecast_registry import STALE_LOCK_SECONDS, ForecastRegistry, training_key
+from segment_forecasts import MIN_MONTHS, forecast_segments, seasonal_naive
+
+PARAMS = {"model": {"epochs": 1}, "horizons": (3, 6)}
+
+
+def series(months, start="2013-01-01", scale=1.0):
+    ds = pd.date_range(start, periods=months, freq="MS")
+    return pd.DataFrame({"ds": ds, "y": scale * (np.arange(months) % 12 + 1.0)})
+
+
+@pytest.fixture
+def segments():
+    # too short for a NeuralProphet fit, so every segment takes the seasonal-naive path
+    return {(None, None): series(18, scale=3.0), ("Africa", None): series(18),
+            ("Africa", "Technology"): series(5, start="2014-03-01")}
+
+
+def train(segments, params):
+    return forecast_segments(segments, params, max_workers=1)
+
+
+def test_seasonal_naive():
+    long, short = series(18), series(5)
+    np.testing.assert_array_equal(seasonal_naive(long, 14)["yhat1"], np.resize(long["y"].iloc[-12:], 14))
+    np.testing.assert_array_equal(seasonal_naive(short, 3)["yhat1"], [5.0] * 3)
+    assert seasonal_naive(long, 3)["ds"].tolist() == list(pd.date_range("2014-07-01", periods=3, freq="MS"))
+
+
+def test_train_reload_and_status(tmp_path, segments):
+    assert all(len(s) < MIN_MONTHS for s in segments.values())
+    registry = ForecastRegistry(str(tmp_path), train)
+    key = registry.ensure(segments, PARAMS)
+    assert key == training_key(segments, PARAMS) and registry.status(key) in ("training", "ready")
+    artifact = registry.wait(key, timeout=300)
+    assert registry.status(key) == "ready"
+    assert not os.path.exists(registry._lock_path(key))
+
+    assert set(artifact["method"].values()) == {"seasonal naive"}
+    for name, frame in segments.items():
+        assert artifact["models"][name] is None
+        for horizon in PARAMS["horizons"]:
+            expected = seasonal_naive(frame, max(PARAMS["horizons"])).iloc[:horizon]
+            pd.testing.assert_frame_equal(artifact["forecast"][(*name, horizon)], expected)
+
+    # another process (a fresh registry) loads the artifact instead of training
+    reloaded = ForecastRegistry(str(tmp_path), lambda s, p: pytest.fail("should not retrain"))
+    assert reloaded.status(key) == "ready"
+    assert reloaded.ensure(segments, PARAMS) == key and not reloaded._jobs
+    pd.testing.assert_frame_equal(reloaded.get(key)["forecast"][None, None, 6], artifact["forecast"][None, None, 6])
+
+    # different training data is a different artifact
+    assert training_key({**segments, (None, None): series(18, scale=4.0)}, PARAMS) != key
+    assert training_key(segments, {**PARAMS, "horizons": (12,)}) != key
+
+
+def test_waits_for_a_trainer_in_another_process(tmp_path, segments):
+    trained = []
+    registry = ForecastRegistry(str(tmp_path), lambda s, p: trained.append(1) or train(s, p))
+    key = training_key(segments, PARAMS)
+    with open(registry._lock_path(key), "w") as f:
+        f.write("12345")
+
+    registry.ensure(segments, PARAMS)
+    time.sleep(0.5)
+    assert registry.status(key) == "training" and not trained
+
+    # the lock holder finishes: artifact written, lock removed
+    with open(registry.artifact_path(key), "wb") as f:
+        pickle.dump({"from": "other process"}, f)
+    os.remove(registry._lock_path(key))
+    assert registry.wait(key, timeout=30) == {"from": "other process"}
+    assert registry.status(key) == "ready" and not trained
+
+
+def test_stale_lock_is_taken_over(tmp_path, segments):
+    registry = ForecastRegistry(str(tmp_path), train)
+    key = training_key(segments, PARAMS)
+    lock = registry._lock_path(key)
+    with open(lock, "w") as f:
+        f.write("12345")
+    old = time.time() - STALE_LOCK_SECONDS - 60
+    os.utime(lock, (old, old))
+
+    registry.ensure(segments, PARAMS)
+    assert registry.wait(key, timeout=300) is not None
+    assert not os.path.exists(lock)
+
+
+def test_failed_training_is_reported_and_retried(tmp_path, segments):
+    attempts = []
+
+    def flaky(series, params):
+        attempts.append(threading.current_thread().name)
+        if len(attempts) == 1:
+            raise RuntimeError("boom")
+        return {"ok": True}
+
+    registry = ForecastRegistry(str(tmp_path), flaky)
+    key = registry.ensure(segments, PARAMS)
+    assert registry.wait(key, timeout=30) is None and registry.status(key) == "failed"
+    assert not os.path.exists(registry._lock_path(key))
+    registry.ensure(segments, PARAMS)
+    assert registry.wait(key, timeout=30) == {"ok": True} and len(attempts) == 2
+
+
+def test_training_key_follows_the_data_not_its_layout(segments):
+    key = training_key(segments, PARAMS)
+    assert training_key(dict(reversed(list(segments.items()))), PARAMS) == key
+    as_float32 = {name: frame.astype({"y": "float32"}) for name, frame in segments.items()}
+    assert training_key(as_float32, {"horizons": (3, 6), "model": {"epochs": 1}}) == key
+    assert training_key(segments[None, None], PARAMS) != training_key({(None, None): segments[None, None]}, PARAMS)
+    later = segments["Africa", None].assign(ds=lambda f: f["ds"] + pd.DateOffset(months=1))
+    assert training_key({**segments, ("Africa", None): later}, PARAMS) != key
+
+
+def test_seasonal_naive_method_skips_neuralprophet(monkeypatch):
+    # a long series would normally be fitted; the method keeps it naive without importing torch
+    monkeypatch.setitem(sys.modules, "torch", None)
+    artifact = train({(None, None): series(MIN_MONTHS + 6)}, {**PARAMS, "method": "seasonal-naive"})
+    assert artifact["method"] == {(None, None): "seasonal naive"} and artifact["models"] == {(None, None): None}
+    np.testing.assert_array_equal(artifact["forecast"][(None, None, 6)]["yhat1"],
+                                  seasonal_naive(series(MIN_MONTHS + 6), 6)["yhat1"])
+    with pytest.raises(ValueError, match="Unknown forecast method"):
+        train({(None, None): series(5)}, {**PARAMS, "method": "arima"})
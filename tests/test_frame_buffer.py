@@ -0,0 +1,42 @@
+"""``FrameBuffer`` appends against ``pd.concat``."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from frame_buffer import ColumnBuffer, FrameBuffer
+
+
+def test_column_buffer_grows_geometrically():
+    buffer = ColumnBuffer(np.arange(8.0))
+    views = [buffer.values]
+    for start in range(8, 40, 4):
+        views.append(buffer.append(np.arange(start, start + 4.0)))
+    np.testing.assert_array_equal(buffer.values, np.arange(40.0))
+    # rows handed out earlier are never rewritten
+    for view in views:
+        np.testing.assert_array_equal(view, np.arange(len(view), dtype=np.float64))
+    assert len(buffer._data) < 2 * len(buffer)
+
+
+def test_appends_match_concat(daily):
+    bounds = [0, 1000, 1001, 1500, 2100, len(daily)]
+    pieces = [daily.iloc[lo:hi] for lo, hi in zip(bounds, bounds[1:])]
+    buffer = FrameBuffer(pieces[0])
+    frames = [buffer.frame]
+    for piece in pieces[1:]:
+        frames.append(buffer.append(piece.reset_index(drop=True)))
+    assert_frame_equal(frames[-1], daily.reset_index(drop=True))
+    for frame in frames[:-1]:
+        assert_frame_equal(frame, daily.iloc[:len(frame)].reset_index(drop=True))
+    assert isinstance(frames[-1]["month_name"].dtype, pd.CategoricalDtype)
+    assert np.shares_memory(buffer.frame["Mean_Temp_C"].to_numpy(), frames[-1]["Mean_Temp_C"].to_numpy())
+
+
+def test_rejects_other_categories(daily):
+    buffer = FrameBuffer(daily.iloc[:10])
+    other = daily.iloc[10:20].reset_index(drop=True)
+    other["month_name"] = other["month_name"].cat.rename_categories(str.upper)
+    with pytest.raises(ValueError, match="month_name"):
+        buffer.append(other)
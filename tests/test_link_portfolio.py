@@ -0,0 +1,43 @@
+"""``link_portfolio`` links only the static exports that were written."""
+
+import os
+
+import pytest
+
+from link_portfolio import link_portfolio
+
+PAGE = """<section>
+  <div class="cta">
+    <!-- static-dashboards: links are added here by the Pages build -->
+  </div>
+</section>
+"""
+
+
+@pytest.fixture
+def site(tmp_path):
+    (tmp_path / "index.html").write_text(PAGE, encoding="utf-8")
+    return tmp_path
+
+
+def publish(site, name):
+    os.makedirs(site / "dashboards" / name)
+    (site / "dashboards" / name / "manifest.json").write_text("{}", encoding="utf-8")
+
+
+def test_links_only_published_exports(site):
+    publish(site, "climate")
+    os.makedirs(site / "dashboards" / "superstore")  # started but never finished
+    assert link_portfolio(str(site / "index.html"), str(site / "dashboards")) == ["climate"]
+    page = (site / "index.html").read_text(encoding="utf-8")
+    assert 'href="dashboards/climate/"' in page and "superstore" not in page
+    assert "<!-- static-dashboards" not in page
+    assert '    <a href="dashboards/climate/"' in page  # indented like the marker
+
+
+def test_no_exports_leave_no_links(site):
+    assert link_portfolio(str(site / "index.html"), str(site / "dashboards")) == []
+    page = (site / "index.html").read_text(encoding="utf-8")
+    assert "<a " not in page and "static-dashboards" not in page
+    with pytest.raises(ValueError, match="marker"):
+        link_portfolio(str(site / "index.html"), str(site / "dashboards"))
@@ -0,0 +1,149 @@
+"""``OrderStore`` ingest (idempotence, the cross-process lock) and its pushed-down aggregates."""
+
+import importlib.util
+import os
+import shutil
+import sys
+import threading
+import types
+
+import numpy as np
+import pytest
+
+import order_store
+from filter_index import DIMENSIONS, active_filters
+from order_store import OrderStore, store_key
+
+FILTERS = [
+    None,
+    {"Region": ["Africa", "Oceania"]},
+    {"Market": ["APAC"], "Segment": "Consumer"},
+    {"Category": ["Furniture"], "Sub-Category": ["Phones"]},
+]
+
+
+@pytest.fixture
+def csv_copy(superstore_csv, tmp_path):
+    # the store and its lock live next to the CSV
+    return shutil.copy(superstore_csv, tmp_path / "Global_Superstore2.csv")
+
+
+@pytest.fixture
+def ingests(monkeypatch):
+    calls = []
+    real = OrderStore._ingest
+
+    def counting(self, csv_path, chunksize):
+        calls.append(csv_path)
+        return real(self, csv_path, chunksize)
+
+    monkeypatch.setattr(OrderStore, "_ingest", counting)
+    return calls
+
+
+@pytest.fixture(scope="module")
+def store(superstore_csv, tmp_path_factory):
+    return OrderStore.open(superstore_csv, "sqlite:///" + str(tmp_path_factory.mktemp("store") / "orders.sqlite"))
+
+
+@pytest.fixture(scope="module")
+def frame(orders):
+    df = orders[["Order_Date", *DIMENSIONS]].astype({dim: str for dim in DIMENSIONS})
+    df["Month"] = df["Order_Date"].dt.year * 12 + df["Order_Date"].dt.month - 1
+    return df.assign(Sales=orders["Sales"].astype(np.float64), Profit=orders["Profit"].astype(np.float64))
+
+
+def select(frame, filters):
+    mask = np.ones(len(frame), dtype=bool)
+    for dim, values in active_filters(filters).items():
+        mask &= frame[dim].isin(values).to_numpy()
+    return frame[mask]
+
+
+def row_count(store):
+    with store.engine.connect() as conn:
+        return conn.exec_driver_sql("SELECT COUNT(*) FROM orders").scalar()
+
+
+def test_ingest_is_idempotent(csv_copy, ingests, orders):
+    store = OrderStore.open(csv_copy)
+    again = OrderStore.open(csv_copy)
+    again.ingest(csv_copy)
+    assert len(ingests) == 1
+    assert again.source() == store_key(csv_copy)
+    assert row_count(store) == row_count(again) == len(orders)
+
+    # a changed CSV is re-ingested once, replacing (not adding to) the rows
+    os.utime(csv_copy, ns=(0, os.stat(csv_copy).st_mtime_ns + 10**9))
+    OrderStore.open(csv_copy)
+    OrderStore.open(csv_copy)
+    assert len(ingests) == 2 and row_count(store) == len(orders)
+
+
+def test_lock_is_released_when_ingest_fails(csv_copy, monkeypatch):
+    store = OrderStore(order_store.default_url(csv_copy))
+    monkeypatch.setattr(OrderStore, "_ingest", lambda self, csv_path, chunksize: 1 / 0)
+    with pytest.raises(ZeroDivisionError):
+        store.ingest(csv_copy)
+    assert store.source() is None
+    monkeypatch.undo()
+
+    # a second ingest from another thread (its own lock file handle) must not block
+    worker = threading.Thread(target=store.ingest, args=(csv_copy,), daemon=True)
+    worker.start()
+    worker.join(timeout=60)
+    assert not worker.is_alive() and store.source() == store_key(csv_copy)
+
+
+@pytest.mark.parametrize("filters", FILTERS)
+def test_aggregates_match_the_csv(store, frame, filters):
+    subset = select(frame, filters)
+    kpis = store.kpis(filters)
+    assert kpis["total_sales"] == pytest.approx(subset["Sales"].sum(), rel=1e-9, abs=1e-6)
+    assert kpis["total_profit"] == pytest.approx(subset["Profit"].sum(), rel=1e-9, abs=1e-6)
+    assert kpis["avg_order"] == pytest.approx(subset["Sales"].mean() if len(subset) else 0, rel=1e-9)
+
+    for dim, measure in [("Region", "Sales"), ("Country", "Profit"), ("Sub-Category", "Sales")]:
+        expected = subset.groupby(dim)[measure].sum()
+        result = store.breakdown(dim, measure, filters)
+        assert result[dim].tolist() == expected.index.tolist()
+        np.testing.assert_allclose(result[measure].astype(np.float64), expected.to_numpy(), rtol=1e-9)
+
+    monthly = store.monthly("Sales", filters)
+    totals = subset.groupby("Month")["Sales"].sum()
+    assert monthly["y"].sum() == pytest.approx(totals.sum(), rel=1e-9, abs=1e-6)
+    if len(totals):
+        assert len(monthly) == totals.index.max() - totals.index.min() + 1
+        np.testing.assert_allclose(monthly["y"].to_numpy()[totals.index - totals.index.min()], totals, rtol=1e-9)
+
+
+def test_options_values_and_segments(store, frame):
+    for dim in DIMENSIONS:
+        assert store.values(dim) == sorted(frame[dim].unique())
+    assert store.options("Country", {"Market": ["EU"], "Country": ["Nowhere"]}) == \
+        sorted(frame.loc[frame["Market"] == "EU", "Country"].unique())
+
+    segments = store.segments("Profit")
+    assert len(segments) == (len(store.regions) + 1) * (len(store.categories) + 1)
+    for (region, category), series in segments.items():
+        subset = select(frame, {"Region": region, "Category": category})
+        assert series["y"].sum() == pytest.approx(subset["Profit"].sum(), rel=1e-9, abs=1e-6)
+
+
+def test_imports_and_locks_without_fcntl(monkeypatch, tmp_path):
+    # Windows has neither fcntl nor os.register_at_fork; msvcrt locks a byte range instead
+    calls = []
+    msvcrt = types.SimpleNamespace(LK_LOCK=1, LK_UNLCK=0, locking=lambda fd, mode, n: calls.append(mode))
+    monkeypatch.setitem(sys.modules, "fcntl", None)
+    monkeypatch.setitem(sys.modules, "msvcrt", msvcrt)
+    monkeypatch.delattr(os, "register_at_fork")
+    spec = importlib.util.spec_from_file_location("order_store_windows", order_store.__file__)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    assert module.fcntl is None
+    with pytest.raises(RuntimeError):
+        with module._ingest_lock(str(tmp_path / "orders.csv")):
+            assert calls == [msvcrt.LK_LOCK]
+            raise RuntimeError
+    assert calls == [msvcrt.LK_LOCK, msvcrt.LK_UNLCK]
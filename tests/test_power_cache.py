@@ -0,0 +1,143 @@
+"""``power_cache`` ingest and appends, and the incremental engines fed by them."""
+
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from aggregates import bin_daily
+from conftest import prepare
+from covariance import MomentsCube
+from power_cache import (append_days, appended_through, cache_files, cache_path_for, load_power_table,
+                         load_power_tail, manifest_path_for)
+from power_reader import read_power
+from pv_yield import DAY_FIELDS, PVWeather
+from station_store import StationStore
+from synthetic_data import write_power_csv
+
+
+def _digest(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _measures(df):
+    return df.drop(columns="DATE").reset_index(drop=True)
+
+
+@pytest.fixture
+def exports(tmp_path):
+    """A 5-year station export and a 6-year export of the same station (2000–2005)."""
+    base = tmp_path / "station" / "POWER_Point_Daily_base.csv"
+    base.parent.mkdir()
+    full = tmp_path / "POWER_Point_Daily_full.csv"
+    write_power_csv(base, years=5, missing=0.01)
+    write_power_csv(full, years=6, missing=0.01)
+    return str(base), str(full)
+
+
+def test_cache_matches_csv(power_csv):
+    _, expected = read_power(power_csv)
+    table = load_power_table(power_csv)
+    assert_frame_equal(_measures(table), expected)
+    assert table["DATE"].is_monotonic_increasing
+    assert table["DATE"].iloc[0] == pd.Timestamp("2000-01-01")
+
+
+def test_append_leaves_csv_untouched(exports):
+    base, full = exports
+    load_power_table(base)
+    before = (_digest(base), os.stat(base).st_mtime_ns)
+
+    added = append_days(base, full)
+    assert len(added) == 365
+    assert added["DATE"].iloc[0] == pd.Timestamp("2005-01-01")
+    assert (_digest(base), os.stat(base).st_mtime_ns) == before
+    assert appended_through(base) == "2005-12-31T00:00:00"
+
+    # days already in the cache are ignored
+    assert append_days(base, full).empty
+    assert len(cache_files(cache_path_for(base))) == 2
+
+
+def test_append_matches_full_reload(exports):
+    base, full = exports
+    load_power_table(base)
+    append_days(base, full)
+    _, expected = read_power(full)
+    assert_frame_equal(_measures(load_power_table(base)), expected)
+
+    tail = load_power_tail(base, since="2004-12-31")
+    assert len(tail) == 365 and tail["DATE"].min() == pd.Timestamp("2005-01-01")
+    assert load_power_tail(base, since="2005-12-31").empty
+
+
+def test_replacing_the_csv_drops_appended_days(exports):
+    base, full = exports
+    load_power_table(base)
+    append_days(base, full)
+    write_power_csv(base, years=5, seed=1)
+
+    assert load_power_tail(base, since="2004-12-31") is None
+    assert not os.path.exists(manifest_path_for(cache_path_for(base)))
+    assert appended_through(base) is None
+    assert load_power_table(base)["DATE"].iloc[-1] == pd.Timestamp("2004-12-31")
+
+
+def test_incremental_engines_match_full_reload(exports):
+    base, full = exports
+    old = load_power_table(base)
+    append_days(base, full)
+    tail = load_power_tail(base, since=old["DATE"].iloc[-1])
+    everything = load_power_table(full)
+
+    stats = bin_daily(prepare(old)).update(bin_daily(prepare(tail)))
+    expected = bin_daily(prepare(everything))
+    for part in ("rows", "sums", "counts", "mins", "maxs"):
+        np.testing.assert_allclose(getattr(stats, part), getattr(expected, part), rtol=1e-12)
+
+    variables = ["T2M", "PRECTOTCORR", "ALLSKY_SFC_SW_DWN", "WS10M"]
+    merged = MomentsCube(variables).add_frame(old) + MomentsCube(variables).add_frame(tail)
+    assert_frame_equal(merged.select().corr(), MomentsCube(variables).add_frame(everything).select().corr(),
+                       rtol=1e-10)
+
+    # the second append starts mid-February, continuing the old last month
+    weather = PVWeather.from_frame(old, 32.9).extend(tail.iloc[:45]).extend(tail.iloc[45:])
+    expected = PVWeather.from_frame(everything, 32.9)
+    for name in (*DAY_FIELDS, "month_codes", "coverage", "_month_starts"):
+        np.testing.assert_array_equal(getattr(weather, name), getattr(expected, name), err_msg=name)
+
+
+def test_station_store_picks_up_appended_days(exports):
+    base, full = exports
+    appended = []
+    store = StationStore(os.path.dirname(base), loader=lambda path, cache_dir: load_power_table(path, cache_dir=cache_dir),
+                         appender=lambda previous, path, cache_dir: appended.append(path) or previous)
+    station_id = os.path.splitext(os.path.basename(base))[0]
+    store.load(station_id)
+    version = store.version(station_id)
+    assert not store.refresh(force=True)
+
+    append_days(base, full, store.cache_dir)
+    assert store.refresh(force=True)
+    assert store.index.loc[station_id, "end"] == pd.Timestamp("2005-12-31")
+    assert store.version(station_id) != version
+    store.load(station_id)
+    assert appended == [os.path.abspath(base)]
+
+
+def test_disk_eviction_keeps_appended_days(exports):
+    base, full = exports
+    other = os.path.join(os.path.dirname(base), "POWER_Point_Daily_other.csv")
+    write_power_csv(other, years=1)
+    store = StationStore(os.path.dirname(base), loader=lambda path, cache_dir: load_power_table(path, cache_dir=cache_dir),
+                         max_disk_mb=0)
+    store.load("POWER_Point_Daily_base")
+    append_days(base, full, store.cache_dir)
+    store.load("POWER_Point_Daily_other")
+
+    base_files = cache_files(cache_path_for(base, store.cache_dir))
+    assert len(base_files) == 2 and all(os.path.exists(p) for p in base_files)
@@ -0,0 +1,88 @@
+"""``power_reader`` header parsing and fill-value masking."""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from conftest import CLIMATE_DIR
+from power_reader import iter_power_chunks, read_header, read_power
+from synthetic_data import POWER_PARAMETERS, power_header
+
+REPO_CSV = os.path.join(CLIMATE_DIR, "POWER_Point_Daily_20000101_20241231_032d93N_072d86E_LST.csv")
+
+
+def write_export(path, rows, header=None, columns="YEAR,MO,DY,T2M,PRECTOTCORR"):
+    header = header or power_header(pd.Timestamp("2001-01-01"), pd.Timestamp("2001-01-03"))
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(header + columns + "\n" + "".join(row + "\n" for row in rows))
+    return str(path)
+
+
+def test_repo_export_header():
+    header = read_header(REPO_CSV)
+    assert (header.latitude, header.longitude, header.elevation) == (32.9348, 72.8576, 448.45)
+    assert header.fill_value == -999.0
+    assert (header.start, header.end) == (pd.Timestamp("2000-01-01"), pd.Timestamp("2024-12-31"))
+    assert list(header.parameters) == header.measure_columns
+    with open(REPO_CSV, encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    # data_start rows are skipped, so the next line is the column row
+    assert lines[header.data_start].split(",") == header.columns
+    assert lines[header.data_start - 1] == "-END HEADER-"
+
+
+@pytest.mark.parametrize("messages", [0, 1, 7])
+def test_header_length_is_detected(tmp_path, messages):
+    header = power_header(pd.Timestamp("2001-01-01"), pd.Timestamp("2001-01-03"))
+    extra = "".join(f"Message line {i} \n" for i in range(messages))
+    header = header.replace("-END HEADER-", extra + "-END HEADER-")
+    path = write_export(tmp_path / "export.csv", ["2001,1,1,10.5,0.00", "2001,1,2,11.0,3.25"], header)
+
+    parsed = read_header(path)
+    assert parsed.data_start == header.count("\n")
+    assert parsed.columns == ["YEAR", "MO", "DY", "T2M", "PRECTOTCORR"]
+    assert set(parsed.parameters) == {name for name, _, _ in POWER_PARAMETERS}
+    _, df = read_power(path)
+    assert df["T2M"].tolist() == [10.5, 11.0]
+
+
+def test_fill_values_become_nan(tmp_path):
+    rows = ["2001,1,1,-999,0.00", "2001,1,2,12.25,-999.00", "2001,1,3,-999.0,-999"]
+    _, df = read_power(write_export(tmp_path / "export.csv", rows))
+    assert df["T2M"].isna().tolist() == [True, False, True]
+    assert df["PRECTOTCORR"].isna().tolist() == [False, True, True]
+    assert df["T2M"].dtype == np.float32
+    assert df["DY"].tolist() == [1, 2, 3]  # date parts are never masked
+
+
+def test_header_fill_value_is_used(tmp_path):
+    header = power_header(pd.Timestamp("2001-01-01"), pd.Timestamp("2001-01-02")).replace(": -999 ", ": -99 ")
+    path = write_export(tmp_path / "export.csv", ["2001,1,1,-99,-999", "2001,1,2,5.5,1.0"], header)
+    assert read_header(path).fill_value == -99.0
+    _, df = read_power(path)
+    assert np.isnan(df["T2M"].iloc[0]) and df["PRECTOTCORR"].iloc[0] == -999.0
+
+
+def test_matches_pandas_and_chunking(power_csv):
+    header, df = read_power(power_csv, columns=["T2M", "WS10M"])
+    expected = pd.read_csv(power_csv, skiprows=header.data_start, usecols=["YEAR", "MO", "DY", "T2M", "WS10M"])
+    expected = expected.replace(-999.0, np.nan).astype({"T2M": "float32", "WS10M": "float32"})
+    assert_frame_equal(df, expected, check_dtype=False)
+    chunked = pd.concat(iter_power_chunks(power_csv, ["T2M", "WS10M"], chunksize=333), ignore_index=True)
+    assert_frame_equal(chunked, df)
+
+
+def test_rejects_bad_files(tmp_path):
+    not_power = tmp_path / "plain.csv"
+    not_power.write_text("YEAR,MO,DY\n2001,1,1\n")
+    with pytest.raises(ValueError, match="BEGIN HEADER"):
+        read_header(str(not_power))
+    truncated = tmp_path / "truncated.csv"
+    truncated.write_text("-BEGIN HEADER-\nNASA/POWER\n")
+    with pytest.raises(ValueError, match="END HEADER"):
+        read_header(str(truncated))
+    with pytest.raises(ValueError, match="not in"):
+        read_power(write_export(tmp_path / "export.csv", ["2001,1,1,1,1"]), columns=["WS10M"])
@@ -0,0 +1,88 @@
+"""``PVWeather.simulate`` against a day-by-day ``daily_yield`` loop, and its monthly / yearly tables."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pv_yield import PV_PARAMETERS, PVWeather, system_grid
+
+LATITUDE = 32.9
+
+
+@pytest.fixture(scope="module")
+def weather_frame(daily):
+    # two years, so the yearly table has more than one row; the fixture has 1% missing days
+    df = daily[daily["DATE"].between("2001-01-01", "2002-12-31")].rename(
+        columns={"Mean_Temp_C": "T2M", "Solar_Irradiance_kWh_per_m²_per_day": "ALLSKY_SFC_SW_DWN"})
+    return df[["DATE", "YEAR", "MO", *PV_PARAMETERS]].reset_index(drop=True)
+
+
+@pytest.fixture(scope="module")
+def configs():
+    return system_grid([0, 20, 33], capacities=(1.0, 5.0), losses=(0.1, 0.14), temp_coeffs=(-0.003, -0.005))
+
+
+@pytest.fixture(scope="module")
+def per_day(weather_frame, configs):
+    """Energy, clear-sky energy and reference yield of every config, one single-day weather at a time."""
+    rows = []
+    for i in range(len(weather_frame)):
+        day = PVWeather.from_frame(weather_frame.iloc[[i]], LATITUDE)
+        if not day.valid[0]:
+            continue
+        reference = configs["capacity_kw"].to_numpy() * day.plane_of_array(configs["tilt"].to_numpy())[:, 0]
+        rows.append(pd.DataFrame({
+            "config": configs.index, "year": day.months[0] // 12, "month": day.months[0] % 12 + 1,
+            "energy": day.daily_yield(configs)[:, 0], "clear": day.daily_yield(configs, clear=True)[:, 0],
+            "reference": reference,
+        }))
+    days = pd.concat(rows, ignore_index=True)
+    monthly = days.groupby(["config", "year", "month"]).agg(
+        energy=("energy", "sum"), clear=("clear", "sum"), reference=("reference", "sum"), days=("energy", "size"))
+    # months with missing days are scaled up to the whole month
+    length = pd.to_datetime(pd.DataFrame({"year": monthly.index.get_level_values("year"),
+                                          "month": monthly.index.get_level_values("month"), "day": 1}))
+    fill = length.dt.days_in_month.to_numpy() / monthly["days"].to_numpy()
+    return monthly[["energy", "clear", "reference"]].mul(fill, axis=0)
+
+
+@pytest.fixture(scope="module")
+def result(weather_frame, configs):
+    return PVWeather.from_frame(weather_frame, LATITUDE).simulate(configs)
+
+
+def test_batch_matches_the_per_day_loop(weather_frame, configs, result):
+    weather = PVWeather.from_frame(weather_frame, LATITUDE)
+    assert (~weather.valid).sum() > 0  # missing days are exercised
+    daily = weather.daily_yield(configs)
+    for i in range(0, len(weather_frame), 97):
+        one = PVWeather.from_frame(weather_frame.iloc[[i]], LATITUDE).daily_yield(configs)[:, 0]
+        np.testing.assert_allclose(daily[:, i], one, rtol=1e-12)
+    assert result.energy.shape == (len(configs), 24)
+
+
+def test_monthly_table(result, per_day, configs):
+    monthly = result.monthly().set_index(["config", "year", "month"])
+    assert len(monthly) == len(configs) * 24
+    np.testing.assert_allclose(monthly["Yield_kWh"], per_day["energy"], rtol=1e-10)
+    np.testing.assert_allclose(monthly["Clear_Sky_kWh"], per_day["clear"], rtol=1e-10)
+    np.testing.assert_allclose(monthly["Performance_Ratio"], per_day["energy"] / per_day["reference"], rtol=1e-10)
+    np.testing.assert_allclose(monthly["Clear_Sky_Ratio"], per_day["energy"] / per_day["clear"], rtol=1e-10)
+    capacity = configs["capacity_kw"].reindex(monthly.index.get_level_values("config")).to_numpy()
+    np.testing.assert_allclose(monthly["Specific_Yield_kWh_per_kWp"], per_day["energy"] / capacity, rtol=1e-10)
+
+
+def test_yearly_table_and_summary(result, per_day, configs):
+    yearly = result.yearly().set_index(["config", "year"])
+    expected = per_day.groupby(["config", "year"]).sum()
+    np.testing.assert_allclose(yearly["Yield_kWh"], expected["energy"], rtol=1e-10)
+    np.testing.assert_allclose(yearly["Clear_Sky_kWh"], expected["clear"], rtol=1e-10)
+    assert (yearly["months"] == 12).all()
+
+    summary = result.summary()
+    assert list(summary.index) == list(configs.index)
+    np.testing.assert_allclose(summary["Yield_kWh"], expected["energy"].groupby("config").mean(), rtol=1e-10)
+    # losses and a larger temperature coefficient only ever lower the yield of the same tilt and size
+    best = summary.loc[(summary["losses"] == 0.1) & (summary["temp_coeff"] == -0.003)]
+    worst = summary.loc[(summary["losses"] == 0.14) & (summary["temp_coeff"] == -0.005)]
+    assert (best["Specific_Yield_kWh_per_kWp"].to_numpy() > worst["Specific_Yield_kWh_per_kWp"].to_numpy()).all()
@@ -0,0 +1,89 @@
+"""``SalesCube`` slices against a pandas groupby of the order lines."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from sales_cube import SalesCube
+
+CELLS = [(None, None), ("Africa", None), (None, "Technology"), ("EMEA", "Furniture"), ("Canada", "Office Supplies")]
+
+
+@pytest.fixture(scope="module")
+def cube(orders):
+    return SalesCube.from_frame(orders)
+
+
+@pytest.fixture(scope="module")
+def frame(orders):
+    df = orders[["Order_Date", "Region", "Category"]].astype({"Region": str, "Category": str})
+    df["Month"] = df["Order_Date"].dt.to_period("M").dt.to_timestamp()
+    return df.assign(Sales=orders["Sales"].astype(np.float64), Profit=orders["Profit"].astype(np.float64))
+
+
+def select(frame, region, category):
+    mask = np.ones(len(frame), dtype=bool)
+    if region:
+        mask &= (frame["Region"] == region).to_numpy()
+    if category:
+        mask &= (frame["Category"] == category).to_numpy()
+    return frame[mask]
+
+
+def test_axes(cube, frame):
+    assert cube.regions == sorted(frame["Region"].unique())
+    assert cube.categories == sorted(frame["Category"].unique())
+    assert cube.months[0] == frame["Month"].min() and cube.months[-1] == frame["Month"].max()
+    assert cube.values["Sales"].shape == (len(cube.regions) + 1, len(cube.categories) + 1, len(cube.months))
+    assert cube.values["Orders"].sum() == 4 * len(frame)  # each line once per marginal combination
+
+
+@pytest.mark.parametrize("region, category", CELLS)
+def test_kpis_and_breakdowns(cube, frame, region, category):
+    subset = select(frame, region, category)
+    kpis = cube.kpis(region, category)
+    assert kpis["total_sales"] == pytest.approx(subset["Sales"].sum(), rel=1e-9)
+    assert kpis["total_profit"] == pytest.approx(subset["Profit"].sum(), rel=1e-9)
+    assert kpis["avg_order"] == pytest.approx(subset["Sales"].mean(), rel=1e-9)
+
+    for result, dim, measure in [(cube.by_region("Sales", region, category), "Region", "Sales"),
+                                 (cube.by_category("Profit", region, category), "Category", "Profit")]:
+        expected = subset.groupby(dim)[measure].sum().reset_index()
+        assert_frame_equal(result, expected, check_dtype=False, rtol=1e-9)
+
+
+@pytest.mark.parametrize("region, category", CELLS)
+@pytest.mark.parametrize("measure", ["Sales", "Profit"])
+def test_monthly(cube, frame, region, category, measure):
+    totals = select(frame, region, category).groupby("Month")[measure].sum()
+    totals = totals.reindex(pd.date_range(totals.index.min(), totals.index.max(), freq="MS"), fill_value=0.0)
+    result = cube.monthly(measure, region, category)
+    assert_frame_equal(result, pd.DataFrame({"ds": totals.index, "y": totals.to_numpy()}),
+                       check_dtype=False, check_freq=False, rtol=1e-9)
+
+
+def test_segments_cover_every_pair(cube, frame):
+    segments = cube.segments("Sales")
+    pairs = set(frame.groupby(["Region", "Category"]).size().index)
+    expected = {(None, None)} | {(r, None) for r, _ in pairs} | {(None, c) for _, c in pairs} | pairs
+    assert set(segments) == expected
+    for (region, category), series in segments.items():
+        assert series["y"].sum() == pytest.approx(select(frame, region, category)["Sales"].sum(), rel=1e-9)
+
+
+def test_empty_cells_and_gaps():
+    df = pd.DataFrame({
+        "Order_Date": pd.to_datetime(["2012-01-15", "2012-03-02", "2012-03-20"]),
+        "Region": pd.Categorical(["A", "B", "B"], categories=["A", "B", "Unused"]),
+        "Category": ["Technology", "Furniture", "Furniture"],
+        "Sales": [10.0, 20.0, 5.0],
+        "Profit": [1.0, -2.0, 0.5],
+    })
+    cube = SalesCube.from_frame(df)
+    assert cube.regions == ["A", "B"]  # unused categories get no slot
+    assert cube.monthly("Sales", "A", "Furniture").empty
+    assert cube.kpis("A", "Furniture") == {"total_sales": 0, "total_profit": 0, "avg_order": 0}
+    assert cube.monthly("Sales")["y"].tolist() == [10.0, 0.0, 25.0]
+    assert cube.by_region("Sales", category="Furniture")["Region"].tolist() == ["B"]
+    assert cube.by_category("Profit", region="A")["Profit"].tolist() == [1.0]
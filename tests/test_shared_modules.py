@@ -0,0 +1,17 @@
+"""Modules both projects ship a copy of must stay identical."""
+
+import filecmp
+import os
+
+import pytest
+
+from conftest import ROOT
+
+PROJECTS = [os.path.join(ROOT, "projects", name) for name in ("Chakwal_Climate_Solar_Trends", "Global_Superstore_Analysis")]
+
+
+@pytest.mark.parametrize("module", ["instrumentation.py", "lazy_import.py"])
+def test_copies_are_identical(module):
+    first, second = (os.path.join(project, module) for project in PROJECTS)
+    assert not os.path.islink(first) and not os.path.islink(second)
+    assert filecmp.cmp(first, second, shallow=False), f"{module} differs between the projects"
@@ -0,0 +1,121 @@
+"""``StationStore`` index refresh and its memory / disk LRU eviction."""
+
+import os
+
+import pandas as pd
+import pytest
+
+import station_store
+from power_cache import cache_path_for, load_power_table
+from station_store import StationStore
+from synthetic_data import write_power_csv
+
+STATIONS = {"POWER_a": 31.5, "POWER_b": 32.0, "POWER_c": 32.5}
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    for station_id, lat in STATIONS.items():
+        write_power_csv(tmp_path / f"{station_id}.csv", years=1, lat=lat)
+    (tmp_path / "notes.csv").write_text("not,a,power,export\n")
+    (tmp_path / "readme.txt").write_text("ignored\n")
+    return tmp_path
+
+
+@pytest.fixture
+def header_reads(monkeypatch):
+    reads = []
+
+    def counting(path):
+        reads.append(os.path.basename(path))
+        return read_header(path)
+
+    read_header = station_store.read_header
+    monkeypatch.setattr(station_store, "read_header", counting)
+    return reads
+
+
+def cached_loader(path, cache_dir):
+    return load_power_table(path, cache_dir=cache_dir)
+
+
+def test_index_comes_from_headers(data_dir):
+    index = StationStore(data_dir, loader=None).index
+    assert list(index.index) == sorted(STATIONS)
+    assert index["lat"].to_dict() == STATIONS
+    assert (index["start"] == pd.Timestamp("2000-01-01")).all() and (index["end"] == pd.Timestamp("2000-12-31")).all()
+    assert "T2M" in index.loc["POWER_a", "parameters"]
+    with pytest.raises(KeyError):
+        StationStore(data_dir, loader=None).station("notes")
+
+
+def test_refresh_only_rereads_changed_files(data_dir, header_reads):
+    store = StationStore(data_dir, loader=None)
+    assert sorted(header_reads) == sorted([f"{s}.csv" for s in STATIONS] + ["notes.csv"])
+
+    # a new store starts from the persisted index; the non-POWER file is re-checked
+    header_reads.clear()
+    store = StationStore(data_dir, loader=None)
+    assert header_reads == ["notes.csv"]
+
+    header_reads.clear()
+    version = store.version("POWER_b")
+    write_power_csv(data_dir / "POWER_b.csv", years=2, lat=STATIONS["POWER_b"])
+    os.remove(data_dir / "POWER_c.csv")
+    assert not store.refresh()  # within the refresh interval
+    assert store.refresh(force=True)
+    assert header_reads == ["POWER_b.csv", "notes.csv"]
+    assert store.version("POWER_b") != version
+    assert store.index.loc["POWER_b", "end"] == pd.Timestamp("2001-12-31")
+    assert "POWER_c" not in store.index.index
+
+
+def test_memory_lru(data_dir):
+    loads = []
+    store = StationStore(data_dir, loader=lambda path, cache_dir: loads.append(os.path.basename(path)) or path,
+                         max_stations=2)
+    for station_id in ("POWER_a", "POWER_b", "POWER_a", "POWER_c"):
+        store.load(station_id)
+    # a was used more recently than b, so b made room for c
+    assert loads == ["POWER_a.csv", "POWER_b.csv", "POWER_c.csv"]
+    store.load("POWER_a")
+    store.load("POWER_b")
+    assert loads[3:] == ["POWER_b.csv"]
+
+
+def test_changed_station_is_reloaded_or_appended(data_dir):
+    calls = []
+    store = StationStore(data_dir, loader=lambda path, cache_dir: calls.append("load") or 1)
+    store.load("POWER_a")
+    write_power_csv(data_dir / "POWER_a.csv", years=2, lat=STATIONS["POWER_a"])
+    store.refresh(force=True)
+    store.load("POWER_a")
+    assert calls == ["load", "load"]
+
+    store = StationStore(data_dir, loader=lambda path, cache_dir: 1,
+                         appender=lambda previous, path, cache_dir: calls.append("append") or previous + 1)
+    assert store.load("POWER_b") == 1
+    write_power_csv(data_dir / "POWER_b.csv", years=2, lat=STATIONS["POWER_b"])
+    store.refresh(force=True)
+    assert store.load("POWER_b") == 2 and calls[-1] == "append"
+
+
+def test_disk_eviction_keeps_the_budget_and_the_current_station(data_dir):
+    def cached():
+        return {s: os.path.exists(cache_path_for(data_dir / f"{s}.csv", store.cache_dir)) for s in STATIONS}
+
+    store = StationStore(data_dir, loader=cached_loader, max_disk_mb=1)
+    for station_id in STATIONS:
+        store.load(station_id)
+    sizes = {s: os.path.getsize(cache_path_for(data_dir / f"{s}.csv", store.cache_dir)) for s in STATIONS}
+    assert sum(sizes.values()) < 2**20 and all(cached().values())
+
+    # eviction runs on a memory miss: a fresh store loading b makes a the least recently used
+    store = StationStore(data_dir, loader=cached_loader, max_disk_mb=(sizes["POWER_b"] + sizes["POWER_c"]) / 2**20)
+    store.load("POWER_b")
+    assert cached() == {"POWER_a": False, "POWER_b": True, "POWER_c": True}
+
+    store = StationStore(data_dir, loader=cached_loader, max_disk_mb=0)
+    store.load("POWER_a")
+    assert cached() == {"POWER_a": True, "POWER_b": False, "POWER_c": False}
+    assert os.path.exists(store.index_path)
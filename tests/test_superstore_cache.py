@@ -0,0 +1,71 @@
+"""``superstore_cache`` typed Arrow round-trip, projection and re-ingest on change."""
+
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+import superstore_cache
+from superstore_cache import cache_path_for, cached_key, load_orders, parse_dates, read_orders_csv, source_key
+
+
+@pytest.fixture
+def csv_copy(superstore_csv, tmp_path):
+    return str(shutil.copy(superstore_csv, tmp_path / "Global_Superstore2.csv"))
+
+
+@pytest.fixture
+def ingests(monkeypatch):
+    calls = []
+    real = superstore_cache.ingest
+    monkeypatch.setattr(superstore_cache, "ingest", lambda *args: calls.append(args) or real(*args))
+    return calls
+
+
+def test_round_trip_matches_the_csv(csv_copy, ingests):
+    df = load_orders(csv_copy)
+    assert len(ingests) == 1 and os.path.exists(cache_path_for(csv_copy))
+    assert_frame_equal(df, read_orders_csv(csv_copy))
+
+    expected = pd.read_csv(csv_copy, encoding="ISO-8859-1")
+    assert df["Order_ID"].astype(str).tolist() == expected["Order ID"].tolist()
+    np.testing.assert_array_equal(df["Sales"], expected["Sales"].astype(np.float32))
+    assert (df["Order_Date"] == pd.to_datetime(expected["Order Date"], format="%d-%m-%Y")).all()
+    assert df["Region"].dtype == "category" and df["Quantity"].dtype == np.int16
+    assert df["Profit"].dtype == np.float32 and df["Order_Date"].dtype == "datetime64[ns]"
+
+
+def test_projection_and_reuse(csv_copy, ingests):
+    load_orders(csv_copy)
+    df = load_orders(csv_copy, columns=["Order_Date", "Region", "Sales"])
+    assert list(df.columns) == ["Order_Date", "Region", "Sales"] and len(ingests) == 1
+    assert cached_key(cache_path_for(csv_copy)) == source_key(csv_copy)
+
+
+def test_changed_csv_is_reingested(csv_copy, ingests, tmp_path):
+    load_orders(csv_copy)
+    with open(csv_copy, encoding="ISO-8859-1") as f:
+        last = f.read().splitlines()[-1]
+    with open(csv_copy, "a", encoding="ISO-8859-1") as f:
+        f.write(last + "\n")
+    df = load_orders(csv_copy, columns=["Sales"])
+    assert len(ingests) == 2 and len(df) == len(read_orders_csv(csv_copy))
+
+    # a separate cache directory, and an unreadable cache counts as missing
+    cache_dir = str(tmp_path / "elsewhere")
+    load_orders(csv_copy, cache_dir=cache_dir)
+    with open(cache_path_for(csv_copy, cache_dir), "wb") as f:
+        f.write(b"not arrow")
+    assert cached_key(cache_path_for(csv_copy, cache_dir)) is None
+    assert len(load_orders(csv_copy, cache_dir=cache_dir)) == len(df) and len(ingests) == 4
+
+
+def test_day_first_dates():
+    assert parse_dates(pd.Series(["31-01-2012", "01-02-2012"])).tolist() == \
+        [pd.Timestamp("2012-01-31"), pd.Timestamp("2012-02-01")]
+    # spreadsheet re-saves change the layout but stay day-first
+    assert parse_dates(pd.Series(["3/1/2012", "25/12/2013"])).tolist() == \
+        [pd.Timestamp("2012-01-03"), pd.Timestamp("2013-12-25")]
@@ -0,0 +1,69 @@
+"""``trends`` against pandas ``rolling`` alignment and NaN rules."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from trends import DAILY_WINDOW, TrendCache, daily_trend, extend_daily_trend, rolling_stats
+
+
+@pytest.fixture(scope="module")
+def series():
+    rng = np.random.default_rng(1)
+    values = 20 + 5 * np.sin(np.arange(400) / 30) + rng.normal(0, 1, 400)
+    values[rng.random(400) < 0.1] = np.nan
+    values[50:70] = np.nan  # a gap longer than the short windows
+    return values
+
+
+@pytest.mark.parametrize("window", [2, 3, 5, 10, 31])
+@pytest.mark.parametrize("center", [True, False])
+@pytest.mark.parametrize("min_periods", [None, 1, 2])
+def test_rolling_stats_match_pandas(series, window, center, min_periods):
+    mean, std = rolling_stats(series, window, center, min_periods)
+    rolling = pd.Series(series).rolling(window, center=center, min_periods=min_periods)
+    np.testing.assert_allclose(mean, rolling.mean().to_numpy(), rtol=1e-9, atol=1e-9)
+    np.testing.assert_allclose(std, rolling.std().to_numpy(), rtol=1e-7, atol=1e-7)
+
+
+def test_rolling_stats_columns_are_independent(series):
+    block = np.column_stack([series, series[::-1] * 2])
+    mean, std = rolling_stats(block, 5)
+    for j in range(2):
+        rolling = pd.Series(block[:, j]).rolling(5, center=True)
+        np.testing.assert_allclose(mean[:, j], rolling.mean().to_numpy(), rtol=1e-9, atol=1e-9)
+        np.testing.assert_allclose(std[:, j], rolling.std().to_numpy(), rtol=1e-7, atol=1e-7)
+
+
+def test_all_nan_and_large_offset():
+    assert np.isnan(rolling_stats(np.full(6, np.nan), 3)[0]).all()
+    # the sums are shifted by the mean, so a large offset keeps full precision
+    values = 1e9 + np.arange(10, dtype=np.float64)
+    std = rolling_stats(values, 3)[1]
+    np.testing.assert_allclose(std[1:-1], 1.0, rtol=1e-9)
+
+
+def test_trend_cache_matches_pandas(daily):
+    yearly = daily.groupby("year")["Mean_Temp_C"].mean().reset_index()
+    cache = TrendCache(yearly, ["Mean_Temp_C"])
+    for window in cache.windows:
+        rolling = yearly["Mean_Temp_C"].rolling(window, center=True)
+        expected = pd.DataFrame({"year": yearly["year"], "Trend": rolling.mean(), "Trend_Std": rolling.std()})
+        assert_frame_equal(cache.get("Mean_Temp_C", window), expected, check_dtype=False)
+
+
+def test_daily_trend_matches_pandas(daily):
+    trend = daily_trend(daily["DATE"].to_numpy(), daily["Mean_Temp_C"].to_numpy())
+    rolling = daily["Mean_Temp_C"].rolling(DAILY_WINDOW, center=True, min_periods=DAILY_WINDOW // 2)
+    np.testing.assert_allclose(trend["Trend"], rolling.mean(), rtol=1e-9)
+    np.testing.assert_allclose(trend["Trend_Std"], rolling.std(), rtol=1e-7)
+
+
+@pytest.mark.parametrize("new_days", [1, 40, DAILY_WINDOW + 30])
+def test_extend_daily_trend_matches_recompute(daily, new_days):
+    dates, values = daily["DATE"].to_numpy(), daily["Mean_Temp_C"].to_numpy()
+    n_old = len(dates) - new_days
+    previous = daily_trend(dates[:n_old], values[:n_old])
+    extended = extend_daily_trend(previous, dates, values)
+    assert_frame_equal(extended, daily_trend(dates, values), rtol=1e-9)